@@ -1,6 +1,53 @@
-from .widgets import *  # noqa
-from .tabbed_config_dialog import ConfigDialog
+import importlib
+from typing import TYPE_CHECKING
+
+# Attributes are imported on first access, so `import qt_settings` does not pay for widgets it never uses
+# (QInfluxConfigWidget in particular pulls in influxdb_client and urllib3).
+_LAZY_ATTRIBUTES = {
+    "ConfigDialog": ".tabbed_config_dialog",
+    "SettingsStore": ".settings_store",
+    "instruments": ".instrumentation",
+    "Secret": ".encryption",
+    "InfluxModel": ".models",
+    "PathModel": ".models",
+    "QGenericSettingsWidget": ".widgets.generic_config",
+    "QAutoSettingsWidget": ".widgets.auto_config",
+    "PathField": ".widgets.auto_config",
+    "QTreeSettingsWidget": ".widgets.tree_config",
+    "QInfluxConfigWidget": ".widgets.influx_config",
+    "InfluxWriter": ".widgets.influx.writer",
+    "PathQuery": ".widgets.path.path_query",
+    "QPathSelector": ".widgets.path_config",
+    "QInstrumentationView": ".widgets.instrumentation_view",
+}
+
+if TYPE_CHECKING:
+    from .encryption import Secret
+    from .instrumentation import instruments
+    from .models import InfluxModel, PathModel
+    from .settings_store import SettingsStore
+    from .tabbed_config_dialog import ConfigDialog
+    from .widgets import *  # noqa
 
 __all__ = [
     "ConfigDialog",
+    "SettingsStore",
+    "instruments",
+    "Secret",
+    "InfluxModel",
+    "PathModel",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
@@ -0,0 +1,150 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Dict, List, Mapping, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from .instrumentation import Stage, instruments
+from .patches import pointer
+
+_MISSING = object()
+# Every round reverts at least one field, a section still invalid after this many is rejected as a whole
+_MAX_SALVAGE_ROUNDS = 16
+
+
+class SectionReport:
+    class Status(Enum):
+        APPLIED = 1  # Every field was accepted
+        SALVAGED = 2  # Applied, but some fields kept their current value
+        REJECTED = 3  # Nothing applied, the section kept its current data
+
+    def __init__(self, name: str, status: Status, rejected: List[Tuple[str, str]] | None = None) -> None:
+        self.name = name
+        self.status = status
+        # (JSON pointer into the section, validation message) per rejected field
+        self.rejected = rejected or []
+
+    def __repr__(self) -> str:
+        return f"SectionReport(name={self.name!r}, status={self.status.name}, rejected={self.rejected!r})"
+
+
+class ImportReport:
+    """What an import did with every section of the imported document."""
+
+    def __init__(self) -> None:
+        self.sections: Dict[str, SectionReport] = {}
+        # Sections in the document that the dialog does not have
+        self.unknown: List[str] = []
+        # (from version, to version) of every section whose data was migrated before validation
+        self.migrated: Dict[str, Tuple[int, int]] = {}
+
+    @property
+    def ok(self) -> bool:
+        return all(report.status == SectionReport.Status.APPLIED for report in self.sections.values())
+
+    def names(self, status: SectionReport.Status) -> List[str]:
+        return [name for name, report in self.sections.items() if report.status == status]
+
+    def summary(self) -> str:
+        lines = [
+            f"{len(self.names(SectionReport.Status.APPLIED))} sections applied, "
+            f"{len(self.names(SectionReport.Status.SALVAGED))} partially, "
+            f"{len(self.names(SectionReport.Status.REJECTED))} rejected"
+        ]
+        for report in self.sections.values():
+            for path, message in report.rejected:
+                lines.append(f"  {report.name}{path}: {message}")
+        if self.unknown:
+            lines.append(f"  Unknown sections ignored: {', '.join(self.unknown)}")
+        for name, (old, new) in self.migrated.items():
+            lines.append(f"  {name} migrated from schema version {old} to {new}")
+        return "\n".join(lines)
+
+
+def _get(value: Any, path: Tuple[Any, ...]) -> Any:
+    for key in path:
+        try:
+            value = value[key]
+        except (KeyError, IndexError, TypeError):
+            return _MISSING
+    return value
+
+
+def _revert(candidate: dict, baseline: dict, loc: Tuple[Any, ...]) -> bool:
+    """Put back the baseline value at the deepest part of `loc` the baseline has, False if there is none."""
+    for length in range(len(loc), 0, -1):
+        path = loc[:length]
+        original = _get(baseline, path)
+        parent = _get(candidate, path[:-1])
+        if original is not _MISSING and isinstance(parent, (dict, list)):
+            parent[path[-1]] = copy.deepcopy(original)
+            return True
+    # A field the model does not have at all
+    if loc and isinstance(candidate, dict) and loc[0] in candidate and loc[0] not in baseline:
+        del candidate[loc[0]]
+        return True
+    return False
+
+
+def validate_section(
+    name: str, model: Type[BaseModel], current: BaseModel, data: Any
+) -> Tuple[BaseModel | None, SectionReport]:
+    """Validate imported `data` for one section, keeping the `current` value of any field that is invalid."""
+    try:
+        return model.model_validate(data), SectionReport(name, SectionReport.Status.APPLIED)
+    except ValidationError as e:
+        error = e
+    if not isinstance(data, dict):
+        return None, SectionReport(name, SectionReport.Status.REJECTED, [("", "Section is not an object")])
+
+    candidate = copy.deepcopy(data)
+    baseline = current.model_dump()
+    rejected: List[Tuple[str, str]] = []
+    for _ in range(_MAX_SALVAGE_ROUNDS):
+        for details in error.errors():
+            loc = tuple(details["loc"])
+            rejected.append((pointer(*loc), details["msg"]))
+            if not _revert(candidate, baseline, loc):
+                # Errors of the model as a whole cannot be pinned on a field
+                return None, SectionReport(name, SectionReport.Status.REJECTED, rejected)
+        try:
+            return model.model_validate(candidate), SectionReport(name, SectionReport.Status.SALVAGED, rejected)
+        except ValidationError as e:
+            error = e
+    return None, SectionReport(name, SectionReport.Status.REJECTED, rejected)
+
+
+def _measured_validate(
+    name: str, model: Type[BaseModel], current: BaseModel, data: Any
+) -> Tuple[BaseModel | None, SectionReport]:
+    with instruments.measure(name, Stage.VALIDATION):
+        return validate_section(name, model, current, data)
+
+
+def validate_sections(
+    models: Mapping[str, Type[BaseModel]],
+    current: Mapping[str, BaseModel],
+    document: Mapping[str, Any],
+    workers: int = 0,
+) -> Tuple[Dict[str, BaseModel], ImportReport]:
+    """Validate every section of `document` that is in `models`, on `workers` threads when more than one.
+
+    Only touches models and plain data, never widgets, so it is safe off the GUI thread.
+    """
+    names = [name for name in models if name in document]
+    jobs = [(name, models[name], current[name], document[name]) for name in names]
+    if workers > 1 and len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda job: _measured_validate(*job), jobs))
+    else:
+        results = [_measured_validate(*job) for job in jobs]
+
+    report = ImportReport()
+    report.unknown = [name for name in document if name not in models]
+    accepted = {}
+    for name, (model, section_report) in zip(names, results):
+        report.sections[name] = section_report
+        if model is not None:
+            accepted[name] = model
+    return accepted, report
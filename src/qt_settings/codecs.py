@@ -0,0 +1,167 @@
+import importlib.util
+import json
+import os
+import struct
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Type
+
+from pydantic import BaseModel, Field, create_model
+
+from .snapshot_writer import Snapshot
+
+Sections = Mapping[str, Type[BaseModel]]
+
+# Document member holding the schema version of every section that has migrations, see `migrations`
+SCHEMA_KEY = "$schema_versions"
+
+
+def join_sections(fragments: Iterable[Tuple[str, str]]) -> str:
+    """The JSON document of a snapshot, from the already serialized JSON of each section."""
+    return "{" + ",".join(f"{json.dumps(name)}:{fragment}" for name, fragment in fragments) + "}"
+
+
+@lru_cache(maxsize=32)
+def _document_model(sections: Tuple[Tuple[str, Type[BaseModel]], ...]) -> Type[BaseModel]:
+    # One model over all sections lets pydantic-core parse and validate a whole document in a single native pass.
+    # Section names are aliases, they need not be identifiers and may clash with BaseModel attributes.
+    fields: Dict[str, Any] = {
+        f"section_{i}": (Optional[model], Field(None, alias=name)) for i, (name, model) in enumerate(sections)
+    }
+    return create_model("ConfigDocument", **fields)
+
+
+def _sections_of(document: BaseModel, sections: Sections) -> Dict[str, BaseModel]:
+    # Sections missing from the data are left out rather than reset
+    values = document.__dict__
+    return {
+        name: values[f"section_{i}"]
+        for i, name in enumerate(sections)
+        if f"section_{i}" in document.__pydantic_fields_set__ and values[f"section_{i}"] is not None
+    }
+
+
+def read_file(path: str) -> bytearray:
+    """Read a whole file into one preallocated buffer, without decoding it to a str first."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        data = bytearray(size)
+        view = memoryview(data)
+        read = 0
+        while read < size:
+            count = f.readinto(view[read:])
+            if not count:
+                break
+            read += count
+        del view
+        # The file may have shrunk or grown since fstat
+        if read < size:
+            del data[read:]
+        rest = f.read()
+    return data + rest if rest else data
+
+
+class Codec:
+    """Import/export format of a whole `ConfigDialog`.
+
+    `decode` validates every section it knows in one go and raises a `ValidationError` when any of them is invalid,
+    `load` only parses, so the caller can fall back to applying section by section.
+    """
+
+    name = ""
+    extensions: Tuple[str, ...] = ()
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def file_filter(self) -> str:
+        return f"{self.name} ({' '.join('*' + extension for extension in self.extensions)})"
+
+    def recognizes(self, data: bytes | bytearray) -> bool:
+        """Whether `data` carries this format's header, formats without a header never recognize anything."""
+        return False
+
+    def encode(self, snapshot: Snapshot, versions: Mapping[str, int] | None = None) -> bytes:
+        """`snapshot` in this format, with the schema `versions` of its sections when there are any."""
+        raise NotImplementedError()
+
+    def decode(self, data: bytes | bytearray, sections: Sections) -> Dict[str, BaseModel]:
+        raise NotImplementedError()
+
+    def load(self, data: bytes | bytearray) -> Dict[str, Any]:
+        raise NotImplementedError()
+
+
+class JsonCodec(Codec):
+    """JSON through pydantic-core: models are dumped and validated straight from and to bytes."""
+
+    name = "JSON"
+    extensions = (".json",)
+
+    def encode(self, snapshot: Snapshot, versions: Mapping[str, int] | None = None) -> bytes:
+        fragments = [(name, model.model_dump_json()) for name, model in snapshot.items()]
+        if versions:
+            fragments.append((SCHEMA_KEY, json.dumps(dict(versions))))
+        return join_sections(fragments).encode()
+
+    def decode(self, data: bytes | bytearray, sections: Sections) -> Dict[str, BaseModel]:
+        document = _document_model(tuple(sections.items())).model_validate_json(data)
+        return _sections_of(document, sections)
+
+    def load(self, data: bytes | bytearray) -> Dict[str, Any]:
+        return json.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """Compact binary format, needs the optional `msgpack` package.
+
+    The payload is the JSON compatible dump of every section, behind a header with a magic, the format version and
+    the schema version the data was written with.
+    """
+
+    name = "MessagePack"
+    extensions = (".msgpack",)
+
+    MAGIC = b"QTSM"
+    FORMAT_VERSION = 1
+    HEADER = struct.Struct(">4sHI")
+
+    def __init__(self, schema_version: int = 0) -> None:
+        self.schema_version = schema_version
+
+    @property
+    def available(self) -> bool:
+        return importlib.util.find_spec("msgpack") is not None
+
+    def recognizes(self, data: bytes | bytearray) -> bool:
+        return data[: len(self.MAGIC)] == self.MAGIC
+
+    def header(self, data: bytes | bytearray) -> Tuple[int, int]:
+        """(format version, schema version) of `data`."""
+        if len(data) < self.HEADER.size or not self.recognizes(data):
+            raise ValueError("Not a MessagePack settings file")
+        _, format_version, schema_version = self.HEADER.unpack_from(data)
+        return format_version, schema_version
+
+    def encode(self, snapshot: Snapshot, versions: Mapping[str, int] | None = None) -> bytes:
+        import msgpack
+
+        payload: Dict[str, Any] = {name: model.model_dump(mode="json") for name, model in snapshot.items()}
+        if versions:
+            payload[SCHEMA_KEY] = dict(versions)
+        return self.HEADER.pack(self.MAGIC, self.FORMAT_VERSION, self.schema_version) + msgpack.packb(payload)
+
+    def decode(self, data: bytes | bytearray, sections: Sections) -> Dict[str, BaseModel]:
+        document = _document_model(tuple(sections.items())).model_validate(self.load(data))
+        return _sections_of(document, sections)
+
+    def load(self, data: bytes | bytearray) -> Dict[str, Any]:
+        import msgpack
+
+        format_version, schema_version = self.header(data)
+        if format_version > self.FORMAT_VERSION:
+            raise ValueError(f"Unsupported MessagePack settings format version {format_version}")
+        if schema_version > self.schema_version:
+            raise ValueError(f"Settings were written by a newer schema (version {schema_version})")
+        return msgpack.unpackb(memoryview(data)[self.HEADER.size :])
@@ -0,0 +1,205 @@
+import base64
+import hashlib
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import Annotated, Any, Dict, Union
+
+from pydantic import BeforeValidator, PlainSerializer, SecretStr
+
+# Encrypted values are stored as {ENCRYPTED_KEY: token}, any plain string is plain text whatever it starts with
+ENCRYPTED_KEY = "$encrypted"
+# Starts every token, the digit is the format version
+PREFIX = "enc1:"
+DEFAULT_SALT = b"qt_settings.secret"
+DEFAULT_ITERATIONS = 200_000
+# Used when no passphrase is configured, else a random key is created in KEY_FILE
+PASSPHRASE_VARIABLE = "QT_SETTINGS_SECRET_KEY"
+KEY_FILE = os.path.join(os.path.expanduser("~"), ".config", "qt_settings", "secret.key")
+
+_NONCE_SIZE = 12
+_MEMO_SIZE = 1024
+
+
+class DecryptionError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=8)
+def derive_key(passphrase: bytes, salt: bytes, iterations: int) -> bytes:
+    """PBKDF2-HMAC-SHA256 key of `passphrase`, derived once per process for the same arguments."""
+    return hashlib.pbkdf2_hmac("sha256", passphrase, salt, iterations)
+
+
+class Cipher:
+    """AES-256-GCM encryption of short strings, from the `cryptography` package (imported on first use).
+
+    Results are memoized both ways, so the same secret always serializes to the same token within a session:
+    saving an unchanged secret costs a dict lookup and never makes the settings payload differ from what is stored.
+    """
+
+    def __init__(self, key: bytes) -> None:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+        self._aead = AESGCM(key)
+        # Models are serialized on the writer thread too
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, str] = {}
+        self._plaintexts: Dict[str, str] = {}
+
+        self.encrypted = 0
+        self.decrypted = 0
+        self.memo_hits = 0
+
+    def _remember(self, plaintext: str, token: str) -> None:
+        if len(self._tokens) >= _MEMO_SIZE:
+            self._tokens.clear()
+            self._plaintexts.clear()
+        self._tokens[plaintext] = token
+        self._plaintexts[token] = plaintext
+
+    def encrypt(self, plaintext: str) -> str:
+        with self._lock:
+            token = self._tokens.get(plaintext)
+            if token is not None:
+                self.memo_hits += 1
+                return token
+
+            nonce = os.urandom(_NONCE_SIZE)
+            ciphertext = self._aead.encrypt(nonce, plaintext.encode("utf-8"), None)
+            token = PREFIX + base64.urlsafe_b64encode(nonce + ciphertext).decode()
+            self.encrypted += 1
+            self._remember(plaintext, token)
+            return token
+
+    def decrypt(self, token: str) -> str:
+        """The plain text of `token`, raises DecryptionError when it is corrupt, modified or from another key."""
+        from cryptography.exceptions import InvalidTag
+
+        with self._lock:
+            plaintext = self._plaintexts.get(token)
+            if plaintext is not None:
+                self.memo_hits += 1
+                return plaintext
+
+            try:
+                data = base64.urlsafe_b64decode(token[len(PREFIX) :])
+                plaintext = self._aead.decrypt(data[:_NONCE_SIZE], data[_NONCE_SIZE:], None).decode("utf-8")
+            except InvalidTag:
+                raise DecryptionError("Encrypted value was modified or encrypted with another key") from None
+            except ValueError:
+                raise DecryptionError("Encrypted value is corrupt") from None
+            self.decrypted += 1
+            # Saving the secret again writes back the token it was read from
+            self._remember(plaintext, token)
+            return plaintext
+
+
+class UndecryptableSecret(SecretStr):
+    """A stored secret that could not be decrypted, e.g. encrypted on another machine or by another user.
+
+    Reads as an empty secret, and serializes back to exactly the token it was read from: loading settings with the
+    wrong key never overwrites the stored secret. Entering the secret again replaces it.
+    """
+
+    def __init__(self, token: str, error: str) -> None:
+        super().__init__("")
+        self.token = token
+        self.error = error
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, UndecryptableSecret) and other.token == self.token
+
+    def __hash__(self) -> int:
+        return hash(self.token)
+
+    def __repr__(self) -> str:
+        return f"UndecryptableSecret(error={self.error!r})"
+
+
+_session_lock = threading.Lock()
+_session: Cipher | None = None
+_passphrase: bytes | None = None
+_salt = DEFAULT_SALT
+_iterations = DEFAULT_ITERATIONS
+
+
+def configure(
+    passphrase: str | bytes | None = None, salt: bytes = DEFAULT_SALT, iterations: int = DEFAULT_ITERATIONS
+) -> None:
+    """Set the passphrase secrets are encrypted with, before any secret is loaded or saved.
+
+    Without one, the QT_SETTINGS_SECRET_KEY environment variable is used, else a random per-user key stored in
+    KEY_FILE. Secrets only decrypt with the passphrase they were encrypted with: exports meant for another machine
+    need a shared passphrase.
+    """
+    global _session, _passphrase, _salt, _iterations
+    with _session_lock:
+        _passphrase = passphrase.encode("utf-8") if isinstance(passphrase, str) else passphrase
+        _salt = salt
+        _iterations = iterations
+        _session = None
+
+
+def _user_key() -> bytes:
+    try:
+        with open(KEY_FILE, "rb") as file:
+            return file.read()
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(KEY_FILE), exist_ok=True)
+    key = base64.b64encode(os.urandom(32))
+    try:
+        # Readable by the user only, and never overwrite a key another process just created
+        descriptor = os.open(KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(KEY_FILE, "rb") as file:
+            return file.read()
+    with os.fdopen(descriptor, "wb") as file:
+        file.write(key)
+    return key
+
+
+def session_cipher() -> Cipher:
+    """The cipher of this process, its key is derived on first use only."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            passphrase = _passphrase or os.environ.get(PASSPHRASE_VARIABLE, "").encode("utf-8") or _user_key()
+            _session = Cipher(derive_key(passphrase, _salt, _iterations))
+        return _session
+
+
+def _decrypt(value):
+    if not (isinstance(value, dict) and value.keys() == {ENCRYPTED_KEY}):
+        return value  # Plain text, e.g. stored before the field was a Secret
+    token = value[ENCRYPTED_KEY]
+    try:
+        if not isinstance(token, str):
+            raise DecryptionError("Encrypted value is corrupt")
+        return session_cipher().decrypt(token)
+    except DecryptionError as e:
+        logging.getLogger(__name__).error(
+            f"Cannot decrypt a stored secret, it is kept as it is until it is entered again: {e}"
+        )
+        return UndecryptableSecret(token, str(e))
+
+
+def _encrypt(value: SecretStr) -> Union[str, Dict[str, str]]:
+    if isinstance(value, UndecryptableSecret):
+        return {ENCRYPTED_KEY: value.token}
+    secret = value.get_secret_value()
+    # An empty secret needs no key, settings without secrets never derive one
+    if not secret:
+        return ""
+    return {ENCRYPTED_KEY: session_cipher().encrypt(secret)}
+
+
+# A string field encrypted in QSettings and exports, masked in repr, dumps and generated forms:
+# `token: Secret = SecretStr("")`, read the value with `model.token.get_secret_value()`.
+Secret = Annotated[
+    SecretStr,
+    BeforeValidator(_decrypt),
+    PlainSerializer(_encrypt, return_type=Union[str, Dict[str, str]], when_used="json"),
+]
@@ -0,0 +1,124 @@
+import contextlib
+import os
+import threading
+import time
+from enum import Enum
+from typing import ContextManager, Dict, List, Tuple
+
+# Section name of the work done for the whole configuration at once (blob writes, file exports, document decode)
+ALL_SECTIONS = "*"
+
+
+class Stage(Enum):
+    MODEL_BUILD = "model build"  # Settings widgets reading their inputs into a model, or patching one field
+    VALIDATION = "validation"  # Validating (and migrating) loaded or imported data
+    SERIALIZATION = "serialization"  # Dumping models to JSON fragments, documents and export formats
+    PERSISTENCE = "persistence"  # Writing to QSettings or files
+    SIGNALS = "signals"  # Emitting `changed`, `patched`, `sections_changed` and `model_replaced` to their receivers
+
+
+class Timing:
+    """How often one stage ran for one section, and how long it took."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.count if self.count else 0.0
+
+    def record(self, elapsed_s: float) -> None:
+        self.count += 1
+        self.total_s += elapsed_s
+        self.max_s = max(self.max_s, elapsed_s)
+
+    def __repr__(self) -> str:
+        return f"Timing(count={self.count}, total_ms={self.total_s * 1000:.3f}, max_ms={self.max_s * 1000:.3f})"
+
+
+class _Measurement:
+    __slots__ = ("_instrumentation", "_key", "_start")
+
+    def __init__(self, instrumentation: "Instrumentation", key: Tuple[str, Stage]) -> None:
+        self._instrumentation = instrumentation
+        self._key = key
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self._instrumentation._record(self._key, time.perf_counter() - self._start)
+
+
+_DISABLED = contextlib.nullcontext()
+
+
+class Instrumentation:
+    """Per-section timings of the settings change pipeline, from an input change to the persisted value.
+
+    Disabled by default (or enabled with the QT_SETTINGS_INSTRUMENT environment variable), `measure` then returns
+    a shared no-op context. Stages nest: the `changed` of a widget includes the store work its receivers do.
+
+        instruments.enable()
+        with instruments.measure("influx", Stage.SERIALIZATION):
+            ...
+        print(instruments.report())
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._timings: Dict[Tuple[str, Stage], Timing] = {}
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    def measure(self, section: str, stage: Stage) -> ContextManager[None]:
+        if not self.enabled:
+            return _DISABLED
+        return _Measurement(self, (section, stage))
+
+    def _record(self, key: Tuple[str, Stage], elapsed_s: float) -> None:
+        # Background writes measure on the writer thread
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = self._timings[key] = Timing()
+            timing.record(elapsed_s)
+
+    def timings(self) -> Dict[Tuple[str, Stage], Timing]:
+        """Copy of the timings so far, per (section, stage)."""
+        with self._lock:
+            return {key: _copy(timing) for key, timing in self._timings.items()}
+
+    def section(self, name: str) -> Dict[Stage, Timing]:
+        return {stage: timing for (section, stage), timing in self.timings().items() if section == name}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timings.clear()
+
+    def report(self) -> str:
+        """The timings as a text table, slowest total first."""
+        rows = sorted(self.timings().items(), key=lambda item: item[1].total_s, reverse=True)
+        lines: List[str] = [
+            f"{'section':24s} {'stage':14s} {'count':>8s} {'total ms':>10s} {'mean ms':>9s} {'max ms':>9s}"
+        ]
+        for (section, stage), timing in rows:
+            lines.append(
+                f"{section:24s} {stage.value:14s} {timing.count:8d} {timing.total_s * 1000:10.3f} "
+                f"{timing.mean_s * 1000:9.3f} {timing.max_s * 1000:9.3f}"
+            )
+        return "\n".join(lines)
+
+
+def _copy(timing: Timing) -> Timing:
+    copy = Timing()
+    copy.count, copy.total_s, copy.max_s = timing.count, timing.total_s, timing.max_s
+    return copy
+
+
+# Shared by the store, the dialog and the settings widgets
+instruments = Instrumentation(enabled=bool(os.environ.get("QT_SETTINGS_INSTRUMENT")))
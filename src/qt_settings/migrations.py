@@ -0,0 +1,86 @@
+import threading
+from typing import Any, Callable, Dict, Type
+
+from pydantic import BaseModel
+
+Step = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class MigrationError(Exception):
+    pass
+
+
+class Migrations:
+    """Upgrade steps of the stored data of settings models, per model class and schema version.
+
+    A step turns the data of version `n` into version `n + 1`, the current version of a model is the highest one its
+    steps lead to (0 without steps):
+
+        @registry.step(InfluxModel, 0)
+        def timeout_in_seconds(data):
+            data["timeout"] = data.get("timeout", 1000) / 1000
+            return data
+
+    Steps get a copy of the section's top-level dict, which they may modify, and return the new data.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._steps: Dict[Type[BaseModel], Dict[int, Step]] = {}
+
+        self.upgraded = 0
+
+    def step(self, model: Type[BaseModel], from_version: int) -> Callable[[Step], Step]:
+        """Decorator registering the step upgrading the data of `model` from `from_version` to the next version."""
+
+        def register(step: Step) -> Step:
+            self.add(model, from_version, step)
+            return step
+
+        return register
+
+    def add(self, model: Type[BaseModel], from_version: int, step: Step) -> None:
+        with self._lock:
+            steps = self._steps.setdefault(model, {})
+            if from_version in steps:
+                raise MigrationError(f"{model.__name__} already has a step from version {from_version}")
+            steps[from_version] = step
+
+    def version(self, model: Type[BaseModel]) -> int:
+        """Current schema version of `model`."""
+        steps = self._steps.get(model)
+        return max(steps) + 1 if steps else 0
+
+    def upgrade(self, model: Type[BaseModel], from_version: int, to_version: int | None = None) -> Step:
+        """The function upgrading data of `model` from `from_version` to `to_version` (default the current one)."""
+        if to_version is None:
+            to_version = self.version(model)
+        available = self._steps.get(model, {})
+        missing = [version for version in range(from_version, to_version) if version not in available]
+        if from_version > to_version or missing:
+            raise MigrationError(f"No migration of {model.__name__} from version {from_version} to {to_version}")
+        steps = tuple(available[version] for version in range(from_version, to_version))
+
+        def upgrade(data: Dict[str, Any]) -> Dict[str, Any]:
+            data = dict(data)
+            for step in steps:
+                data = step(data)
+            return data
+
+        return upgrade
+
+    def migrate(self, model: Type[BaseModel], data: Any, from_version: int) -> Any:
+        """`data` of `model` upgraded from `from_version` to the current version, as is when already current."""
+        to_version = self.version(model)
+        if from_version == to_version:
+            return data
+        if from_version > to_version:
+            raise MigrationError(f"Written by a newer {model.__name__} schema (version {from_version})")
+        if not isinstance(data, dict):
+            raise MigrationError(f"Cannot migrate {type(data).__name__} data of {model.__name__}")
+        self.upgraded += 1
+        return self.upgrade(model, from_version, to_version)(data)
+
+
+# Used by every SettingsStore unless it is given its own registry
+registry = Migrations()
@@ -0,0 +1,104 @@
+from typing import TYPE_CHECKING, ContextManager
+
+from pydantic import BaseModel, Field
+
+from .encryption import Secret
+from .widgets.influx.client_pool import default_pool
+
+if TYPE_CHECKING:
+    import influxdb_client
+
+
+class InfluxModel(BaseModel):
+    """Settings of an InfluxDB connection, `QInfluxConfigWidget.Model`. Free of Qt widgets, for headless use."""
+
+    url: str
+    token: Secret
+    org: str
+    bucket: str
+    measurement: str
+    force_ssl: bool
+    debug: bool
+    flush_delay: float
+    timeout: int
+
+    def connection_key(self) -> tuple:
+        """The fields that define a client, equal keys can share one pooled client."""
+        return (self.url, self.token.get_secret_value(), self.org, self.force_ssl, self.timeout, self.debug, True)
+
+    def create_client(self) -> "influxdb_client.InfluxDBClient":
+        """Create a new client, owned and closed by the caller."""
+        # Imported here, the client library is only needed once a connection is actually made
+        import influxdb_client
+
+        client = influxdb_client.InfluxDBClient(
+            url=self.url,
+            token=self.token.get_secret_value(),
+            debug=self.debug,
+            timeout=self.timeout,
+            org=self.org,
+            enable_gzip=True,
+            verify_ssl=self.force_ssl,
+        )
+        return client
+
+    def get_client(self) -> "influxdb_client.InfluxDBClient":
+        """A client from the shared pool, do not close it. Prefer `lease_client`, this one is not leased."""
+        return default_pool().get(self.connection_key(), self.create_client)
+
+    def lease_client(self) -> ContextManager["influxdb_client.InfluxDBClient"]:
+        """`with config.lease_client() as client:` a client from the shared pool, open until the block ends."""
+        return default_pool().lease(self.connection_key(), self.create_client)
+
+    def test(self, client: "influxdb_client.InfluxDBClient | None" = None) -> None:
+        """Ping the server and probe the bucket over a single client."""
+        if client is None:
+            with self.lease_client() as client:
+                self.test(client)
+            return
+        self.test_connection(client)
+        self.check_query(client)
+
+    def test_connection(self, client: "influxdb_client.InfluxDBClient | None" = None):
+        import urllib3.exceptions
+
+        if client is None:
+            with self.lease_client() as client:
+                return self.test_connection(client)
+        try:
+            response = client.api_client.request("GET", f"{self.url}/ping")
+        except urllib3.exceptions.NameResolutionError as e:
+            raise Exception(f"Url does not exist '{self.url}'") from e
+
+        if response.status != 204:
+            raise Exception(f"Connection to '{self.url}' failed.")
+
+        return client
+
+    def check_query(self, client: "influxdb_client.InfluxDBClient | None" = None):
+        """Check that the credentials has permission to query from the Bucket"""
+        import influxdb_client.rest
+
+        if client is None:
+            with self.lease_client() as client:
+                return self.check_query(client)
+
+        try:
+            client.query_api().query(f'from(bucket:"{self.bucket}") |> range(start: -1m) |> limit(n:1)', self.org)
+        except influxdb_client.rest.ApiException as e:
+            # missing credentials
+            if e.status == 404:
+                raise Exception(
+                    f"The specified token doesn't have sufficient credentials to "
+                    f"read from '{self.bucket}' bucket or specified bucket doesn't exists."
+                ) from e
+            if e.status == 401:
+                raise Exception("The specified token is invalid.") from e
+
+            raise e
+
+
+class PathModel(BaseModel):
+    """A single path, `QPathSelector.PathModel`."""
+
+    path: str = Field(max_length=100)
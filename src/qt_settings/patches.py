@@ -0,0 +1,49 @@
+from typing import Any, List
+
+from pydantic import BaseModel
+
+
+class FieldChange:
+    """One changed value, `path` is a JSON pointer into the model (e.g. "/influx/url")."""
+
+    def __init__(self, path: str, old: Any, new: Any) -> None:
+        self.path = path
+        self.old = old
+        self.new = new
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FieldChange) and (self.path, self.old, self.new) == (other.path, other.old, other.new)
+
+    def __repr__(self) -> str:
+        return f"FieldChange(path={self.path!r}, old={self.old!r}, new={self.new!r})"
+
+
+def pointer(*keys: Any) -> str:
+    """JSON pointer of a key path, `pointer("influx", "url") == "/influx/url"`."""
+    return "".join("/" + str(key).replace("~", "~0").replace("/", "~1") for key in keys)
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[FieldChange]:
+    """Leaf-level changes between two values, descending into models, and dicts and lists of the same shape.
+
+    Identical objects are skipped without comparing, so models patched with `replace_field` diff in O(depth).
+    """
+    changes: List[FieldChange] = []
+    _diff(old, new, path, changes)
+    return changes
+
+
+def _diff(old: Any, new: Any, path: str, changes: List[FieldChange]) -> None:
+    if old is new:
+        return
+    if isinstance(old, BaseModel) and type(old) is type(new):
+        for field in type(old).model_fields:
+            _diff(old.__dict__[field], new.__dict__[field], path + pointer(field), changes)
+    elif isinstance(old, dict) and isinstance(new, dict) and old.keys() == new.keys():
+        for key in old:
+            _diff(old[key], new[key], path + pointer(key), changes)
+    elif isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            _diff(old_item, new_item, f"{path}/{index}", changes)
+    elif old != new:
+        changes.append(FieldChange(path, old, new))
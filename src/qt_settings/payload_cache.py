@@ -0,0 +1,73 @@
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+def digest(payload: str) -> bytes:
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+
+class PayloadCache:
+    """What the settings store holds, as a content hash per key, plus the decoded value of every payload read.
+
+    Writes of a payload the store already holds are skipped, and reading an unchanged payload returns the value
+    decoded last time. Safe to use from the writer thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Hash of the payload last read from or written to each key
+        self._stored: Dict[str, bytes] = {}
+        self._decoded: Dict[str, Tuple[bytes, Any]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.written = 0
+
+    def should_write(self, key: str, payload: str) -> bool:
+        """False when the store already holds `payload` under `key`, otherwise records it as written."""
+        payload_digest = digest(payload)
+        with self._lock:
+            if self._stored.get(key) == payload_digest:
+                self.skipped += 1
+                return False
+            self._stored[key] = payload_digest
+            self.written += 1
+            return True
+
+    def read(self, key: str, payload: str, decode: Callable[[str], Any]) -> Tuple[Any, bool]:
+        """The decoded `payload`, and whether it is what the store held the last time the key was read or written.
+
+        Decoded values are shared between reads and must not be modified.
+        """
+        payload_digest = digest(payload)
+        with self._lock:
+            unchanged = self._stored.get(key) == payload_digest
+            self._stored[key] = payload_digest
+            cached = self._decoded.get(key)
+            if cached is not None and cached[0] == payload_digest:
+                self.hits += 1
+                return cached[1], unchanged
+            self.misses += 1
+
+        value = decode(payload)
+        with self._lock:
+            self._decoded[key] = (payload_digest, value)
+        return value, unchanged
+
+    def decoded(self, key: str) -> Any:
+        """The value last decoded for `key`, None when it was never read."""
+        with self._lock:
+            cached = self._decoded.get(key)
+        return None if cached is None else cached[1]
+
+    def forget(self, key: str | None = None) -> None:
+        """Stop trusting what is known about `key`, or about every key, e.g. after a failed or external write."""
+        with self._lock:
+            if key is None:
+                self._stored.clear()
+                self._decoded.clear()
+            else:
+                self._stored.pop(key, None)
+                self._decoded.pop(key, None)
@@ -0,0 +1,859 @@
+import contextlib
+import json
+import logging
+import os
+import time
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from qtpy import QtCore
+
+from .bulk_import import ImportReport, SectionReport, validate_sections
+from .codecs import SCHEMA_KEY, Codec, JsonCodec, MsgpackCodec, join_sections, read_file
+from .instrumentation import ALL_SECTIONS, Stage, instruments
+from .migrations import MigrationError, Migrations, registry
+from .patches import FieldChange, diff, pointer
+from .payload_cache import PayloadCache
+from .settings_watcher import SettingsWatcher
+from .snapshot_writer import Snapshot, SnapshotWriter, WriteResult, atomic_write
+
+
+def encode_document(snapshot: Snapshot, versions: Mapping[str, int] | None = None) -> str:
+    fragments = [(name, model.model_dump_json()) for name, model in snapshot.items()]
+    if versions:
+        fragments.append((SCHEMA_KEY, json.dumps(dict(versions))))
+    return join_sections(fragments)
+
+
+def _overlaps(subscription: str, path: str) -> bool:
+    # Either pointer is the other or one of its parents
+    return path == subscription or path.startswith(subscription + "/") or subscription.startswith(path + "/")
+
+
+def _coalesce(changes: List[FieldChange]) -> List[FieldChange]:
+    # One change per path, from its first old to its last new value, dropping paths that ended where they started
+    merged: Dict[str, FieldChange] = {}
+    for change in changes:
+        first = merged.get(change.path)
+        merged[change.path] = FieldChange(change.path, first.old if first else change.old, change.new)
+    return [change for change in merged.values() if change.old != change.new]
+
+
+class PersistenceScheduler(QtCore.QObject):
+    """Coalesces bursts of save requests into a single write.
+
+    A write happens once no new request arrived for `quiet_ms`, but never later than `max_latency_ms`
+    after the first request of a burst. A `quiet_ms` of 0 or less writes synchronously, and so does every
+    request without a QCoreApplication, timers need its event loop.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[], None],
+        quiet_ms: int = 250,
+        max_latency_ms: int = 2000,
+        parent: QtCore.QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._write = write
+        self.quiet_ms = quiet_ms
+        self.max_latency_ms = max_latency_ms
+
+        self._quiet_timer = QtCore.QTimer(self)
+        self._quiet_timer.setSingleShot(True)
+        self._quiet_timer.timeout.connect(self.flush)
+        self._deadline_timer = QtCore.QTimer(self)
+        self._deadline_timer.setSingleShot(True)
+        self._deadline_timer.timeout.connect(self.flush)
+
+        self.requests = 0
+        self.writes = 0
+        self.coalesced = 0
+
+    @property
+    def pending(self) -> bool:
+        return self._quiet_timer.isActive() or self._deadline_timer.isActive()
+
+    def schedule(self) -> None:
+        self.requests += 1
+        if self.quiet_ms <= 0 or QtCore.QCoreApplication.instance() is None:
+            self._run_write()
+            return
+
+        if self.pending:
+            self.coalesced += 1
+        else:
+            self._deadline_timer.start(max(self.max_latency_ms, self.quiet_ms))
+        self._quiet_timer.start(self.quiet_ms)
+
+    def flush(self) -> None:
+        """Write now if a write is pending."""
+        if self.pending:
+            self._run_write()
+
+    def cancel(self) -> None:
+        """Drop the pending write, e.g. because the caller just wrote the same data itself."""
+        self._quiet_timer.stop()
+        self._deadline_timer.stop()
+
+    def _run_write(self) -> None:
+        self.cancel()
+        self.writes += 1
+        self._write()
+
+
+class SettingsStore(QtCore.QObject):
+    """The sections of a configuration: their models and defaults, serialization, and the QSettings and file backends.
+
+    Only needs QtCore, so services and workers load the same settings as the GUI without a QApplication or any
+    widget. `ConfigDialog` is a view on a store: it pushes edits with `update` and follows `model_replaced`.
+    """
+
+    class StorageLayout(Enum):
+        # Settings stored in another layout are converted when loaded
+        BLOB = 1  # Everything as one JSON document under the "config" key
+        SECTIONS = 2  # One JSON document per section under "config_sections/<section>"
+        FIELDS = 3  # One JSON value per top-level field under "config_sections/<section>/<field>"
+
+    class ConflictPolicy(Enum):
+        # How an external change to a section that was also edited here since the last save is resolved
+        LAST_WRITER_WINS = 1  # The newer of the local edit and the file modification wins
+        VERSION_STAMP = 2  # Writes store a version per section, the local edit wins unless the store moved past it
+
+    LEGACY_KEY = "config"
+    SECTIONS_GROUP = "config_sections"
+    VERSIONS_GROUP = "config_versions"
+    SCHEMA_GROUP = "config_schema"
+
+    block_signals: bool = False
+
+    # All FieldChanges of one edit, load or batch, with paths prefixed by the section ("/influx/url")
+    patched = QtCore.Signal(object)
+    # Names of the sections changed by one edit, load or batch
+    sections_changed = QtCore.Signal(object)
+    # Section name and its new model, whenever a load, import or default replaces it (not for `update`)
+    model_replaced = QtCore.Signal(str, object)
+    # WriteResult of every failed background write
+    write_failed = QtCore.Signal(object)
+
+    def __init__(
+        self,
+        settings: QtCore.QSettings,
+        save_delay_ms: int = 250,
+        max_save_latency_ms: int = 2000,
+        storage_layout: StorageLayout = StorageLayout.BLOB,
+        background_writes: bool = False,
+        conflict_policy: ConflictPolicy = ConflictPolicy.LAST_WRITER_WINS,
+        migrations: Migrations | None = None,
+        parent: QtCore.QObject | None = None,
+    ) -> None:
+        """Stored data of older schema versions is upgraded by `migrations`, the shared `registry` by default."""
+        super().__init__(parent)
+        self.log = logging.getLogger(__name__)
+        self.settings = settings
+        self.storage_layout = storage_layout
+        self.background_writes = background_writes
+        self.conflict_policy = conflict_policy
+        self.migrations = migrations or registry
+        self.watcher: SettingsWatcher | None = None
+        self.persistence = PersistenceScheduler(self.save_to_settings, save_delay_ms, max_save_latency_ms, self)
+        self.writer = SnapshotWriter(parent=self)
+        self.writer.finished.connect(self._on_write_finished)
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush_writes)
+        # Import/export formats, the first one is the default for exports
+        self.codecs: List[Codec] = [JsonCodec(), MsgpackCodec()]
+
+        # Model type, default and latest model per section, in registration order
+        self._types: Dict[str, Type[BaseModel]] = {}
+        self._defaults: Dict[str, Callable[[], BaseModel]] = {}
+        self._models: Dict[str, BaseModel] = {}
+        # Serialized JSON fragment per section, a section without a fragment is dirty
+        self._fragments: Dict[str, str] = {}
+        self._document: str | None = None
+        # Sections changed since the last save, and what the settings store holds
+        self._unsaved: set[str] = set()
+        self.store_cache = PayloadCache()
+        # When each section was last edited, and the version of each section the local data is based on
+        self._edited_at: Dict[str, float] = {}
+        self._versions: Dict[str, int] = {}
+        # Schema version of each section in the settings store (SECTIONS and FIELDS layouts)
+        self._schemas: Dict[str, int] = {}
+        # (JSON pointer, callback) per subscription
+        self._subscriptions: List[Tuple[str, Callable[[List[FieldChange]], None]]] = []
+        # State of the open batch: nesting depth, whether it persists, and what it collected so far
+        self._batch_depth = 0
+        self._batch_persist = True
+        self._batch_sections: Dict[str, None] = {}
+        self._batch_changes: List[FieldChange] = []
+
+    def add_section(
+        self,
+        name: str,
+        model: Type[BaseModel],
+        default: BaseModel | Callable[[], BaseModel] | None = None,
+        data: BaseModel | None = None,
+    ) -> None:
+        """Register a section of type `model`, its default is `default` (a model or a factory) or `model()`.
+
+        It starts out as `data` when given, else as its default.
+        """
+        self._types[name] = model
+        self.set_default(name, default)
+        self._models[name] = data if data is not None else self._defaults[name]()
+        self.invalidate(name)
+
+    def set_default(self, name: str, default: BaseModel | Callable[[], BaseModel] | None) -> None:
+        """Replace the default of a section: a model, a factory, or None for the model's own defaults."""
+        if isinstance(default, BaseModel):
+            self._defaults[name] = lambda: default  # type: ignore
+        else:
+            self._defaults[name] = default or self._types[name]
+
+    @property
+    def sections(self) -> list[str]:
+        """Names of all registered sections, in registration order."""
+        return list(self._types)
+
+    def section_type(self, name: str) -> Type[BaseModel]:
+        return self._types[name]
+
+    def model(self, name: str) -> BaseModel:
+        return self._models[name]
+
+    def snapshot(self, names: Iterable[str] | None = None) -> Dict[str, BaseModel]:
+        """The current models of `names`, or of all sections. Models are immutable snapshots, safe to share."""
+        return {name: self._models[name] for name in (self._types if names is None else names)}
+
+    def update(self, name: str, model: BaseModel) -> None:
+        """Replace the model of a section with an edited one, publishing the changes and scheduling a write."""
+        previous = self._models[name]
+        self._models[name] = model
+        self._edited_at[name] = time.time()
+        self.invalidate(name)
+        self._touch(name)
+        if self._publishing():
+            self._publish(diff(previous, model, pointer(name)))
+        self.data_changed()
+
+    def _section_fragment(self, name: str) -> str:
+        fragment = self._fragments.get(name)
+        if fragment is None:
+            with instruments.measure(name, Stage.SERIALIZATION):
+                fragment = self._fragments[name] = self._models[name].model_dump_json()
+        return fragment
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Forget the cached serialization of one section, or of all sections, and consider them unsaved."""
+        for name in self.sections if name is None else [name]:
+            self._fragments.pop(name, None)
+            self._unsaved.add(name)
+        self._document = None
+
+    def schema_versions(self) -> Dict[str, int]:
+        """Current schema version of every section whose model has migrations."""
+        versions = {name: self.migrations.version(model) for name, model in self._types.items()}
+        return {name: version for name, version in versions.items() if version}
+
+    def to_json(self) -> str:
+        # Only dirty sections are dumped again
+        if self._document is None:
+            fragments = [(name, self._section_fragment(name)) for name in self._types]
+            versions = self.schema_versions()
+            if versions:
+                fragments.append((SCHEMA_KEY, json.dumps(versions)))
+            self._document = join_sections(fragments)
+        return self._document
+
+    def subscribe(self, path: str, callback: Callable[[List[FieldChange]], None]) -> Callable[[], None]:
+        """Call `callback` with the changes of an edit or load that touch `path`, returns the unsubscribe function.
+
+        `path` starts with the section name: "influx/url" for one field, "influx" for the whole section, "" for
+        everything. Changes below `path`, and changes replacing one of its parents as a whole, both match.
+        """
+        path = path.strip("/")
+        subscription = ("/" + path if path else "", callback)
+        self._subscriptions.append(subscription)
+
+        def unsubscribe() -> None:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+        return unsubscribe
+
+    @property
+    def batching(self) -> bool:
+        return self._batch_depth > 0
+
+    @contextlib.contextmanager
+    def batch(self, persist: bool = True) -> Iterator[None]:
+        """Group changes: `with store.batch(): ...`
+
+        Inside a batch nothing is written or published. Leaving the outermost batch emits one consolidated
+        `patched` and `sections_changed`, and schedules a single write unless `persist` is False. Batches nest,
+        only the outermost one's `persist` counts.
+        """
+        if self._batch_depth == 0:
+            self._batch_persist = persist
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._end_batch()
+
+    def _end_batch(self) -> None:
+        sections, self._batch_sections = list(self._batch_sections), {}
+        changes, self._batch_changes = _coalesce(self._batch_changes), []
+        self._publish(changes)
+        if sections:
+            with instruments.measure(ALL_SECTIONS, Stage.SIGNALS):
+                self.sections_changed.emit(sections)
+            if self._batch_persist:
+                self.data_changed()
+
+    def _touch(self, name: str) -> None:
+        if self._batch_depth:
+            self._batch_sections[name] = None
+        else:
+            with instruments.measure(name, Stage.SIGNALS):
+                self.sections_changed.emit([name])
+
+    def _publish(self, changes: List[FieldChange]) -> None:
+        if not changes:
+            return
+        if self._batch_depth:
+            self._batch_changes.extend(changes)
+            return
+        with instruments.measure(ALL_SECTIONS, Stage.SIGNALS):
+            self.patched.emit(changes)
+            for path, callback in list(self._subscriptions):
+                matching = [change for change in changes if _overlaps(path, change.path)]
+                if matching:
+                    try:
+                        callback(matching)
+                    except Exception:
+                        self.log.exception(f"Settings subscriber of '{path}' failed")
+
+    def _publishing(self) -> bool:
+        return bool(self._subscriptions) or self.isSignalConnected(QtCore.QMetaMethod.fromSignal(self.patched))
+
+    def apply(self, models: Dict[str, BaseModel]) -> None:
+        """Replace the models of several sections at once, e.g. after validating imported data."""
+        publishing = self._publishing()
+        with self.batch():
+            for name, model in models.items():
+                previous, self._models[name] = self._models[name], model
+                self.invalidate(name)
+                self._touch(name)
+                if publishing:
+                    self._publish(diff(previous, model, pointer(name)))
+                # A view adjusting the model (e.g. clamping a value) comes back as an `update` within this batch
+                with instruments.measure(name, Stage.SIGNALS):
+                    self.model_replaced.emit(name, model)
+
+    def _migrate(self, document: Dict[str, Any], versions: Mapping[str, Any]) -> Tuple[ImportReport, Dict[str, Any]]:
+        # Upgrades the sections of older schema versions, a section that cannot be upgraded is rejected as a whole
+        report = ImportReport()
+        migrated = {}
+        for name, data in document.items():
+            model = self._types.get(name)
+            if model is None:
+                continue
+            version = versions.get(name, 0)
+            current = self.migrations.version(model)
+            if version == current:
+                continue
+            try:
+                if not isinstance(version, int):
+                    raise MigrationError(f"Invalid schema version {version!r}")
+                with instruments.measure(name, Stage.VALIDATION):
+                    migrated[name] = self.migrations.migrate(model, data, version)
+                report.migrated[name] = (version, current)
+            except Exception as e:
+                self.log.error(f"Failed to migrate section '{name}' from schema version {version}: {e}")
+                report.sections[name] = SectionReport(name, SectionReport.Status.REJECTED, [("", str(e))])
+        return report, migrated
+
+    def import_sections(
+        self, document: Dict[str, Any], workers: int = 0, versions: Mapping[str, Any] | None = None
+    ) -> ImportReport:
+        """Validate and apply every known section of `document` (section name to data), returns what was applied.
+
+        Sections of an older schema version, by `versions` or else by the document's own schema member, are
+        migrated first. An invalid field keeps its current value while the valid fields around it are still
+        applied, only errors that cannot be pinned on a field reject a whole section. Sections are independent and
+        are validated on `workers` threads when more than one.
+        """
+        document = dict(document)
+        metadata = document.pop(SCHEMA_KEY, None)
+        if versions is None:
+            versions = metadata if isinstance(metadata, dict) else {}
+        migration, migrated = self._migrate(document, versions)
+        document.update(migrated)
+        for name in migration.sections:
+            del document[name]
+
+        models, report = validate_sections(self._types, self._models, document, workers)
+        report.sections.update(migration.sections)
+        report.migrated = migration.migrated
+        self.apply(models)
+        if not report.ok:
+            self.log.warning(f"Imported config with errors:\n{report.summary()}")
+        return report
+
+    def import_data(self, data: bytes | bytearray, codec: Codec, workers: int = 0) -> ImportReport:
+        """Apply a whole exported document, validated natively in one pass when every section in it is valid.
+
+        Documents of sections with migrations may need upgrading first, they always take the per-section path.
+        """
+        if self.schema_versions():
+            return self.import_sections(codec.load(data), workers)
+        try:
+            with instruments.measure(ALL_SECTIONS, Stage.VALIDATION):
+                models = codec.decode(data, self._types)
+        except ValidationError:
+            return self.import_sections(codec.load(data), workers)
+
+        report = ImportReport()
+        report.sections = {name: SectionReport(name, SectionReport.Status.APPLIED) for name in models}
+        self.apply(models)
+        return report
+
+    def from_json(self, data: str | bytes) -> ImportReport:
+        report = self.import_data(data.encode() if isinstance(data, str) else data, JsonCodec())
+        self.log.info("Loaded config from settings")
+        return report
+
+    def load_default(self) -> None:
+        """Reset every section to its default, a section whose default is invalid keeps its data."""
+        models = {}
+        for name, default in self._defaults.items():
+            try:
+                models[name] = default()
+            except ValidationError as e:
+                self.log.error(f"Section '{name}' has no valid default: {e}")
+        self.apply(models)
+        self.log.info("Loaded default config")
+
+    def codec_for(self, path: str, data: bytes | bytearray | None = None) -> Codec:
+        """The codec of a file: by header when the data is known, else by extension, else the default."""
+        codecs = [codec for codec in self.codecs if codec.available]
+        if data is not None:
+            for codec in codecs:
+                if codec.recognizes(data):
+                    return codec
+        extension = os.path.splitext(path)[1].lower()
+        for codec in codecs:
+            if extension in codec.extensions:
+                return codec
+        return codecs[0]
+
+    def file_filter(self) -> str:
+        return ";;".join(codec.file_filter for codec in self.codecs if codec.available)
+
+    def load_file(self, path: str) -> ImportReport:
+        data = read_file(path)
+        report = self.import_data(data, self.codec_for(path, data))
+        self.log.info(f"Loaded config from {path}")
+        return report
+
+    def save_file(self, path: str) -> None:
+        codec = self.codec_for(path)
+        if self.background_writes:
+            self.writer.submit_file(path, self.snapshot(), partial(codec.encode, versions=self.schema_versions()))
+            self.log.info(f"Queued saving config to {path}")
+            return
+
+        # JSON reuses the cached serialization of the unchanged sections
+        if isinstance(codec, JsonCodec):
+            data = self.to_json().encode()
+        else:
+            with instruments.measure(ALL_SECTIONS, Stage.SERIALIZATION):
+                data = codec.encode(self.snapshot(), self.schema_versions())
+        with instruments.measure(ALL_SECTIONS, Stage.PERSISTENCE):
+            atomic_write(path, data, self.writer.fsync)
+        self.log.info(f"Saved config to {path}")
+
+    def _write_section(self, name: str) -> None:
+        key = f"{self.SECTIONS_GROUP}/{name}"
+        if self.storage_layout == self.StorageLayout.SECTIONS:
+            payload = self._section_fragment(name)
+            if self.store_cache.should_write(key, payload):
+                self.settings.setValue(key, payload)
+            return
+
+        # Only rewrite the fields whose serialized value differs from what the store holds
+        for field, value in self._models[name].model_dump(mode="json").items():
+            payload = json.dumps(value)
+            if self.store_cache.should_write(f"{key}/{field}", payload):
+                self.settings.setValue(f"{key}/{field}", payload)
+
+    def _obsolete_field_keys(self, name: str) -> List[str]:
+        # Fields a migration renamed or dropped would otherwise stay in the store forever
+        key = f"{self.SECTIONS_GROUP}/{name}"
+        self.settings.beginGroup(key)
+        try:
+            fields = self.settings.childKeys()
+        finally:
+            self.settings.endGroup()
+        keys = [f"{key}/{field}" for field in fields if field not in self._types[name].model_fields]
+        for field_key in keys:
+            self.store_cache.forget(field_key)
+        return keys
+
+    def _read_section(self, name: str, layout: StorageLayout | None = None) -> Tuple[dict | None, bool]:
+        """The stored data of a section, and whether the store still holds what was last read or written.
+
+        Reads the `layout` (SECTIONS or FIELDS) the store uses, unless another one is given.
+        """
+        key = f"{self.SECTIONS_GROUP}/{name}"
+        if (layout or self.storage_layout) == self.StorageLayout.SECTIONS:
+            payload = self.settings.value(key, None, str)
+            if not payload:
+                return None, False
+            return self.store_cache.read(key, payload, json.loads)
+
+        self.settings.beginGroup(key)
+        try:
+            payloads = {field: self.settings.value(field, None, str) for field in self.settings.childKeys()}
+        finally:
+            self.settings.endGroup()
+        if not payloads:
+            return None, False
+
+        # Fields missing from storage keep their current value
+        data = self._models[name].model_dump(mode="json")
+        unchanged = True
+        for field, payload in payloads.items():
+            if payload:
+                data[field], field_unchanged = self.store_cache.read(f"{key}/{field}", payload, json.loads)
+                unchanged = unchanged and field_unchanged
+        return data, unchanged
+
+    def _settings_payloads(self, snapshot: Snapshot, versions: Dict[str, int]) -> Dict[str, str]:
+        # Runs on the writer thread, must only depend on its arguments (the payload cache is thread-safe)
+        with instruments.measure(ALL_SECTIONS, Stage.SERIALIZATION):
+            return self._encode_payloads(snapshot, versions)
+
+    def _encode_payloads(self, snapshot: Snapshot, versions: Dict[str, int]) -> Dict[str, str]:
+        if self.storage_layout == self.StorageLayout.BLOB:
+            payloads = {self.LEGACY_KEY: encode_document(snapshot, versions)}
+        else:
+            payloads = {}
+            for name, model in snapshot.items():
+                key = f"{self.SECTIONS_GROUP}/{name}"
+                if self.storage_layout == self.StorageLayout.SECTIONS:
+                    payloads[key] = model.model_dump_json()
+                else:
+                    for field, value in model.model_dump(mode="json").items():
+                        payloads[f"{key}/{field}"] = json.dumps(value)
+        return {key: payload for key, payload in payloads.items() if self.store_cache.should_write(key, payload)}
+
+    def _stored_version(self, name: str) -> int:
+        try:
+            return int(self.settings.value(f"{self.VERSIONS_GROUP}/{name}", 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def _next_versions(self, names: Iterable[str]) -> Dict[str, str]:
+        """Settings keys and values of the version stamps of the sections about to be written."""
+        if self.conflict_policy != self.ConflictPolicy.VERSION_STAMP:
+            return {}
+        stamps = {}
+        for name in names:
+            self._versions[name] = self._versions.get(name, 0) + 1
+            stamps[f"{self.VERSIONS_GROUP}/{name}"] = str(self._versions[name])
+        return stamps
+
+    def _stored_schema(self, name: str) -> int:
+        try:
+            return int(self.settings.value(f"{self.SCHEMA_GROUP}/{name}", 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def _schema_stamps(self, names: Iterable[str]) -> Dict[str, str]:
+        """Settings keys and values of the schema versions that change with the sections about to be written."""
+        if self.storage_layout == self.StorageLayout.BLOB:
+            return {}  # The blob carries its schema versions itself
+        stamps = {}
+        for name in names:
+            version = self.migrations.version(self._types[name])
+            if version != self._schemas.get(name, 0):
+                self._schemas[name] = version
+                stamps[f"{self.SCHEMA_GROUP}/{name}"] = str(version)
+        return stamps
+
+    def save_to_settings(self):
+        self.persistence.cancel()
+        unsaved = self._unsaved & self._types.keys()
+        stamps = {**self._next_versions(unsaved), **self._schema_stamps(unsaved)}
+        # Both paths remove the fields a schema change dropped, before the new fields are written
+        obsolete = []
+        if self.storage_layout == self.StorageLayout.FIELDS:
+            for name in unsaved:
+                if f"{self.SCHEMA_GROUP}/{name}" in stamps:
+                    obsolete.extend(self._obsolete_field_keys(name))
+        if self.background_writes:
+            if self.storage_layout == self.StorageLayout.BLOB:
+                names = set(self._types)
+            else:
+                names = unsaved
+            # The stamps travel with the snapshot, a save that supersedes this one keeps them
+            values = {**dict.fromkeys(obsolete), **stamps}
+            encode = partial(self._settings_payloads, versions=self.schema_versions())
+            self.writer.submit_settings(self.settings, self.snapshot(names), encode, values)
+        else:
+            if self.storage_layout == self.StorageLayout.BLOB:
+                payload = self.to_json()
+                if self.store_cache.should_write(self.LEGACY_KEY, payload):
+                    with instruments.measure(ALL_SECTIONS, Stage.PERSISTENCE):
+                        self.settings.setValue(self.LEGACY_KEY, payload)
+            else:
+                for key in obsolete:
+                    self.settings.remove(key)
+                for name in unsaved:
+                    with instruments.measure(name, Stage.PERSISTENCE):
+                        self._write_section(name)
+            for key, stamp in stamps.items():
+                self.settings.setValue(key, stamp)
+        self._unsaved.clear()
+        self.log.info("Saved config to settings")
+
+    def _remove_section_keys(self, name: str, layout: StorageLayout) -> None:
+        key = f"{self.SECTIONS_GROUP}/{name}"
+        if layout == self.StorageLayout.SECTIONS:
+            # Must not run once the section is stored by field, removing a key removes its sub-keys too
+            self.settings.remove(key)
+            self.store_cache.forget(key)
+        else:
+            self.settings.beginGroup(key)
+            try:
+                fields = self.settings.childKeys()
+            finally:
+                self.settings.endGroup()
+            for field in fields:
+                self.settings.remove(f"{key}/{field}")
+                self.store_cache.forget(f"{key}/{field}")
+        if self.storage_layout == self.StorageLayout.BLOB:
+            self.settings.remove(f"{self.SCHEMA_GROUP}/{name}")
+
+    def _convert_sections(self, names: Iterable[str], layouts: Iterable[StorageLayout]) -> List[str]:
+        """Import the sections of `names` stored in one of the other per-section `layouts`, and remove them there.
+
+        Returns the converted sections, they stay unsaved and are written in the store's own layout.
+        """
+        layouts = list(layouts)
+        document: Dict[str, Any] = {}
+        versions: Dict[str, int] = {}
+        sources: Dict[str, SettingsStore.StorageLayout] = {}
+        for name in names:
+            for layout in layouts:
+                try:
+                    data, _ = self._read_section(name, layout)
+                except json.JSONDecodeError as e:
+                    self.log.error(f"Failed to parse stored section '{name}': {e}")
+                    continue
+                if data is not None:
+                    document[name], versions[name], sources[name] = data, self._stored_schema(name), layout
+                    break
+        if not document:
+            return []
+
+        self.import_sections(document, versions=versions)
+        for name, layout in sources.items():
+            self._remove_section_keys(name, layout)
+        self.log.info(f"Converted sections {', '.join(document)} to the {self.storage_layout.name} storage layout")
+        return list(document)
+
+    def _stored_as_is(self, document: Mapping[str, Any], report: ImportReport) -> List[str]:
+        """The loaded sections that need no write back: applied, and serializing to exactly their stored data.
+
+        Migrated sections are written back once in their current schema, and so are sections whose data serializes
+        differently now, e.g. secrets stored in plain text before they were encrypted.
+        """
+        names = [name for name in report.names(SectionReport.Status.APPLIED) if name not in report.migrated]
+        return [name for name in names if self._models[name].model_dump(mode="json") == document[name]]
+
+    def _load_blob(self, stored: List[str]) -> bool:
+        payload = self.settings.value(self.LEGACY_KEY, None, str)
+        if not isinstance(payload, str) or payload == "":
+            # Settings written with one key per section
+            return bool(self._convert_sections(self._types, [self.StorageLayout.SECTIONS, self.StorageLayout.FIELDS]))
+
+        document, unchanged = self.store_cache.read(self.LEGACY_KEY, payload, json.loads)
+        if unchanged and not self._unsaved:
+            return True  # The sections already hold exactly what is stored
+        report = self.import_sections(document)
+        stored.extend(self._stored_as_is(document, report))
+        return True
+
+    def _load_sections(self, stored: List[str]) -> bool:
+        # Transparently migrate the single blob format to one key per section
+        legacy = self.settings.value(self.LEGACY_KEY, None, str)
+        if legacy:
+            self.from_json(legacy)
+            self.settings.remove(self.LEGACY_KEY)
+            self.store_cache.forget(self.LEGACY_KEY)
+            self.log.info("Migrated config from a single settings key to one key per section")
+            return True
+
+        self._schemas = {name: self._stored_schema(name) for name in self._types}
+        document = {}
+        missing = []
+        found = False
+        for name in self._types:
+            try:
+                data, unchanged = self._read_section(name)
+            except json.JSONDecodeError as e:
+                self.log.error(f"Failed to parse stored section '{name}': {e}")
+                continue
+            if data is None:
+                missing.append(name)
+                continue
+            found = True
+            if not unchanged or name in self._unsaved:
+                document[name] = data
+        if document:
+            report = self.import_sections(document, versions=self._schemas)
+            stored.extend(self._stored_as_is(document, report))
+
+        # Sections stored by the other per-section layout, before the layout was switched
+        if self.storage_layout == self.StorageLayout.SECTIONS:
+            other = self.StorageLayout.FIELDS
+        else:
+            other = self.StorageLayout.SECTIONS
+        converted = self._convert_sections(missing, [other])
+        return found or bool(converted)
+
+    def load_from_settings(self):
+        # Sections applied exactly as stored need no write back
+        stored: List[str] = []
+        with self.batch(persist=False):
+            if self.storage_layout == self.StorageLayout.BLOB:
+                loaded = self._load_blob(stored)
+            else:
+                loaded = self._load_sections(stored)
+
+            if not loaded:
+                self.log.error("Failed to load config from settings")
+                self.load_default()
+        self._unsaved.difference_update(stored)
+        if self.conflict_policy == self.ConflictPolicy.VERSION_STAMP:
+            self._versions = {name: self._stored_version(name) for name in self._types}
+        if self._unsaved:
+            self.save_to_settings()
+
+    def watch_settings(self, enabled: bool = True, poll_ms: int = 0) -> None:
+        """Apply the changes other processes make to the settings file while the store is in use.
+
+        Polls every `poll_ms` when given, needed for files shared over the network. Not available for settings
+        that are not stored in a file (the Windows registry).
+        """
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher.deleteLater()
+            self.watcher = None
+        if not enabled:
+            return
+
+        path = os.path.abspath(self.settings.fileName())
+        if not os.path.isdir(os.path.dirname(path)):
+            self.log.warning(f"Settings '{path}' are not stored in a file, external changes are not watched")
+            return
+        self.watcher = SettingsWatcher(path, poll_ms, parent=self)
+        self.watcher.changed.connect(self.reload_external)
+        self.watcher.start()
+
+    def _read_changed_sections(self) -> Tuple[Dict[str, Any], Mapping[str, Any]]:
+        """The stored data of every section whose payload differs from what was last read or written, and the
+        schema versions of that data."""
+        if self.storage_layout == self.StorageLayout.BLOB:
+            payload = self.settings.value(self.LEGACY_KEY, None, str)
+            if not isinstance(payload, str) or payload == "":
+                return {}, {}
+            previous = self.store_cache.decoded(self.LEGACY_KEY)
+            document, unchanged = self.store_cache.read(self.LEGACY_KEY, payload, json.loads)
+            if unchanged or not isinstance(document, dict):
+                return {}, {}
+            if not isinstance(previous, dict):
+                # Only ever written from here, what was written is the current data
+                previous = {name: model.model_dump(mode="json") for name, model in self._models.items()}
+            versions = document.get(SCHEMA_KEY)
+            changed = {
+                name: data for name, data in document.items() if name in self._types and previous.get(name) != data
+            }
+            return changed, versions if isinstance(versions, dict) else {}
+
+        changed = {}
+        for name in self._types:
+            try:
+                data, unchanged = self._read_section(name)
+            except json.JSONDecodeError as e:
+                self.log.error(f"Failed to parse stored section '{name}': {e}")
+                continue
+            if data is not None and not unchanged:
+                changed[name] = data
+        return changed, {name: self._stored_schema(name) for name in changed}
+
+    def _keeps_local_edit(self, name: str) -> bool:
+        if self.conflict_policy == self.ConflictPolicy.VERSION_STAMP:
+            return self._stored_version(name) <= self._versions.get(name, 0)
+        try:
+            modified = os.path.getmtime(self.settings.fileName())
+        except OSError:
+            return False
+        return self._edited_at.get(name, 0.0) > modified
+
+    def reload_external(self) -> List[str]:
+        """Apply the sections someone else changed in the settings store, returns their names.
+
+        Only changed sections are applied, through the normal change path, and applying them writes nothing back.
+        A section that was also edited here since the last save is resolved by `conflict_policy`.
+        """
+        self.settings.sync()
+        changed, versions = self._read_changed_sections()
+        for name in [name for name in changed if name in self._unsaved]:
+            if self._keeps_local_edit(name):
+                self.log.warning(f"Section '{name}' was changed externally and here, keeping the local edit")
+                del changed[name]
+            else:
+                self.log.warning(f"Section '{name}' was changed externally and here, keeping the external change")
+        if not changed:
+            return []
+
+        with self.batch(persist=False):
+            report = self.import_sections(changed, versions=versions)
+        self._unsaved.difference_update(report.names(SectionReport.Status.APPLIED))
+        if self.storage_layout != self.StorageLayout.BLOB:
+            self._schemas.update({name: versions[name] for name in changed})
+        if report.migrated:
+            # Another process wrote an older schema, store the upgraded sections
+            self._unsaved.update(report.migrated)
+            self.data_changed()
+        if self.conflict_policy == self.ConflictPolicy.VERSION_STAMP:
+            self._versions.update({name: self._stored_version(name) for name in changed})
+        self.log.info(f"Reloaded sections changed externally: {', '.join(changed)}")
+        return list(changed)
+
+    def flush_writes(self) -> None:
+        """Write pending changes now and wait for background writes to finish."""
+        self.persistence.flush()
+        self.writer.wait()
+
+    def _on_write_finished(self, result: WriteResult) -> None:
+        if result.error is None:
+            return
+        # Some payloads recorded as written never made it to the store
+        self.store_cache.forget()
+        self.write_failed.emit(result)
+
+    def data_changed(self):
+        if self.block_signals or self._batch_depth:
+            return
+
+        self.persistence.schedule()
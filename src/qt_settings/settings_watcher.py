@@ -0,0 +1,100 @@
+import logging
+import os
+from typing import Tuple
+
+from qtpy import QtCore
+
+_Stamp = Tuple[int, int] | None
+
+
+def _stamp(path: str) -> _Stamp:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SettingsWatcher(QtCore.QObject):
+    """Notices when the file behind a QSettings is modified, e.g. by another process sharing it.
+
+    Uses a QFileSystemWatcher on the file and its directory (files are usually replaced rather than rewritten), and
+    polls the file's modification time where that is not possible or when `poll_ms` is given: file systems mounted
+    over the network do not report changes made from other machines.
+    """
+
+    changed = QtCore.Signal()
+
+    # Poll interval when the file system cannot be watched and no `poll_ms` was given
+    FALLBACK_POLL_MS = 1000
+
+    def __init__(
+        self, path: str, poll_ms: int = 0, debounce_ms: int = 100, parent: QtCore.QObject | None = None
+    ) -> None:
+        super().__init__(parent)
+        self.log = logging.getLogger(__name__)
+        self.path = os.path.abspath(path)
+        self.poll_ms = poll_ms
+        self.last_stamp: _Stamp = None
+
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_event)
+        self._watcher.directoryChanged.connect(self._on_event)
+
+        # A save shows up as several events, they are handled once things have settled
+        self._debounce = QtCore.QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self.check)
+
+        self._poll = QtCore.QTimer(self)
+        self._poll.timeout.connect(self.check)
+
+    @property
+    def active(self) -> bool:
+        return bool(self._watcher.files() or self._watcher.directories()) or self._poll.isActive()
+
+    @property
+    def polling(self) -> bool:
+        return self._poll.isActive()
+
+    def start(self) -> None:
+        self.last_stamp = _stamp(self.path)
+        watched = self._watch()
+        poll_ms = self.poll_ms or (0 if watched else self.FALLBACK_POLL_MS)
+        if poll_ms:
+            self._poll.start(poll_ms)
+        if not watched:
+            self.log.info(f"Cannot watch '{self.path}', polling for changes every {poll_ms} ms")
+
+    def stop(self) -> None:
+        self._debounce.stop()
+        self._poll.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def check(self) -> bool:
+        """Emit `changed` if the file was modified since the last check, returns whether it was."""
+        # A replaced file is no longer watched once the old one is gone
+        if self._watcher.directories() and self.path not in self._watcher.files() and os.path.exists(self.path):
+            self._watcher.addPath(self.path)
+
+        stamp = _stamp(self.path)
+        if stamp == self.last_stamp:
+            return False
+        self.last_stamp = stamp
+        if stamp is not None:
+            self.changed.emit()
+        return True
+
+    def _watch(self) -> bool:
+        directory = os.path.dirname(self.path)
+        if not os.path.isdir(directory) or not self._watcher.addPath(directory):
+            return False
+        if os.path.exists(self.path):
+            self._watcher.addPath(self.path)
+        return True
+
+    def _on_event(self, path: str) -> None:
+        self._debounce.start()
@@ -0,0 +1,183 @@
+import contextlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, Mapping, Optional
+
+from pydantic import BaseModel
+from qtpy import QtCore
+
+Snapshot = Mapping[str, BaseModel]
+# Settings keys written along with a snapshot, None removes the key
+SettingsValues = Mapping[str, Optional[str]]
+
+
+def atomic_write(path: str, data: str | bytes, fsync: bool = False) -> None:
+    """Write `data` to `path` so readers see either the old or the new file, never a truncated one."""
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        # mkstemp creates the file private to the user, keep the permissions a plain open() would give
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class WriteResult:
+    def __init__(self, target: str, error: Exception | None = None) -> None:
+        self.target = target
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f"WriteResult(target={self.target!r}, error={self.error!r})"
+
+
+class _WriteJob:
+    def __init__(
+        self, target: str, snapshot: Snapshot, write: Callable[[Snapshot, SettingsValues], None], values: SettingsValues
+    ) -> None:
+        self.target = target
+        self.snapshot = snapshot
+        self.write = write
+        self.values = values
+
+
+class _WriteRunnable(QtCore.QRunnable):
+    def __init__(self, writer: "SnapshotWriter", target: str) -> None:
+        super().__init__()
+        self._writer = writer
+        self._target = target
+
+    def run(self) -> None:
+        self._writer._run(self._target)
+
+
+class SnapshotWriter(QtCore.QObject):
+    """Serializes and writes model snapshots on a background thread.
+
+    Only the newest snapshot per target is written, older snapshots that did not start yet are dropped.
+    Every executed write reports a `WriteResult` through `finished`, which is delivered in the thread
+    the writer lives in.
+    """
+
+    finished = QtCore.Signal(object)
+
+    def __init__(self, fsync: bool = False, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.fsync = fsync
+        self.log = logging.getLogger(__name__)
+
+        # A single thread keeps writes to the same target in submission order
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._lock = threading.Lock()
+        self._pending: Dict[str, _WriteJob] = {}
+
+        self.submitted = 0
+        self.written = 0
+        self.superseded = 0
+        self.failed = 0
+
+    def submit(
+        self,
+        target: str,
+        snapshot: Snapshot,
+        write: Callable[[Snapshot, SettingsValues], None],
+        values: SettingsValues | None = None,
+    ) -> None:
+        """Queue `write(snapshot, values)`, replacing a queued job for the same target that has not started yet.
+
+        The replaced job's snapshot and `values` are merged into the new ones, so `write` must only depend on
+        its arguments.
+        """
+        values = values or {}
+        with self._lock:
+            self.submitted += 1
+            previous = self._pending.get(target)
+            # A partial snapshot must not lose entries of the one it replaces, newer entries win
+            if previous is not None:
+                snapshot, values = {**previous.snapshot, **snapshot}, {**previous.values, **values}
+            self._pending[target] = _WriteJob(target, dict(snapshot), write, dict(values))
+            if previous is not None:
+                self.superseded += 1
+                return
+
+        self._pool.start(_WriteRunnable(self, target))
+
+    def submit_file(self, path: str, snapshot: Snapshot, encode: Callable[[Snapshot], str | bytes]) -> None:
+        self.submit(path, snapshot, lambda snapshot, _: atomic_write(path, encode(snapshot), self.fsync))
+
+    def submit_settings(
+        self,
+        settings: QtCore.QSettings,
+        snapshot: Snapshot,
+        encode: Callable[[Snapshot], Dict[str, str]],
+        values: SettingsValues | None = None,
+    ) -> None:
+        """Write `encode(snapshot)` and `values` (e.g. stamps of the snapshot's sections) to the store of `settings`."""
+        # QSettings is reentrant, not thread-safe: the worker uses its own instance on the same store
+        file_name, settings_format = settings.fileName(), settings.format()
+
+        def write(snapshot: Snapshot, values: SettingsValues) -> None:
+            worker_settings = QtCore.QSettings(file_name, settings_format)
+            for key, payload in {**encode(snapshot), **values}.items():
+                if payload is None:
+                    worker_settings.remove(key)
+                else:
+                    worker_settings.setValue(key, payload)
+            worker_settings.sync()
+            if worker_settings.status() != QtCore.QSettings.Status.NoError:
+                raise OSError(f"Failed to write settings to '{file_name}'")
+
+        self.submit(file_name, snapshot, write, values)
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """Block until all queued writes are done, returns False on timeout."""
+        return self._pool.waitForDone(timeout_ms)
+
+    def _run(self, target: str) -> None:
+        with self._lock:
+            job = self._pending.pop(target, None)
+        if job is None:
+            return
+
+        try:
+            job.write(job.snapshot, job.values)
+        except Exception as e:
+            self.failed += 1
+            self.log.error(f"Failed to write '{target}': {e}")
+            self.finished.emit(WriteResult(target, e))
+            return
+
+        self.written += 1
+        self.finished.emit(WriteResult(target))
@@ -1,22 +1,104 @@
-import json
+import contextlib
 import logging
-from typing import Dict
+import traceback
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Type
 
+from pydantic import BaseModel
 from qt_utils import messaging
 from qtpy import QtCore, QtGui, QtWidgets
 from qtpy.QtWidgets import QWidget
 
-from .widgets import PathQuery, QGenericSettingsWidget
+from .bulk_import import ImportReport
+from .codecs import Codec
+from .instrumentation import instruments
+from .patches import FieldChange
+from .settings_store import PersistenceScheduler, SettingsStore, encode_document  # noqa: F401 (public here before)
+from .snapshot_writer import WriteResult
+from .widgets.generic_config import QGenericSettingsWidget
+from .widgets.path.path_query import PathQuery
+
+
+def _store_attribute(name: str) -> property:
+    # Attributes that moved to the store stay available on the dialog
+    return property(lambda self: getattr(self.store, name), lambda self, value: setattr(self.store, name, value))
+
+
+class _LazyTab(QWidget):
+    """Placeholder tab page that builds its real widget the first time it is shown."""
+
+    def __init__(self, build: Callable[[], QGenericSettingsWidget]) -> None:
+        super().__init__()
+        self._build = build
+        self._layout = QtWidgets.QVBoxLayout()
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self._layout)
+
+    @property
+    def built(self) -> bool:
+        return self._build is None
+
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        if self._build is not None:
+            build, self._build = self._build, None
+            self._layout.addWidget(build())
+        super().showEvent(event)
 
 
 class ConfigDialog(QtWidgets.QDialog):
+    """Tabbed view of a `SettingsStore`, with one settings widget per section.
+
+    Widget edits are pushed to the store, and models the store replaces (loads, imports, defaults) are pushed to
+    the widgets. Persistence, serialization and change notification all live in the store.
+    """
+
+    StorageLayout = SettingsStore.StorageLayout
+    ConflictPolicy = SettingsStore.ConflictPolicy
+
+    LEGACY_KEY = SettingsStore.LEGACY_KEY
+    SECTIONS_GROUP = SettingsStore.SECTIONS_GROUP
+    VERSIONS_GROUP = SettingsStore.VERSIONS_GROUP
+
     configs: Dict[str, QGenericSettingsWidget]
-    block_signals: bool = False
 
-    def __init__(self, parent: QWidget, settings: QtCore.QSettings):
+    settings = _store_attribute("settings")
+    storage_layout = _store_attribute("storage_layout")
+    background_writes = _store_attribute("background_writes")
+    conflict_policy = _store_attribute("conflict_policy")
+    block_signals = _store_attribute("block_signals")
+    persistence = _store_attribute("persistence")
+    writer = _store_attribute("writer")
+    store_cache = _store_attribute("store_cache")
+    codecs = _store_attribute("codecs")
+    watcher = _store_attribute("watcher")
+
+    def __init__(
+        self,
+        parent: QWidget,
+        settings: QtCore.QSettings,
+        save_delay_ms: int = 250,
+        max_save_latency_ms: int = 2000,
+        storage_layout: StorageLayout = StorageLayout.BLOB,
+        background_writes: bool = False,
+        conflict_policy: ConflictPolicy = ConflictPolicy.LAST_WRITER_WINS,
+        store: SettingsStore | None = None,
+    ):
+        """Views `store` when given (the other settings arguments are then ignored), else a store of its own."""
         super().__init__(parent)
-        self.settings = settings
-        self.path_query = PathQuery(self, settings, "test", "*.json")
+        if store is None:
+            store = SettingsStore(
+                settings,
+                save_delay_ms,
+                max_save_latency_ms,
+                storage_layout,
+                background_writes,
+                conflict_policy,
+                parent=self,
+            )
+        self.store = store
+        self.store.model_replaced.connect(self._on_model_replaced)
+        self.store.write_failed.connect(self._on_write_failed)
+        self.path_query = PathQuery(self, self.store.settings, "test", "*.json")
 
         self.setWindowTitle("Configuration")
         self.resize(400, 300)
@@ -39,83 +121,197 @@ class ConfigDialog(QtWidgets.QDialog):
         self._layout.addWidget(self._tab_widget)
         self.setLayout(self._layout)
 
+        # Built widgets, and the tab page of every section (a placeholder until its widget is built)
         self.configs = {}
+        self._tabs: Dict[str, QWidget] = {}
+
+    @property
+    def patched(self) -> QtCore.SignalInstance:
+        """All FieldChanges of one edit, load or batch, with paths prefixed by the section ("/influx/url")."""
+        return self.store.patched
+
+    @property
+    def sections_changed(self) -> QtCore.SignalInstance:
+        """Names of the sections changed by one edit, load or batch."""
+        return self.store.sections_changed
+
+    @property
+    def sections(self) -> list[str]:
+        """Names of all sections with a tab, built or not, in tab order."""
+        return list(self._tabs)
+
+    def invalidate(self, name: str | None = None) -> None:
+        self.store.invalidate(name)
 
     def to_json(self) -> str:
-        data = {}
-        for name, config in self.configs.items():
-            data[name] = config.data.model_dump()
-        return json.dumps(data)
-
-    def from_json(self, data: str) -> None:
-        data = json.loads(data)
-        for name, config in self.configs.items():
-            if name in data:
-                try:
-                    config.data = config.data.model_validate(data[name])  # type: ignore
-                except Exception as e:
-                    print(e)
-        self.log.info("Loaded config from settings")
+        return self.store.to_json()
+
+    def subscribe(self, path: str, callback: Callable[[List[FieldChange]], None]) -> Callable[[], None]:
+        return self.store.subscribe(path, callback)
+
+    @contextlib.contextmanager
+    def batch(self, persist: bool = True) -> Iterator[None]:
+        """Group changes: `with dialog.batch(): ...`
+
+        Like `SettingsStore.batch`, and the widgets do not emit per input change either: leaving the outermost
+        batch emits one `changed` per touched widget.
+        """
+        outermost = not self.store.batching
+        with self.store.batch(persist):
+            held = list(self.configs.values()) if outermost else []
+            for widget in held:
+                widget.hold_changes()
+            try:
+                yield
+            finally:
+                # Still inside the store's batch, so their single changes are collected
+                for widget in held:
+                    widget.release_changes()
+
+    def import_sections(
+        self, document: Dict[str, Any], workers: int = 0, versions: Mapping[str, Any] | None = None
+    ) -> ImportReport:
+        return self.store.import_sections(document, workers, versions)
+
+    def import_data(self, data: bytes | bytearray, codec: Codec, workers: int = 0) -> ImportReport:
+        return self.store.import_data(data, codec, workers)
+
+    def from_json(self, data: str | bytes) -> ImportReport:
+        return self.store.from_json(data)
+
+    def codec_for(self, path: str, data: bytes | bytearray | None = None) -> Codec:
+        return self.store.codec_for(path, data)
 
     @messaging.catch_exception("Failed to load config from file")
     def load_from_file(self):
-        path = self.path_query.get_path(PathQuery.LoadSaveEnum.LOAD_FILE)
+        path = self.path_query.get_path(PathQuery.LoadSaveEnum.LOAD_FILE, self.store.file_filter())
 
         if path is None:
             return
 
-        with open(path, "r") as f:
-            self.from_json(f.read())
-        self.log.info(f"Loaded config from {path}")
+        report = self.store.load_file(path)
+        if not report.ok:
+            messaging.Error(
+                trace=report.summary(), error=f"Some settings in {path} were not imported"
+            ).to_result().display(self)
 
     @messaging.catch_exception("Failed to save config to file")
     def save_to_file(self):
-        path = self.path_query.get_path(PathQuery.LoadSaveEnum.SAVE_FILE)
+        path = self.path_query.get_path(PathQuery.LoadSaveEnum.SAVE_FILE, self.store.file_filter())
 
         if path is None:
             return
 
-        with open(path, "w") as f:
-            f.write(self.to_json())
-        self.log.info(f"Saved config to {path}")
+        self.store.save_file(path)
 
     @messaging.catch_exception("Failed to load default config")
     def load_default(self):
-        for config in self.configs.values():
-            config.from_default()
-        self.log.info("Loaded default config")
+        self.store.load_default()
 
     def save_to_settings(self):
-        self.settings.setValue("config", self.to_json())
-        self.log.info("Saved config to settings")
+        self.store.save_to_settings()
 
     def load_from_settings(self):
-        self.block_signals = True
-        data = self.settings.value("config", None, str)
-        if data is None or not isinstance(data, str) or data == "":
-            self.log.error("Failed to load config from settings")
-            self.load_default()
-        else:
-            self.from_json(data)
-        self.block_signals = False
-        self.save_to_settings()
+        self.store.load_from_settings()
+
+    def watch_settings(self, enabled: bool = True, poll_ms: int = 0) -> None:
+        self.store.watch_settings(enabled, poll_ms)
+
+    def reload_external(self) -> List[str]:
+        return self.store.reload_external()
 
     def open(self):
         self.show()
 
+    def flush_writes(self) -> None:
+        self.store.flush_writes()
+
+    def _on_write_failed(self, result: WriteResult) -> None:
+        trace = "".join(traceback.format_exception(result.error))
+        error = messaging.Error(trace=trace, error=f"Failed to save config to {result.target}: {result.error}")
+        error.to_result().display(self)
+
+    def hideEvent(self, event: QtGui.QHideEvent) -> None:
+        # Closing the dialog should never leave edits waiting on a timer
+        self.store.persistence.flush()
+        super().hideEvent(event)
+
     def add_widget(self, name: str, widget: QGenericSettingsWidget):
         # Check if sublass is QGenericSettingsWidget
         assert isinstance(widget, QGenericSettingsWidget)
 
+        data = widget.data
+        self.store.add_section(name, type(data), partial(self._widget_default, widget), data)
+        widget.instrument_name = name
         self.configs[name] = widget
-        widget.changed.connect(self.data_changed)
+        self._tabs[name] = widget
+        widget.changed.connect(partial(self._on_section_changed, name))
         self._tab_widget.addTab(widget, name)
 
-    def data_changed(self):
-        if self.block_signals:
-            return
+    def add_widget_factory(
+        self,
+        name: str,
+        model: Type[BaseModel],
+        factory: Callable[[], QGenericSettingsWidget],
+        default: BaseModel | None = None,
+    ):
+        """Register a section whose widget is only built when its tab is first shown.
+
+        Until then the section lives as `model` data in the store only, initialised from `default` (or `model()`).
+        That default stays the section's default once the widget is built, `load_default` must not depend on which
+        tabs were shown: the widget's own `from_default` is not used, pass its default as `default`.
+        """
+        self.store.add_section(name, model, default)
 
-        self.save_to_settings()
+        tab = _LazyTab(partial(self._build_widget, name, factory))
+        self._tabs[name] = tab
+        self._tab_widget.addTab(tab, name)
+
+    def add_instrumentation_tab(self, name: str = "Instrumentation") -> None:
+        """Add a debug tab with the timings of the settings pipeline, and start recording them."""
+        from .widgets.instrumentation_view import QInstrumentationView
+
+        instruments.enable()
+        self._tab_widget.addTab(QInstrumentationView(instruments), name)
+
+    def _build_widget(self, name: str, factory: Callable[[], QGenericSettingsWidget]) -> QGenericSettingsWidget:
+        widget = factory()
+        assert isinstance(widget, QGenericSettingsWidget)
+
+        # Push the store's data before connecting, building a tab is not a change
+        widget.data = self.store.model(name)
+        widget.instrument_name = name
+        self.configs[name] = widget
+        widget.changed.connect(partial(self._on_section_changed, name))
+        self.log.debug(f"Built settings tab '{name}'")
+        return widget
+
+    @staticmethod
+    def _widget_default(widget: QGenericSettingsWidget) -> BaseModel:
+        # Widgets may override `from_default`, which resets the widget itself: not an edit, the store applies it
+        blocked = widget.blockSignals(True)
+        try:
+            widget.from_default()
+            return widget.data
+        finally:
+            widget.blockSignals(blocked)
+
+    def _on_section_changed(self, name: str, model: BaseModel) -> None:
+        # Widgets re-emit what the store pushed to them, only real edits go back
+        if model != self.store.model(name):
+            self.store.update(name, model)
+
+    def _on_model_replaced(self, name: str, model: BaseModel) -> None:
+        widget = self.configs.get(name)
+        if widget is None:
+            return  # Unbuilt tabs read the store when they are built
+        # One `changed` at most, carrying whatever the inputs made of the model (e.g. clamped values)
+        widget.hold_changes()
+        widget.data = model
+        widget.release_changes()
+
+    def data_changed(self):
+        self.store.data_changed()
 
     def get_menuaction(self) -> QtGui.QAction:
         action = QtGui.QAction("Settings", self)
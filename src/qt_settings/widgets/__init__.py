@@ -1,6 +1,50 @@
-from .generic_config import QGenericSettingsWidget
-from .influx_config import QInfluxConfigWidget
-from .path.path_query import PathQuery
-from .path_config import QPathSelector
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["QInfluxConfigWidget", "QPathSelector", "PathQuery", "QGenericSettingsWidget"]
+_LAZY_ATTRIBUTES = {
+    "QGenericSettingsWidget": ".generic_config",
+    "QAutoSettingsWidget": ".auto_config",
+    "PathField": ".auto_config",
+    "QTreeSettingsWidget": ".tree_config",
+    "QInfluxConfigWidget": ".influx_config",
+    "InfluxWriter": ".influx.writer",
+    "PathQuery": ".path.path_query",
+    "QPathSelector": ".path_config",
+    "QInstrumentationView": ".instrumentation_view",
+}
+
+if TYPE_CHECKING:
+    from .auto_config import PathField, QAutoSettingsWidget
+    from .generic_config import QGenericSettingsWidget
+    from .influx.writer import InfluxWriter
+    from .influx_config import QInfluxConfigWidget
+    from .instrumentation_view import QInstrumentationView
+    from .path.path_query import PathQuery
+    from .path_config import QPathSelector
+    from .tree_config import QTreeSettingsWidget
+
+__all__ = [
+    "QInfluxConfigWidget",
+    "QPathSelector",
+    "PathQuery",
+    "QGenericSettingsWidget",
+    "QAutoSettingsWidget",
+    "PathField",
+    "QTreeSettingsWidget",
+    "InfluxWriter",
+    "QInstrumentationView",
+]
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
@@ -0,0 +1,364 @@
+import enum
+import json
+import logging
+import pathlib
+import types
+import typing
+from functools import partial
+from operator import attrgetter
+from typing import Any, Callable, Tuple, Type
+
+import annotated_types
+from pydantic import BaseModel, SecretStr, TypeAdapter, ValidationError
+from pydantic.fields import FieldInfo
+from qtpy import QtCore, QtWidgets
+
+from .generic_config import QGenericSettingsWidget
+from .path.path_query import PathQuery
+from .path_config import QPathSelector
+from .secret_edit import QSecretEdit
+
+_INT_LIMIT = 2**31 - 1
+_FLOAT_LIMIT = 1e12
+
+
+class PathField:
+    """Marks a `str` or `Path` field as a path, edited with a `QPathSelector`.
+
+    `path: Annotated[str, PathField(PathQuery.LoadSaveEnum.EXISTING_DIRECTORY)] = ""`
+    """
+
+    def __init__(
+        self, type: PathQuery.LoadSaveEnum = PathQuery.LoadSaveEnum.LOAD_FILE, supported_types: str = "All Files (*)"
+    ) -> None:
+        self.type = type
+        self.supported_types = supported_types
+
+
+class FieldBinder:
+    """How one model field is edited: which input to create, which signal means changed, how to read and write it."""
+
+    def __init__(
+        self,
+        name: str,
+        label: str,
+        create: Callable[[], QtWidgets.QWidget],
+        signal: Callable[[Any], Any] | None,
+        read: Callable[[Any], Any],
+        write: Callable[[Any, Any], None],
+        tooltip: str | None = None,
+    ) -> None:
+        self.name = name
+        self.label = label
+        self.create = create
+        # Gets the changed signal from an input, None for nested settings widgets which use bind_child
+        self.signal = signal
+        self.read = read
+        self.write = write
+        self.tooltip = tooltip
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _is_optional(annotation: Any) -> bool:
+    union = typing.get_origin(annotation) in (typing.Union, types.UnionType)
+    return union and type(None) in typing.get_args(annotation)
+
+
+def _bounds(info: FieldInfo, step: float, limit: float) -> Tuple[float, float]:
+    minimum, maximum = -limit, limit
+    for constraint in info.metadata:
+        if isinstance(constraint, annotated_types.Ge):
+            minimum = constraint.ge  # type: ignore
+        elif isinstance(constraint, annotated_types.Gt):
+            minimum = constraint.gt + step  # type: ignore
+        elif isinstance(constraint, annotated_types.Le):
+            maximum = constraint.le  # type: ignore
+        elif isinstance(constraint, annotated_types.Lt):
+            maximum = constraint.lt - step  # type: ignore
+    return minimum, maximum
+
+
+def _allow_none(spin_box: QtWidgets.QAbstractSpinBox, minimum: float, step: float) -> None:
+    # One step below the range stands for None, shown as "None"
+    spin_box.setMinimum(minimum - step)  # type: ignore
+    spin_box.setSpecialValueText("None")
+
+
+def _create_spin_box(info: FieldInfo, optional: bool = False) -> QtWidgets.QSpinBox:
+    spin_box = QtWidgets.QSpinBox()
+    minimum, maximum = _bounds(info, 1, _INT_LIMIT)
+    spin_box.setRange(int(minimum), int(maximum))
+    if optional:
+        _allow_none(spin_box, int(minimum), 1)
+    return spin_box
+
+
+def _create_double_spin_box(info: FieldInfo, optional: bool = False) -> QtWidgets.QDoubleSpinBox:
+    spin_box = QtWidgets.QDoubleSpinBox()
+    spin_box.setDecimals(3)
+    minimum, maximum = _bounds(info, 10**-3, _FLOAT_LIMIT)
+    spin_box.setRange(minimum, maximum)
+    step = 10**-3
+    for constraint in info.metadata:
+        if isinstance(constraint, annotated_types.MultipleOf):
+            spin_box.setSingleStep(constraint.multiple_of)  # type: ignore
+            step = constraint.multiple_of  # type: ignore
+    if optional:
+        _allow_none(spin_box, minimum, step)
+    return spin_box
+
+
+def _read_optional_number(spin_box: QtWidgets.QSpinBox | QtWidgets.QDoubleSpinBox) -> Any:
+    return None if spin_box.value() == spin_box.minimum() else spin_box.value()
+
+
+def _write_optional_number(spin_box: QtWidgets.QSpinBox | QtWidgets.QDoubleSpinBox, value: Any) -> None:
+    spin_box.setValue(spin_box.minimum() if value is None else value)
+
+
+def _create_line_edit(info: FieldInfo, line_edit_type: Type[QtWidgets.QLineEdit] = QtWidgets.QLineEdit):
+    line_edit = line_edit_type()
+    for constraint in info.metadata:
+        if isinstance(constraint, annotated_types.MaxLen):
+            line_edit.setMaxLength(constraint.max_length)
+    return line_edit
+
+
+def _create_combo_box(annotation: Type[enum.Enum]) -> QtWidgets.QComboBox:
+    combo_box = QtWidgets.QComboBox()
+    for member in annotation:
+        combo_box.addItem(member.name, member)
+    return combo_box
+
+
+def _write_combo_box(combo_box: QtWidgets.QComboBox, value: enum.Enum) -> None:
+    combo_box.setCurrentIndex(combo_box.findData(value))
+
+
+def _write_data(widget: QGenericSettingsWidget, value: BaseModel) -> None:
+    widget.data = value
+
+
+class _QOptionalModelBox(QtWidgets.QGroupBox):
+    """Checkable group box editing a nested `Model | None` field, unchecked stands for None."""
+
+    changed = QtCore.Signal()
+
+    def __init__(self, model: Type[BaseModel], title: str) -> None:
+        super().__init__(title)
+        self.setCheckable(True)
+        self.settings_widget = QAutoSettingsWidget(model)
+        layout = QtWidgets.QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.settings_widget)
+        self.setLayout(layout)
+        self.toggled.connect(lambda _: self.changed.emit())
+        self.settings_widget.changed.connect(lambda _: self.changed.emit())
+
+    def value(self) -> BaseModel | None:
+        return self.settings_widget.data if self.isChecked() else None
+
+    def set_value(self, value: BaseModel | None) -> None:
+        # None keeps the nested inputs, checking the box again brings them back
+        self.setChecked(value is not None)
+        if value is not None:
+            self.settings_widget.data = value
+
+
+def _read_json(line_edit: QtWidgets.QLineEdit) -> Any:
+    # Invalid JSON is passed on as text and rejected by validation, keeping the last valid value
+    try:
+        return json.loads(line_edit.text())
+    except json.JSONDecodeError:
+        return line_edit.text()
+
+
+def _compile_binder(name: str, info: FieldInfo) -> FieldBinder:
+    label = info.title or name.replace("_", " ").capitalize()
+    annotation = _unwrap_optional(info.annotation)
+    optional = _is_optional(info.annotation)
+    path_field = next((item for item in info.metadata if isinstance(item, PathField)), None)
+    if path_field is None and annotation is pathlib.Path:
+        path_field = PathField()
+
+    def binder(create, signal, read, write) -> FieldBinder:
+        return FieldBinder(name, label, create, signal, read, write, info.description)
+
+    if path_field is not None:
+        return binder(
+            partial(QPathSelector, path_field.supported_types, path_field.type),
+            attrgetter("path.textChanged"),
+            # An empty optional path is None, not the current directory
+            lambda selector: (selector.path.text() or None) if optional else selector.path.text(),
+            lambda selector, value: selector.path.setText("" if value is None else str(value)),
+        )
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel) and optional:
+        return binder(
+            partial(_QOptionalModelBox, annotation, label),
+            attrgetter("changed"),
+            _QOptionalModelBox.value,
+            _QOptionalModelBox.set_value,
+        )
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return binder(partial(QAutoSettingsWidget, annotation), None, attrgetter("data"), _write_data)
+    if annotation is bool:
+        return binder(
+            QtWidgets.QCheckBox, attrgetter("toggled"), QtWidgets.QCheckBox.isChecked, QtWidgets.QCheckBox.setChecked
+        )
+    if annotation is int and optional:
+        return binder(
+            partial(_create_spin_box, info, True),
+            attrgetter("valueChanged"),
+            _read_optional_number,
+            _write_optional_number,
+        )
+    if annotation is int:
+        return binder(
+            partial(_create_spin_box, info),
+            attrgetter("valueChanged"),
+            QtWidgets.QSpinBox.value,
+            lambda spin_box, value: spin_box.setValue(value or 0),
+        )
+    if annotation is float and optional:
+        return binder(
+            partial(_create_double_spin_box, info, True),
+            attrgetter("valueChanged"),
+            _read_optional_number,
+            _write_optional_number,
+        )
+    if annotation is float:
+        return binder(
+            partial(_create_double_spin_box, info),
+            attrgetter("valueChanged"),
+            QtWidgets.QDoubleSpinBox.value,
+            lambda spin_box, value: spin_box.setValue(value or 0.0),
+        )
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return binder(
+            partial(_create_combo_box, annotation),
+            attrgetter("currentIndexChanged"),
+            QtWidgets.QComboBox.currentData,
+            _write_combo_box,
+        )
+    if annotation is SecretStr:
+        return binder(
+            partial(_create_line_edit, info, QSecretEdit),
+            attrgetter("textChanged"),
+            QSecretEdit.secret,
+            QSecretEdit.set_secret,
+        )
+    if annotation is str and optional:
+        # An empty line edit is None
+        return binder(
+            partial(_create_line_edit, info),
+            attrgetter("textChanged"),
+            lambda line_edit: line_edit.text() or None,
+            lambda line_edit, value: line_edit.setText(value or ""),
+        )
+    if annotation is str:
+        return binder(
+            partial(_create_line_edit, info),
+            attrgetter("textChanged"),
+            QtWidgets.QLineEdit.text,
+            lambda line_edit, value: line_edit.setText(value or ""),
+        )
+
+    # Anything else (lists, dicts, ...) is edited as JSON, serialized the way the field itself serializes, so
+    # nested models, enums and dates read back
+    adapter = TypeAdapter(info.annotation)
+    return binder(
+        QtWidgets.QLineEdit,
+        attrgetter("textChanged"),
+        _read_json,
+        lambda line_edit, value: line_edit.setText(adapter.dump_json(value).decode()),
+    )
+
+
+def compile_binders(model: Type[BaseModel]) -> Tuple[FieldBinder, ...]:
+    return tuple(_compile_binder(name, info) for name, info in model.model_fields.items())
+
+
+class QAutoSettingsWidget(QGenericSettingsWidget):
+    """Settings form generated from the fields of a pydantic model.
+
+    Either subclass it and declare `Model`, or pass the model class. Fields map to inputs by type:
+    str to QLineEdit (masked for `SecretStr` and `Secret`), bool to QCheckBox, int/float to spin boxes limited by
+    the field constraints (with a "None" step below the range when optional), enums to a combo box, nested models
+    to a group box (checkable when optional), `Path` or `PathField` annotated fields to a QPathSelector and anything
+    else to a JSON line edit. Optional text and path fields are None while empty.
+    """
+
+    def __init__(self, model: Type[BaseModel] | None = None) -> None:
+        super().__init__()
+        self.log = logging.getLogger(__name__)
+        if model is not None:
+            self.Model = model  # type: ignore
+
+        self._inputs: dict[str, QtWidgets.QWidget] = {}
+        self._writing = False
+        self._binders = compile_binders(self.Model)
+        self._layout = QtWidgets.QFormLayout()
+
+        for binder in self._binders:
+            widget = binder.create()
+            if binder.tooltip:
+                widget.setToolTip(binder.tooltip)
+            self._inputs[binder.name] = widget
+
+            if binder.signal is None:
+                self.bind_child(binder.name, widget)  # type: ignore
+                self._layout.addRow(self._groupbox(binder.label, widget))
+            else:
+                self.bind_field(binder.name, binder.signal(widget), partial(binder.read, widget))
+                if isinstance(widget, QtWidgets.QGroupBox):
+                    self._layout.addRow(widget)  # Titled with the label itself
+                else:
+                    self._layout.addRow(binder.label, widget)
+
+        self.setLayout(self._layout)
+
+        try:
+            self.from_default()
+        except ValidationError:
+            pass  # Fields without defaults stay empty until data is set
+
+    @staticmethod
+    def _groupbox(title: str, widget: QtWidgets.QWidget) -> QtWidgets.QGroupBox:
+        groupbox = QtWidgets.QGroupBox(title)
+        layout = QtWidgets.QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(widget)
+        groupbox.setLayout(layout)
+        return groupbox
+
+    def input(self, field: str) -> QtWidgets.QWidget:
+        """The input widget created for `field`."""
+        return self._inputs[field]
+
+    def _read_model(self) -> BaseModel:
+        return self.Model(**{binder.name: binder.read(self._inputs[binder.name]) for binder in self._binders})
+
+    def _write_model(self, value: BaseModel) -> None:
+        # Half written inputs would not validate, the cache is rebuilt once everything is written
+        self._writing = True
+        try:
+            for binder in self._binders:
+                binder.write(self._inputs[binder.name], getattr(value, binder.name))
+        finally:
+            self._writing = False
+
+    def _on_field_changed(self, field: str, value: Any, validate: bool = True) -> None:
+        if self._writing:
+            return
+        try:
+            super()._on_field_changed(field, value, validate)
+        except ValidationError as e:
+            # E.g. JSON that is still being typed, the field keeps its last valid value
+            self.log.debug(f"Ignored invalid {field} = {value!r}: {e.errors()[0]['msg']}")
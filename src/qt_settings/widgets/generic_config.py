@@ -1,28 +1,163 @@
-from pydantic import BaseModel
+from typing import Any, Callable, List, TypeVar
+
+from pydantic import BaseModel, ValidationError
 from qtpy import QtCore
 from qtpy.QtWidgets import QWidget
 
+from ..instrumentation import Stage, instruments
+from ..patches import FieldChange, diff, pointer
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def replace_field(model: ModelT, field: str, value: Any, validate: bool = True) -> ModelT:
+    """Copy of `model` with one field replaced, validating only that field (and the model validators).
+
+    The original is left untouched, models handed out by a settings widget are snapshots.
+    """
+    cls = type(model)
+    # Same as BaseModel.__copy__, without its generic overhead
+    copy = cls.__new__(cls)
+    object.__setattr__(copy, "__dict__", model.__dict__.copy())
+    object.__setattr__(copy, "__pydantic_fields_set__", set(model.__pydantic_fields_set__))
+    object.__setattr__(copy, "__pydantic_extra__", model.__pydantic_extra__)
+    object.__setattr__(copy, "__pydantic_private__", model.__pydantic_private__)
+
+    if validate:
+        cls.__pydantic_validator__.validate_assignment(copy, field, value)
+    else:
+        copy.__dict__[field] = value
+        copy.__pydantic_fields_set__.add(field)
+    return copy
+
 
 class QGenericSettingsWidget(QWidget):
+    """Base class of the settings tabs.
+
+    Subclasses either override the `data` property, or implement `_read_model`/`_write_model` and get a cached
+    model: `data` only reads the input widgets when nothing is cached, and inputs registered with `bind_field` or
+    `bind_child` patch just their own field of the cached model when they change.
+
+    Every `changed` is followed by `patched` with the list of `FieldChange`s relative to the previous model, it is
+    only computed when something is connected.
+
+    Between `hold_changes` and `release_changes` input changes only drop the cache, the release emits a single
+    `changed` if anything changed.
+    """
+
     class Model(BaseModel):
         pass
 
     changed = QtCore.Signal(object)
+    patched = QtCore.Signal(object)
+
+    # Section the widget's timings are recorded under, set by the dialog (else the class name)
+    instrument_name: str = ""
 
     def __init__(self) -> None:
         super().__init__()
+        # Private to this class (name mangled), subclasses overriding `data` often keep a `_model` of their own
+        self.__model: BaseModel | None = None
+        # Last model handed out or set, patches are relative to it when the cache was dropped
+        self.__previous: BaseModel | None = None
+        self._children: List[QGenericSettingsWidget] = []
+        self._holds = 0
+        self._held_changes = False
 
     @property
     def data(self) -> Model:
-        raise NotImplementedError()
+        if self.__model is None:
+            self.__model = self._read_model()
+        return self.__model
 
     @data.setter
     def data(self, value: Model) -> None:
+        self._write_model(value)
+        # Inputs may have rounded or clamped the values, the next read rebuilds from them
+        self.__model = None
+        self.__previous = value
+
+    def _read_model(self) -> Model:
+        raise NotImplementedError()
+
+    def _write_model(self, value: Model) -> None:
         del value
         raise NotImplementedError()
 
+    def bind_field(self, field: str, signal: Any, read: Callable[[], Any]) -> None:
+        """Patch `field` with `read()` whenever `signal` fires, instead of rebuilding the whole model."""
+        signal.connect(lambda *args: self._on_field_changed(field, read()))
+
+    def bind_child(self, field: str, child: "QGenericSettingsWidget") -> None:
+        """Use the (already validated) model of a nested settings widget as `field`."""
+        self._children.append(child)
+        child.changed.connect(lambda model: self._on_field_changed(field, model, validate=False))
+
+    def hold_changes(self) -> None:
+        """Stop emitting `changed` for every input change, until the matching `release_changes`. Nests."""
+        self._holds += 1
+        for child in self._children:
+            child.hold_changes()
+
+    def release_changes(self) -> None:
+        # Children first, their single change is then collected by this widget's hold
+        for child in self._children:
+            child.release_changes()
+        self._holds -= 1
+        if self._holds == 0 and self._held_changes:
+            self._held_changes = False
+            self._on_value_changed()
+
+    def _hold_change(self) -> None:
+        # The patch emitted on release is relative to the model from before the hold
+        if self.__model is not None:
+            self.__previous = self.__model
+        self.__model = None
+        self._held_changes = True
+
+    def _on_field_changed(self, field: str, value: Any, validate: bool = True) -> None:
+        if self._holds:
+            self._hold_change()
+            return
+        if self.__model is None:
+            self._on_value_changed()
+            return
+
+        previous = self.__model
+        section = self.instrument_name or type(self).__name__
+        with instruments.measure(section, Stage.MODEL_BUILD):
+            self.__model = self.__previous = replace_field(previous, field, value, validate)
+        with instruments.measure(section, Stage.SIGNALS):
+            self.changed.emit(self.__model)
+        if self._patched_connected():
+            self._emit_patch(diff(previous.__dict__[field], self.__model.__dict__[field], pointer(field)))
+
     def _on_value_changed(self, *args, **kwargs):
-        self.changed.emit(self.data)
+        if self._holds:
+            self._hold_change()
+            return
+        previous = self.__model or self.__previous
+        self.__model = None
+        section = self.instrument_name or type(self).__name__
+        try:
+            with instruments.measure(section, Stage.MODEL_BUILD):
+                model = self.__previous = self.data
+        except ValidationError:
+            # Inputs that do not validate (yet) leave the last valid model in place
+            self.__model = previous
+            raise
+        with instruments.measure(section, Stage.SIGNALS):
+            self.changed.emit(model)
+        if self._patched_connected():
+            # Without a previous model the whole model counts as replaced
+            self._emit_patch(diff(previous, model))
+
+    def _patched_connected(self) -> bool:
+        return self.isSignalConnected(QtCore.QMetaMethod.fromSignal(self.patched))
+
+    def _emit_patch(self, changes: List[FieldChange]) -> None:
+        if changes:
+            self.patched.emit(changes)
 
     def from_default(self):
         self.data = self.Model()
@@ -0,0 +1,143 @@
+import atexit
+import contextlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Iterator
+
+from qtpy.QtCore import QCoreApplication
+
+if TYPE_CHECKING:
+    import influxdb_client
+
+
+class InfluxClientPool:
+    """Bounded LRU cache of InfluxDB clients, keyed on the settings that define a connection.
+
+    Clients are closed when they are evicted and when the application shuts down. Use a client inside `lease`:
+    a leased client that is evicted meanwhile is only closed once its last lease ends.
+
+        with pool.lease(key, create) as client:
+            client.write_api(...)
+    """
+
+    def __init__(self, max_size: int = 4) -> None:
+        self.max_size = max_size
+        self.log = logging.getLogger(__name__)
+        self._clients: "OrderedDict[Hashable, influxdb_client.InfluxDBClient]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Open leases per client (by id), and the clients that left the pool but are still leased
+        self._leases: Dict[int, int] = {}
+        self._retired: "Dict[int, influxdb_client.InfluxDBClient]" = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(
+        self, key: Hashable, create: Callable[[], "influxdb_client.InfluxDBClient"]
+    ) -> "influxdb_client.InfluxDBClient":
+        """The client for `key`, without a lease: it may be closed by an eviction while it is still used."""
+        return self._get(key, create, lease=False)
+
+    @contextlib.contextmanager
+    def lease(
+        self, key: Hashable, create: Callable[[], "influxdb_client.InfluxDBClient"]
+    ) -> Iterator["influxdb_client.InfluxDBClient"]:
+        """The client for `key`, kept open until the `with` block ends even when it is evicted meanwhile."""
+        client = self._get(key, create, lease=True)
+        try:
+            yield client
+        finally:
+            self._release(client)
+
+    @property
+    def leased(self) -> int:
+        """Number of open leases."""
+        with self._lock:
+            return sum(self._leases.values())
+
+    def _get(
+        self, key: Hashable, create: Callable[[], "influxdb_client.InfluxDBClient"], lease: bool
+    ) -> "influxdb_client.InfluxDBClient":
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                self._clients.move_to_end(key)
+            else:
+                self.misses += 1
+                client = self._clients[key] = create()
+            if lease:
+                self._leases[id(client)] = self._leases.get(id(client), 0) + 1
+            evicted = []
+            while len(self._clients) > self.max_size:
+                evicted.append(self._clients.popitem(last=False)[1])
+                self.evictions += 1
+            closing = self._retire(evicted)
+
+        for old_client in closing:
+            self._close(old_client)
+        return client
+
+    def _retire(self, clients: "list[influxdb_client.InfluxDBClient]") -> "list[influxdb_client.InfluxDBClient]":
+        # Must hold the lock: returns the clients to close now, leased ones are closed by their last release
+        closing = []
+        for client in clients:
+            if self._leases.get(id(client)):
+                self._retired[id(client)] = client
+            else:
+                closing.append(client)
+        return closing
+
+    def _release(self, client: "influxdb_client.InfluxDBClient") -> None:
+        with self._lock:
+            count = self._leases[id(client)] - 1
+            if count:
+                self._leases[id(client)] = count
+                return
+            del self._leases[id(client)]
+            retired = self._retired.pop(id(client), None)
+        if retired is not None:
+            self._close(retired)
+
+    def discard(self, key: Hashable) -> None:
+        """Close and forget the client for `key`, e.g. after it failed in a way that may have broken it."""
+        with self._lock:
+            client = self._clients.pop(key, None)
+            closing = self._retire([client] if client is not None else [])
+        for client in closing:
+            self._close(client)
+
+    def close_all(self) -> None:
+        with self._lock:
+            closing = self._retire(list(self._clients.values()))
+            self._clients.clear()
+        for client in closing:
+            self._close(client)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _close(self, client: "influxdb_client.InfluxDBClient") -> None:
+        try:
+            client.close()
+        except Exception as e:
+            self.log.warning(f"Failed to close InfluxDB client: {e}")
+
+
+_default_pool: InfluxClientPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def default_pool() -> InfluxClientPool:
+    """The process wide pool used by `InfluxModel.lease_client` and `InfluxModel.get_client`."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = InfluxClientPool()
+            atexit.register(_default_pool.close_all)
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(_default_pool.close_all)
+        return _default_pool
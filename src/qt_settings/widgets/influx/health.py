@@ -0,0 +1,194 @@
+import math
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Tuple
+
+from pydantic import BaseModel
+from qt_utils import messaging
+from qtpy import QtCore
+
+from ..validation import ValidationTask, validation_runner
+
+if TYPE_CHECKING:
+    from ...models import InfluxModel
+
+
+class HealthStats(BaseModel):
+    samples: int = 0
+    failures: int = 0
+    availability: float | None = None
+    # Latencies of successful pings in seconds
+    p50: float | None = None
+    p95: float | None = None
+    p99: float | None = None
+    last_error: str | None = None
+    next_interval: float = 0.0
+
+    def summary(self) -> str:
+        if self.samples == 0:
+            return "No samples yet"
+        if self.p50 is None:
+            return f"Unreachable ({self.last_error})"
+
+        text = f"p50 {self.p50 * 1000:.0f} ms, p95 {self.p95 * 1000:.0f} ms, p99 {self.p99 * 1000:.0f} ms"
+        return f"{text}, {self.availability:.0%} available"
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+    # Nearest rank, values must be sorted
+    rank = max(math.ceil(percentile / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class InfluxHealthMonitor(QtCore.QObject):
+    """Periodically pings the configured server and keeps latency and availability over a rolling window.
+
+    Pings run one at a time on the shared validation pool, each over its own client whose timeout is capped to
+    `ping_timeout`, so pings neither fill nor evict the shared client pool. No ping starts while the previous one
+    still holds a worker. After a failure the interval doubles up to `max_interval`, a success resets it. A paused
+    monitor has no timer and waits for no ping. `reconfigure` is debounced by `reconfigure_delay`, so it can be
+    connected to a settings widget's `changed` signal directly.
+    """
+
+    stats_changed = QtCore.Signal(object)
+
+    # Seconds, the longest a ping may take, independent of the interval
+    ping_timeout = 5.0
+    # Seconds without further `reconfigure` calls before new settings are monitored
+    reconfigure_delay = 0.5
+
+    def __init__(
+        self,
+        config: "InfluxModel | None" = None,
+        interval: float = 5.0,
+        window: int = 100,
+        max_interval: float = 300.0,
+        parent: QtCore.QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.interval = interval
+        self.max_interval = max_interval
+        self._config = config
+        self._pending_config: "InfluxModel | None" = None
+        # (latency in seconds or None for a failure) per ping
+        self._samples: Deque[Tuple[float | None, str | None]] = deque(maxlen=window)
+        self._current_interval = interval
+        self._running = False
+        self._task: ValidationTask | None = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._ping)
+        self._reconfigure_timer = QtCore.QTimer(self)
+        self._reconfigure_timer.setSingleShot(True)
+        self._reconfigure_timer.timeout.connect(self._apply_pending_config)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def reconfigure(self, config: "InfluxModel") -> None:
+        """Monitor other settings once they stopped changing, the window restarts when the connection changed."""
+        self._pending_config = config
+        self._reconfigure_timer.start(int(self.reconfigure_delay * 1000))
+
+    def _apply_pending_config(self) -> None:
+        self._reconfigure_timer.stop()
+        config, self._pending_config = self._pending_config, None
+        if config is None:
+            return
+
+        previous, self._config = self._config, config
+        if previous is not None and previous.connection_key() == config.connection_key():
+            return
+
+        self._samples.clear()
+        self._current_interval = self.interval
+        if self._running:
+            self._cancel_ping()
+            self._timer.start(0)
+        self.stats_changed.emit(self.stats())
+
+    def start(self) -> None:
+        # Settings given right before starting are monitored from the first ping
+        self._apply_pending_config()
+        if not self._running:
+            self._running = True
+            self._timer.start(0)
+
+    resume = start
+
+    def stop(self) -> None:
+        self._running = False
+        self._timer.stop()
+        self._cancel_ping()
+
+    pause = stop
+
+    def stats(self) -> HealthStats:
+        latencies = sorted(latency for latency, _ in self._samples if latency is not None)
+        failures = len(self._samples) - len(latencies)
+        errors = [error for _, error in self._samples if error is not None]
+        stats = HealthStats(
+            samples=len(self._samples),
+            failures=failures,
+            last_error=errors[-1] if errors else None,
+            next_interval=self._current_interval,
+        )
+        if self._samples:
+            stats.availability = len(latencies) / len(self._samples)
+        if latencies:
+            stats.p50 = _percentile(latencies, 50)
+            stats.p95 = _percentile(latencies, 95)
+            stats.p99 = _percentile(latencies, 99)
+        return stats
+
+    def _cancel_ping(self) -> None:
+        # The task is kept, a cancelled ping may still be working
+        if self._task is not None and not self._task.done:
+            validation_runner().cancel(self)
+
+    def _ping(self) -> None:
+        config = self._config
+        if config is None or not config.url or (self._task is not None and self._task.working):
+            self._timer.start(int(self._current_interval * 1000))
+            return
+
+        # A hung server must free the worker after ping_timeout, not after the configured timeout
+        cap_ms = int(self.ping_timeout * 1000)
+        timeout = min(config.timeout, cap_ms) if config.timeout > 0 else cap_ms
+        config = config.model_copy(update={"timeout": timeout})
+
+        sample = {}
+
+        def ping() -> messaging.Result:
+            # Not from the shared pool: ping settings must not evict the clients writers are using
+            client = config.create_client()
+            try:
+                start = time.perf_counter()
+                config.test_connection(client)
+                sample["latency"] = time.perf_counter() - start
+            except Exception as e:
+                sample["error"] = str(e)
+                raise
+            finally:
+                client.close()
+            return messaging.Success(message="ping").to_result()
+
+        self._task = validation_runner().submit(self, ping, self.ping_timeout)
+        self._task.finished.connect(lambda result: self._on_ping_finished(result, sample))
+
+    def _on_ping_finished(self, result: messaging.Result | None, sample: dict) -> None:
+        if result is None or not self._running:
+            return  # Cancelled
+
+        latency = sample.get("latency")
+        if latency is None:
+            self._samples.append((None, sample.get("error", "Timed out")))
+            self._current_interval = min(self._current_interval * 2, self.max_interval)
+        else:
+            self._samples.append((latency, None))
+            self._current_interval = self.interval
+
+        self.stats_changed.emit(self.stats())
+        self._timer.start(int(self._current_interval * 1000))
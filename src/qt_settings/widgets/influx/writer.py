@@ -0,0 +1,213 @@
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Deque, Dict, Union
+
+if TYPE_CHECKING:
+    import influxdb_client
+
+    from ...models import InfluxModel
+
+Record = Union[str, "influxdb_client.Point"]
+
+
+class InfluxWriter:
+    """Buffers points and writes them in batches from a background thread.
+
+    Everything comes from an `InfluxModel`: the pooled client (leased per batch), the bucket, the
+    default measurement and `flush_delay`, the longest time a point waits in the buffer. A batch is sent as soon
+    as `batch_size` points are buffered. Connect `reconfigure` to the settings widget's `changed` signal to pick up
+    new settings without losing buffered points.
+    """
+
+    class Overflow(Enum):
+        BLOCK = 1  # Wait up to block_timeout for room, then drop the new point
+        DROP_NEWEST = 2
+        DROP_OLDEST = 3
+
+    def __init__(
+        self,
+        config: "InfluxModel",
+        max_queue: int = 10_000,
+        batch_size: int = 1_000,
+        overflow: Overflow = Overflow.DROP_OLDEST,
+        block_timeout: float = 1.0,
+        max_retries: int = 3,
+    ) -> None:
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.max_retries = max_retries
+        self.log = logging.getLogger(__name__)
+
+        self._config = config
+        self._queue: Deque[Record] = deque()
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._flush_requested = False
+        self._sending = False
+        self._thread: threading.Thread | None = None
+        self._client: Any = None
+        self._write_api: Any = None
+
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    @property
+    def config(self) -> "InfluxModel":
+        return self._config
+
+    def reconfigure(self, config: "InfluxModel") -> None:
+        """Use new settings from the next batch on, buffered points are kept."""
+        with self._condition:
+            self._config = config
+            self._condition.notify_all()
+
+    def start(self) -> "InfluxWriter":
+        with self._condition:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="InfluxWriter", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Write what is buffered and stop the background thread."""
+        with self._condition:
+            thread = self._thread
+            self._stopping = True
+            self._condition.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+        with self._condition:
+            self._thread = None
+
+    def __enter__(self) -> "InfluxWriter":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def write(self, record: Record) -> bool:
+        """Buffer a line protocol string or Point, returns False if it was dropped."""
+        with self._condition:
+            if len(self._queue) >= self.max_queue:
+                if self.overflow == self.Overflow.DROP_OLDEST:
+                    self._queue.popleft()
+                    self.dropped += 1
+                elif self.overflow == self.Overflow.BLOCK:
+                    self._condition.wait_for(lambda: len(self._queue) < self.max_queue, self.block_timeout)
+
+                if len(self._queue) >= self.max_queue:
+                    self.dropped += 1
+                    return False
+
+            self._queue.append(record)
+            # The writer only needs waking to start the flush_delay clock or to send a full batch
+            if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                self._condition.notify_all()
+        return True
+
+    def write_fields(
+        self,
+        fields: Dict[str, Any],
+        tags: Dict[str, str] | None = None,
+        timestamp: Any = None,
+        measurement: str | None = None,
+    ) -> bool:
+        """Buffer a point in the configured measurement, or in `measurement` when given."""
+        import influxdb_client
+
+        point = influxdb_client.Point(measurement or self._config.measurement)
+        for key, value in (tags or {}).items():
+            point.tag(key, value)
+        for key, value in fields.items():
+            point.field(key, value)
+        if timestamp is not None:
+            point.time(timestamp)
+        return self.write(point)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Send buffered points now and wait until they are written, returns False on timeout.
+
+        Without a running writer thread (before `start`, after `stop`) nothing sends them, returns at once.
+        """
+        with self._condition:
+            if self._thread is None or not self._thread.is_alive():
+                return not self._queue and not self._sending
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: not self._queue and not self._sending, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._stopping)
+                if not self._queue and self._stopping:
+                    self._condition.notify_all()
+                    return
+
+                deadline = time.monotonic() + self._config.flush_delay
+                while len(self._queue) < self.batch_size and not (self._stopping or self._flush_requested):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                if not self._queue:
+                    self._flush_requested = False
+                config = self._config
+                self._sending = True
+                # Producers blocked on a full queue can continue
+                self._condition.notify_all()
+
+            try:
+                self._send(config, batch)
+            finally:
+                with self._condition:
+                    self._sending = False
+                    self._condition.notify_all()
+
+    def _send(self, config: "InfluxModel", batch: list) -> None:
+        from influxdb_client.client.write_api import SYNCHRONOUS
+
+        lines = [record if isinstance(record, str) else record.to_line_protocol() for record in batch]
+        for attempt in range(self.max_retries + 1):
+            try:
+                # Leased, so the pool does not close the client while the batch is sent
+                with config.lease_client() as client:
+                    if client is not self._client:
+                        # Clients come and go with the settings, only keep the api of the current one
+                        self._client, self._write_api = client, client.write_api(write_options=SYNCHRONOUS)
+                    self._write_api.write(bucket=config.bucket, org=config.org, record=lines)
+            except Exception as e:
+                with self._condition:
+                    self.failed_batches += 1
+                self.log.warning(f"Failed to write {len(lines)} points to '{config.url}' (attempt {attempt + 1}): {e}")
+                with self._condition:
+                    if self._stopping:
+                        break
+                    # Back off, but wake up immediately for new settings or shutdown
+                    self._condition.wait_for(
+                        lambda: self._stopping or self._config is not config, min(0.1 * 2**attempt, 5.0)
+                    )
+                    config = self._config
+                continue
+
+            with self._condition:
+                self.batches += 1
+                self.written += len(lines)
+            return
+
+        with self._condition:
+            self.dropped += len(lines)
+        self.log.error(f"Dropped {len(lines)} points after {self.max_retries + 1} failed attempts")
@@ -1,106 +1,47 @@
-import influxdb_client
-import influxdb_client.rest
-import urllib3.exceptions
-from pydantic import BaseModel
 from qt_utils import messaging
 from qtpy import QtWidgets
-from qtpy.QtCore import QThread, Signal
 from qtpy.QtWidgets import (
     QStyle,
     QToolButton,
 )
 
+from ..models import InfluxModel
 from .generic_config import QGenericSettingsWidget
+from .influx.health import HealthStats, InfluxHealthMonitor
+from .secret_edit import QSecretEdit
+from .validation import ValidationTask, validation_runner
 
 
-class InfluxConfigTestThread(QThread):
-    result_signal = Signal(messaging.Result)
+def _run_connection_test(config: InfluxModel) -> messaging.Result:
+    config.test()
+    return messaging.Success(message="Connection successful").to_result()
 
-    def __init__(self, config: "QInfluxConfigWidget.Model") -> None:
-        QThread.__init__(self)
-        self.config = config
 
-    def run(self):
-        try:
-            self.config.test_connection()
-            self.config.check_query()
-
-            self.result_signal.emit(messaging.Success(message="Connection successful").to_result())
-            pass
-        except Exception as e:
-            self.result_signal.emit(messaging.Error.from_exception(e).to_result())
+class QInfluxConfigWidget(QGenericSettingsWidget):
+    Model = InfluxModel
 
+    test_task: ValidationTask | None = None
+    # Upper bound for a connection test, however large the configured client timeout is
+    test_deadline: float = 15.0
 
-class QInfluxConfigWidget(QGenericSettingsWidget):
-    class Model(BaseModel):
-        url: str
-        token: str
-        org: str
-        bucket: str
-        measurement: str
-        force_ssl: bool
-        debug: bool
-        flush_delay: float
-        timeout: int
-
-        def get_client(self) -> influxdb_client.InfluxDBClient:
-            client = influxdb_client.InfluxDBClient(
-                url=self.url,
-                token=self.token,
-                debug=self.debug,
-                timeout=self.timeout,
-                org=self.org,
-                enable_gzip=True,
-                verify_ssl=self.force_ssl,
-            )
-            return client
-
-        def test_connection(self):
-            client = self.get_client()
-            try:
-                response = client.api_client.request("GET", f"{self.url}/ping")
-            except urllib3.exceptions.NameResolutionError as e:
-                raise Exception(f"Url does not exist '{self.url}'") from e
-
-            if response.status != 204:
-                raise Exception(f"Connection to '{self.url}' failed.")
-
-            return client
-
-        def check_query(self):
-            client = self.get_client()
-            """Check that the credentials has permission to query from the Bucket"""
-
-            try:
-                client.query_api().query(f'from(bucket:"{self.bucket}") |> range(start: -1m) |> limit(n:1)', self.org)
-            except influxdb_client.rest.ApiException as e:
-                # missing credentials
-                if e.status == 404:
-                    raise Exception(
-                        f"The specified token doesn't have sufficient credentials to "
-                        f"read from '{self.bucket}' bucket or specified bucket doesn't exists."
-                    ) from e
-                if e.status == 401:
-                    raise Exception("The specified token is invalid.") from e
-
-                raise e
-
-    test_thread: InfluxConfigTestThread | None = None
-
-    def __init__(self) -> None:
+    def __init__(self, health_interval: float | None = None) -> None:
+        """`health_interval` in seconds enables a background monitor that pings the server while the tab is visible."""
         super().__init__()
 
         # Standard options
         self.url_input = QtWidgets.QLineEdit()
-        self.url_input.textChanged.connect(self._on_value_changed)
-        self.token_input = QtWidgets.QLineEdit()
-        self.token_input.textChanged.connect(self._on_value_changed)
+        self.bind_field("url", self.url_input.textChanged, self.url_input.text)
+        self.url_input.textChanged.connect(self._cancel_test)
+        self.token_input = QSecretEdit()
+        self.bind_field("token", self.token_input.textChanged, self.token_input.secret)
+        self.token_input.textChanged.connect(self._cancel_test)
         self.org_input = QtWidgets.QLineEdit()
-        self.org_input.textChanged.connect(self._on_value_changed)
+        self.bind_field("org", self.org_input.textChanged, self.org_input.text)
+        self.org_input.textChanged.connect(self._cancel_test)
         self.bucket_input = QtWidgets.QLineEdit()
-        self.bucket_input.textChanged.connect(self._on_value_changed)
+        self.bind_field("bucket", self.bucket_input.textChanged, self.bucket_input.text)
         self.measurement_input = QtWidgets.QLineEdit()
-        self.measurement_input.textChanged.connect(self._on_value_changed)
+        self.bind_field("measurement", self.measurement_input.textChanged, self.measurement_input.text)
 
         self.show_advanced_options = QToolButton()
         self.show_advanced_options.setCheckable(True)
@@ -110,18 +51,18 @@ class QInfluxConfigWidget(QGenericSettingsWidget):
 
         # Advanced options
         self.force_ssl_input = QtWidgets.QCheckBox("Force SSL")
-        self.force_ssl_input.stateChanged.connect(self._on_value_changed)
+        self.bind_field("force_ssl", self.force_ssl_input.stateChanged, self.force_ssl_input.isChecked)
 
         self.debug_input = QtWidgets.QCheckBox("Debug")
-        self.debug_input.stateChanged.connect(self._on_value_changed)
+        self.bind_field("debug", self.debug_input.stateChanged, self.debug_input.isChecked)
 
         self.timeout_input = QtWidgets.QDoubleSpinBox()
-        self.timeout_input.valueChanged.connect(self._on_value_changed)
+        self.bind_field("timeout", self.timeout_input.valueChanged, lambda: int(self.timeout_input.value() * 1000))
         self.timeout_input.setRange(0, 600)
         self.timeout_input.setSuffix("s")
 
         self.flush_delay_input = QtWidgets.QDoubleSpinBox()
-        self.flush_delay_input.valueChanged.connect(self._on_value_changed)
+        self.bind_field("flush_delay", self.flush_delay_input.valueChanged, self.flush_delay_input.value)
         self.flush_delay_input.setRange(0, 600)
         self.flush_delay_input.setSuffix("s")
 
@@ -148,10 +89,36 @@ class QInfluxConfigWidget(QGenericSettingsWidget):
         self._layout.addRow("Show advanced", self.show_advanced_options)
         self._layout.addRow(self.advanced_options)
         self._layout.addRow(self.test_button)
+
+        self.health_monitor: InfluxHealthMonitor | None = None
+        if health_interval is not None:
+            self.health_label = QtWidgets.QLabel()
+            self.health_monitor = InfluxHealthMonitor(interval=health_interval, parent=self)
+            self.health_monitor.stats_changed.connect(self._on_health_changed)
+            self.changed.connect(self.health_monitor.reconfigure)
+            self._layout.addRow("Health", self.health_label)
+            self._on_health_changed(self.health_monitor.stats())
+
         self.setLayout(self._layout)
 
         self._update_ui()
 
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if self.health_monitor is not None:
+            self.health_monitor.reconfigure(self.data)
+            self.health_monitor.resume()
+
+    def hideEvent(self, event) -> None:
+        # A hidden tab does not need live health, stop pinging entirely
+        if self.health_monitor is not None:
+            self.health_monitor.pause()
+        super().hideEvent(event)
+
+    def _on_health_changed(self, stats: HealthStats) -> None:
+        self.health_label.setText(stats.summary())
+        self.health_label.setToolTip(stats.last_error or "")
+
     def _update_ui(self):
         if self.show_advanced_options.isChecked():
             self.show_advanced_options.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_ArrowUp))
@@ -160,31 +127,44 @@ class QInfluxConfigWidget(QGenericSettingsWidget):
             self.show_advanced_options.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_ArrowDown))
             self.advanced_options.setHidden(True)
 
-        is_running = self.test_thread is not None and self.test_thread.isRunning()
-
-        if is_running:
-            self.test_button.setText("Testing...")
+        if self._test_running:
+            self.test_button.setText("Testing... (click to cancel)")
         else:
             self.test_button.setText("Check connection")
 
-        self.test_button.setEnabled(not is_running)
+    @property
+    def _test_running(self) -> bool:
+        return self.test_task is not None and not self.test_task.done
 
     def _on_test_clicked(self):
-        if self.test_thread is not None and self.test_thread.isRunning():
-            messaging.Error(trace="", error="Test already running").to_result().display(self)
+        if self._test_running:
+            self._cancel_test()
             return
 
-        self.test_thread = InfluxConfigTestThread(self.data)
-        self.test_thread.result_signal.connect(lambda result: result.display(self))
-        self.test_thread.started.connect(self._update_ui)
-        self.test_thread.finished.connect(self._update_ui)
-        self.test_thread.start()
+        # Cap the client timeout so a hung server frees its worker by the deadline
+        config = self.data
+        deadline_ms = int(self.test_deadline * 1000)
+        timeout = min(config.timeout, deadline_ms) if config.timeout > 0 else deadline_ms
+        config = config.model_copy(update={"timeout": timeout})
 
-    @property
-    def data(self) -> Model:
+        self.test_task = validation_runner().submit(self, lambda: _run_connection_test(config), self.test_deadline)
+        self.test_task.finished.connect(self._on_test_finished)
+        self._update_ui()
+
+    def _cancel_test(self):
+        """Drop a running test, its result no longer matches the settings."""
+        if self._test_running:
+            validation_runner().cancel(self)
+
+    def _on_test_finished(self, result: messaging.Result | None):
+        if result is not None:
+            result.display(self)
+        self._update_ui()
+
+    def _read_model(self) -> Model:
         return self.Model(
             url=self.url_input.text(),
-            token=self.token_input.text(),
+            token=self.token_input.secret(),
             org=self.org_input.text(),
             bucket=self.bucket_input.text(),
             measurement=self.measurement_input.text(),
@@ -194,10 +174,9 @@ class QInfluxConfigWidget(QGenericSettingsWidget):
             timeout=int(self.timeout_input.value() * 1000),
         )
 
-    @data.setter
-    def data(self, value: Model) -> None:
+    def _write_model(self, value: Model) -> None:
         self.url_input.setText(value.url)
-        self.token_input.setText(value.token)
+        self.token_input.set_secret(value.token)
         self.org_input.setText(value.org)
         self.bucket_input.setText(value.bucket)
         self.measurement_input.setText(value.measurement)
@@ -0,0 +1,74 @@
+from qtpy import QtCore, QtGui, QtWidgets
+from qtpy.QtWidgets import QWidget
+
+from ..instrumentation import Instrumentation, instruments
+
+_COLUMNS = ["Section", "Stage", "Count", "Total ms", "Mean ms", "Max ms"]
+
+
+class QInstrumentationView(QWidget):
+    """Debug page showing the timings of an `Instrumentation`, refreshed every `refresh_ms` while visible."""
+
+    def __init__(self, instrumentation: Instrumentation = instruments, refresh_ms: int = 1000) -> None:
+        super().__init__()
+        self.instrumentation = instrumentation
+
+        self.enabled = QtWidgets.QCheckBox("Record timings")
+        self.enabled.setChecked(instrumentation.enabled)
+        self.enabled.toggled.connect(instrumentation.enable)
+        reset_button = QtWidgets.QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+
+        self.table = QtWidgets.QTableWidget(0, len(_COLUMNS))
+        self.table.setHorizontalHeaderLabels(_COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+
+        top = QtWidgets.QHBoxLayout()
+        top.addWidget(self.enabled)
+        top.addStretch(1)
+        top.addWidget(reset_button)
+        self._layout = QtWidgets.QVBoxLayout()
+        self._layout.addLayout(top)
+        self._layout.addWidget(self.table, 1)
+        self.setLayout(self._layout)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(refresh_ms)
+        self._timer.timeout.connect(self.refresh)
+
+    def refresh(self) -> None:
+        rows = sorted(self.instrumentation.timings().items(), key=lambda item: item[1].total_s, reverse=True)
+        self.table.setUpdatesEnabled(False)
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(rows))
+        for row, ((section, stage), timing) in enumerate(rows):
+            values = [
+                section,
+                stage.value,
+                timing.count,
+                round(timing.total_s * 1000, 3),
+                round(timing.mean_s * 1000, 3),
+                round(timing.max_s * 1000, 3),
+            ]
+            for column, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem()
+                # Numbers as numbers, so sorting by a column sorts by value
+                item.setData(QtCore.Qt.ItemDataRole.DisplayRole, value)
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        self.table.setUpdatesEnabled(True)
+
+    def reset(self) -> None:
+        self.instrumentation.reset()
+        self.refresh()
+
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        self.refresh()
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event: QtGui.QHideEvent) -> None:
+        self._timer.stop()
+        super().hideEvent(event)
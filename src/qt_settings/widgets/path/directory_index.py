@@ -0,0 +1,182 @@
+import fnmatch
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Set, Tuple
+
+from qtpy import QtCore
+from qtpy.QtCore import QSettings
+
+_Key = Tuple[str, Tuple[str, ...]]
+
+
+def name_filters(supported_types: str) -> Tuple[str, ...]:
+    """The file name patterns of a Qt file dialog filter: "JSON (*.json);;All Files (*)" or "*.lock"."""
+    groups = re.findall(r"\(([^)]*)\)", supported_types) or [supported_types]
+    patterns = tuple(dict.fromkeys(pattern for group in groups for pattern in group.split()))
+    return patterns or ("*",)
+
+
+class Listing:
+    """The subdirectories and matching files of one directory, sorted by name."""
+
+    def __init__(self, path: str, modified: int, directories: List[str], files: List[str]) -> None:
+        self.path = path
+        # Modification time (ns) of the directory when it was scanned, it changes when entries are added or removed
+        self.modified = modified
+        self.directories = directories
+        self.files = files
+
+    def __repr__(self) -> str:
+        return f"Listing(path={self.path!r}, directories={len(self.directories)}, files={len(self.files)})"
+
+
+def scan(path: str, patterns: Tuple[str, ...]) -> Listing:
+    """List `path`, without any files when there are no `patterns`."""
+    directories: List[str] = []
+    matching: List[str] = []
+    modified = os.stat(path).st_mtime_ns
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    directories.append(entry.name)
+                elif any(fnmatch.fnmatch(entry.name.lower(), pattern.lower()) for pattern in patterns):
+                    matching.append(entry.name)
+            except OSError:
+                continue  # Broken links and entries removed while scanning
+    return Listing(path, modified, sorted(directories, key=str.lower), sorted(matching, key=str.lower))
+
+
+class _ScanRunnable(QtCore.QRunnable):
+    def __init__(self, index: "DirectoryIndex", key: _Key) -> None:
+        super().__init__()
+        self._index = index
+        self._key = key
+
+    def run(self) -> None:
+        self._index._run(self._key)
+
+
+class DirectoryIndex(QtCore.QObject):
+    """Lists directories on background threads and keeps the most recently used listings.
+
+    `request` answers from the cache straight away when it can and rescans in the background, `listed` is emitted
+    with every new or changed `Listing` (or the `OSError` of a failed scan), in the thread the index lives in.
+    Listings are cached per directory and file name patterns, at most `capacity` of them. No patterns lists
+    directories only.
+    """
+
+    listed = QtCore.Signal(object, object)
+
+    _shared: "DirectoryIndex | None" = None
+
+    def __init__(self, capacity: int = 64, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.log = logging.getLogger(__name__)
+        self.capacity = capacity
+
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[_Key, Listing] = OrderedDict()
+        self._scanning: Set[_Key] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.scans = 0
+
+    @classmethod
+    def shared(cls) -> "DirectoryIndex":
+        """The index used by every `PathQuery`, so listings survive closing the chooser."""
+        if cls._shared is None:
+            cls._shared = DirectoryIndex(parent=QtCore.QCoreApplication.instance())
+        return cls._shared
+
+    def listing(self, path: str, patterns: Tuple[str, ...] = ("*",)) -> Listing | None:
+        """The cached listing of `path`, None when it was not scanned yet."""
+        key = (os.path.normpath(path), patterns)
+        with self._lock:
+            listing = self._cache.get(key)
+            if listing is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return listing
+
+    def request(self, path: str, patterns: Tuple[str, ...] = ("*",)) -> Listing | None:
+        """The cached listing of `path` if any, and schedule a scan which emits `listed` when it finds something new."""
+        listing = self.listing(path, patterns)
+        key = (os.path.normpath(path), patterns)
+        with self._lock:
+            if key in self._scanning:
+                return listing
+            self._scanning.add(key)
+        self._pool.start(_ScanRunnable(self, key))
+        return listing
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        return self._pool.waitForDone(timeout_ms)
+
+    def _run(self, key: _Key) -> None:
+        path, patterns = key
+        try:
+            with self._lock:
+                cached = self._cache.get(key)
+            # A directory whose modification time did not change has the same entries
+            if cached is not None and os.stat(path).st_mtime_ns == cached.modified:
+                return
+            listing = scan(path, patterns)
+        except OSError as e:
+            self.log.debug(f"Failed to list '{path}': {e}")
+            self.listed.emit(path, e)
+            return
+        finally:
+            with self._lock:
+                self._scanning.discard(key)
+
+        with self._lock:
+            self.scans += 1
+            self._cache[key] = listing
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+        self.listed.emit(path, listing)
+
+
+class RecentPaths:
+    """The most recently chosen paths of one query, newest first, stored as JSON under `<save_name>_recent`."""
+
+    def __init__(self, settings: QSettings | None, save_name: str, limit: int = 10) -> None:
+        self.settings = settings
+        self.key = f"{save_name}_recent"
+        self.limit = limit
+        self._paths: List[str] | None = None
+
+    def paths(self) -> List[str]:
+        if self._paths is None:
+            self._paths = self._load()
+        return list(self._paths)
+
+    def add(self, path: str) -> None:
+        paths = [path, *(recent for recent in self.paths() if recent != path)][: self.limit]
+        if paths == self._paths:
+            return
+        self._paths = paths
+        if self.settings is not None:
+            self.settings.setValue(self.key, json.dumps(paths))
+
+    def _load(self) -> List[str]:
+        if self.settings is None:
+            return []
+        try:
+            paths = json.loads(self.settings.value(self.key, "[]", str))
+        except (TypeError, ValueError):
+            return []
+        if not isinstance(paths, list):
+            return []
+        return [path for path in paths if isinstance(path, str)][: self.limit]
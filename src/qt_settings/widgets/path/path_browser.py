@@ -0,0 +1,152 @@
+import os
+from typing import List, Tuple
+
+from qtpy import QtCore, QtWidgets
+from qtpy.QtWidgets import QStyle, QWidget
+
+from .directory_index import DirectoryIndex, Listing
+
+_DIRECTORY_ROLE = QtCore.Qt.ItemDataRole.UserRole
+
+
+class PathBrowser(QtWidgets.QDialog):
+    """Non-native file and directory chooser that never waits on the file system.
+
+    Directories are listed by a `DirectoryIndex`, so a recently visited directory shows up immediately and a slow
+    one (network mounts with thousands of files) only shows "Listing..." until its scan is done.
+    """
+
+    def __init__(
+        self,
+        parent: QWidget | None,
+        index: DirectoryIndex,
+        directory: str,
+        patterns: Tuple[str, ...],
+        select_directory: bool = False,
+        recent: List[str] | None = None,
+        caption: str = "Open File",
+    ) -> None:
+        super().__init__(parent)
+        self.setWindowTitle(caption)
+        self.index = index
+        # No patterns lists directories only
+        self.patterns = () if select_directory else patterns
+        self.select_directory = select_directory
+        self.directory = ""
+        self.selected: str | None = None
+
+        self.location = QtWidgets.QLineEdit()
+        self.location.returnPressed.connect(lambda: self._open(self.location.text()))
+        self.up = QtWidgets.QToolButton()
+        self.up.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogToParent))
+        self.up.clicked.connect(lambda: self.navigate(os.path.dirname(self.directory)))
+
+        self.recent = QtWidgets.QComboBox()
+        self.recent.setPlaceholderText("Recent")
+        self.recent.addItems(recent or [])
+        self.recent.setEnabled(bool(recent))
+        self.recent.textActivated.connect(self._open)
+
+        self.entries = QtWidgets.QListWidget()
+        self.entries.setUniformItemSizes(True)
+        self.entries.itemActivated.connect(self._on_item_activated)
+        self.entries.currentItemChanged.connect(self._on_current_item_changed)
+        self.status = QtWidgets.QLabel()
+
+        self.name = QtWidgets.QLineEdit()
+        self.name.setVisible(not select_directory)
+        self.name.returnPressed.connect(self.accept)
+
+        buttons = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.StandardButton.Ok | QtWidgets.QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        top = QtWidgets.QHBoxLayout()
+        top.addWidget(self.location, 1)
+        top.addWidget(self.up)
+        top.addWidget(self.recent)
+        self._layout = QtWidgets.QVBoxLayout()
+        self._layout.addLayout(top)
+        self._layout.addWidget(self.entries, 1)
+        self._layout.addWidget(self.status)
+        self._layout.addWidget(self.name)
+        self._layout.addWidget(buttons)
+        self.setLayout(self._layout)
+        self.resize(600, 450)
+
+        self._dir_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon)
+        self._file_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+        self.index.listed.connect(self._on_listed)
+        self.navigate(directory or os.path.expanduser("~"))
+
+    def select(self) -> str | None:
+        """Run the dialog, returns the chosen path or None when cancelled."""
+        return self.selected if self.exec() == QtWidgets.QDialog.DialogCode.Accepted else None
+
+    def navigate(self, directory: str) -> None:
+        self.directory = os.path.normpath(directory)
+        self.location.setText(self.directory)
+        listing = self.index.request(self.directory, self.patterns)
+        if listing is not None:
+            self._show(listing)
+        else:
+            self.entries.clear()
+            self.status.setText("Listing...")
+
+    def accept(self) -> None:
+        if self.select_directory:
+            item = self.entries.currentItem()
+            self.selected = os.path.join(self.directory, item.text()) if item is not None else self.directory
+        elif self.name.text():
+            self.selected = os.path.join(self.directory, self.name.text())
+        else:
+            return
+        super().accept()
+
+    def done(self, result: int) -> None:
+        self.index.listed.disconnect(self._on_listed)
+        super().done(result)
+
+    def _show(self, listing: Listing) -> None:
+        self.entries.setUpdatesEnabled(False)
+        self.entries.clear()
+        for name in listing.directories:
+            item = QtWidgets.QListWidgetItem(self._dir_icon, name)
+            item.setData(_DIRECTORY_ROLE, True)
+            self.entries.addItem(item)
+        for name in listing.files:
+            self.entries.addItem(QtWidgets.QListWidgetItem(self._file_icon, name))
+        self.entries.setUpdatesEnabled(True)
+        self.status.setText(f"{len(listing.directories)} folders, {len(listing.files)} files")
+
+    def _open(self, path: str) -> None:
+        # Paths typed or picked from the recent list, a file is chosen right away
+        if not path:
+            return
+        if os.path.isdir(path):
+            self.navigate(path)
+        elif not self.select_directory:
+            self.navigate(os.path.dirname(path) or self.directory)
+            self.name.setText(os.path.basename(path))
+            self.accept()
+
+    def _on_listed(self, path: str, listing: Listing | OSError) -> None:
+        if path != self.directory:
+            return
+        if isinstance(listing, OSError):
+            self.entries.clear()
+            self.status.setText(f"Cannot list this folder: {listing.strerror or listing}")
+        else:
+            self._show(listing)
+
+    def _on_item_activated(self, item: QtWidgets.QListWidgetItem) -> None:
+        if item.data(_DIRECTORY_ROLE):
+            self.navigate(os.path.join(self.directory, item.text()))
+        else:
+            self.accept()
+
+    def _on_current_item_changed(self, item: QtWidgets.QListWidgetItem | None) -> None:
+        if item is not None and not item.data(_DIRECTORY_ROLE):
+            self.name.setText(item.text())
@@ -1,9 +1,13 @@
 import os
 from enum import Enum
+from typing import Tuple
 
 from qtpy.QtCore import QSettings
 from qtpy.QtWidgets import QFileDialog, QWidget
 
+from .directory_index import DirectoryIndex, RecentPaths, name_filters
+from .path_browser import PathBrowser
+
 
 class PathQuery:
     class LoadSaveEnum(Enum):
@@ -13,12 +17,20 @@ class PathQuery:
         LOAD_FILE = 4
 
     def __init__(
-        self, parent: QWidget, settings: QSettings | None, save_name: str, supported_types: str = "All Files (*)"
+        self,
+        parent: QWidget,
+        settings: QSettings | None,
+        save_name: str,
+        supported_types: str = "All Files (*)",
+        asynchronous: bool = False,
     ):
+        """`asynchronous` browses with a `PathBrowser` instead of the blocking QFileDialog."""
         self._parent = parent
         self.settings = settings
         self.save_name = save_name
         self.supported_types = supported_types
+        self.asynchronous = asynchronous
+        self.recent = RecentPaths(settings, save_name)
 
     def get_last_folder(self) -> str:
         if self.settings is None:
@@ -35,11 +47,43 @@ class PathQuery:
         if self.settings is not None:
             self.settings.setValue(self.save_name, folder)
 
+    def prefetch(self, type: LoadSaveEnum, filter: str | None = None) -> None:
+        """List the folder the chooser will open in the background, so opening it is instant."""
+        if self.asynchronous and self.get_last_folder():
+            DirectoryIndex.shared().request(self.get_last_folder(), self._patterns(type, filter))
+
+    def _patterns(self, type: LoadSaveEnum, filter: str | None) -> Tuple[str, ...]:
+        if type == self.LoadSaveEnum.EXISTING_DIRECTORY:
+            return ()
+        return name_filters(self.supported_types if filter is None else filter)
+
+    def _browse(self, type: LoadSaveEnum, filter: str, last_folder: str) -> str:
+        caption = {
+            self.LoadSaveEnum.LOAD_FILE: "Open File",
+            self.LoadSaveEnum.SAVE_FILE: "Save File",
+            self.LoadSaveEnum.EXISTING_DIRECTORY: "Open Directory",
+        }.get(type)
+        if caption is None:
+            raise NotImplementedError
+        browser = PathBrowser(
+            self._parent,
+            DirectoryIndex.shared(),
+            last_folder,
+            self._patterns(type, filter),
+            select_directory=type == self.LoadSaveEnum.EXISTING_DIRECTORY,
+            recent=self.recent.paths(),
+            caption=caption,
+        )
+        return browser.select() or ""
+
     def get_path(self, type: LoadSaveEnum, filter: str | None = None) -> str | None:
         last_folder = self.get_last_folder()
         if filter is None:
             filter = self.supported_types
-        if type == self.LoadSaveEnum.LOAD_FILE:
+        if self.asynchronous:
+            filePath = self._browse(type, filter, last_folder)
+
+        elif type == self.LoadSaveEnum.LOAD_FILE:
             filePath, _ = QFileDialog.getOpenFileName(
                 parent=self._parent,
                 caption="Open File",
@@ -72,5 +116,6 @@ class PathQuery:
 
         # Remember the folder for next time
         self.store_last_folder(os.path.dirname(filePath))
+        self.recent.add(filePath)
 
         return filePath
@@ -1,31 +1,47 @@
-from pydantic import BaseModel, Field
-from qtpy import QtWidgets
+from qtpy import QtCore, QtGui, QtWidgets
 from qtpy.QtWidgets import QStyle, QToolButton
 
+from ..models import PathModel
 from .generic_config import QGenericSettingsWidget
 from .path.path_query import PathQuery
 
 
 class QPathSelector(QGenericSettingsWidget):
-    class PathModel(BaseModel):
-        path: str = Field(max_length=100)
+    PathModel = PathModel
 
-    def __init__(self, supported_types: str, type: PathQuery.LoadSaveEnum, manually_editable: bool = True):
+    def __init__(
+        self,
+        supported_types: str,
+        type: PathQuery.LoadSaveEnum,
+        manually_editable: bool = True,
+        settings: QtCore.QSettings | None = None,
+        save_name: str = "",
+        asynchronous: bool = False,
+    ):
+        """Recently chosen paths are offered as completions, and remembered across runs when `settings` is given."""
         super().__init__()
 
         self.path_query = PathQuery(
             parent=self,
-            settings=None,
-            save_name="",
+            settings=settings,
+            save_name=save_name,
             supported_types=supported_types,
+            asynchronous=asynchronous,
         )
         self.type = type
 
-        self._data = self.PathModel(path="")
+        self._model = self.PathModel(path="")
 
         self.path = QtWidgets.QLineEdit()
-        self.path.setText(self._data.path)
-        self.path.textChanged.connect(self._on_value_changed)
+        self.path.setText(self._model.path)
+        self.bind_field("path", self.path.textChanged, self.path.text)
+        self.path.editingFinished.connect(self._on_editing_finished)
+
+        self._recent = QtCore.QStringListModel(self.path_query.recent.paths(), self)
+        self.completer = QtWidgets.QCompleter(self._recent, self)
+        self.completer.setCaseSensitivity(QtCore.Qt.CaseSensitivity.CaseInsensitive)
+        self.completer.setFilterMode(QtCore.Qt.MatchFlag.MatchContains)
+        self.path.setCompleter(self.completer)
 
         if not manually_editable:
             self.path.setReadOnly(True)
@@ -42,15 +58,24 @@ class QPathSelector(QGenericSettingsWidget):
 
         self.setLayout(self._layout)
 
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        self.path_query.prefetch(self.type)
+        super().showEvent(event)
+
     def _on_button_clicked(self):
         selected_path = self.path_query.get_path(self.type)
         if selected_path is not None:
             self.path.setText(selected_path)
+            self._recent.setStringList(self.path_query.recent.paths())
+
+    def _on_editing_finished(self) -> None:
+        # Typed paths are offered again too
+        if self.path.text():
+            self.path_query.recent.add(self.path.text())
+            self._recent.setStringList(self.path_query.recent.paths())
 
-    @property
-    def data(self) -> PathModel:
+    def _read_model(self) -> PathModel:
         return QPathSelector.PathModel(path=self.path.text())
 
-    @data.setter
-    def data(self, value: PathModel) -> None:
+    def _write_model(self, value: PathModel) -> None:
         self.path.setText(value.path)
@@ -0,0 +1,36 @@
+from pydantic import SecretStr
+from qtpy import QtWidgets
+
+from ..encryption import UndecryptableSecret
+
+
+class QSecretEdit(QtWidgets.QLineEdit):
+    """Masked line edit of a secret.
+
+    A stored secret that could not be decrypted shows as empty, and is kept as it is (never overwritten with the
+    empty text) until the user types a new one.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.setEchoMode(QtWidgets.QLineEdit.EchoMode.Password)
+        self._kept: UndecryptableSecret | None = None
+        self.textEdited.connect(self._forget_kept)
+
+    def secret(self) -> SecretStr | str:
+        if self._kept is not None and not self.text():
+            return self._kept
+        return self.text()
+
+    def set_secret(self, value: SecretStr | str | None) -> None:
+        if isinstance(value, UndecryptableSecret):
+            self._kept = value
+            self.setPlaceholderText("Stored value cannot be decrypted, enter it again")
+            self.setText("")
+            return
+        self._forget_kept()
+        self.setText(value.get_secret_value() if isinstance(value, SecretStr) else value or "")
+
+    def _forget_kept(self) -> None:
+        self._kept = None
+        self.setPlaceholderText("")
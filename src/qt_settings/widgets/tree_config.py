@@ -0,0 +1,293 @@
+import json
+import logging
+from typing import Any, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from qtpy import QtCore, QtWidgets
+
+from .generic_config import QGenericSettingsWidget
+
+_DOUBLE_LIMIT = 1e300
+
+# Combined once, or-ing Qt flags per call is slow in Python. Leaves are marked as such so the view does not ask
+# every row for its children.
+_CONTAINER_FLAGS = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+_LEAF_FLAGS = _CONTAINER_FLAGS | QtCore.Qt.ItemNeverHasChildren
+_EDITABLE_FLAGS = _LEAF_FLAGS | QtCore.Qt.ItemIsEditable
+_CHECKABLE_FLAGS = _LEAF_FLAGS | QtCore.Qt.ItemIsUserCheckable
+
+
+class _Node:
+    """A dict or list of the document, created only when the view first asks for one of its rows.
+
+    Indexes point to the node holding them, so leaves need no object of their own. Edits only replace leaves and a
+    new document creates new nodes, so `value` stays the same object for the lifetime of the node.
+    """
+
+    __slots__ = ("parent", "row", "key", "value", "_keys", "_children")
+
+    def __init__(self, parent: "_Node | None", row: int, key: Any, value: Any) -> None:
+        self.parent = parent
+        self.row = row
+        self.key = key
+        self.value = value
+        self._keys: List[Any] | None = list(value) if isinstance(value, dict) else None
+        self._children: Dict[int, "_Node"] = {}
+
+    def key_at(self, row: int) -> Any:
+        return self._keys[row] if self._keys is not None else row
+
+    def child(self, row: int) -> "_Node":
+        node = self._children.get(row)
+        if node is None:
+            key = self.key_at(row)
+            node = self._children[row] = _Node(self, row, key, self.value[key])
+        return node
+
+    @property
+    def path(self) -> Tuple[Any, ...]:
+        keys = []
+        node: _Node | None = self
+        while node is not None and node.parent is not None:
+            keys.append(node.key)
+            node = node.parent
+        return tuple(reversed(keys))
+
+
+def _size(value: Any) -> int:
+    return len(value) if isinstance(value, (dict, list)) else 0
+
+
+class SettingsTreeModel(QtCore.QAbstractItemModel):
+    """Item model over the JSON dump of a settings model: one row per field, list item or dict entry.
+
+    Rows are resolved lazily, so a tree of any size costs only what the view shows. Leaves (str, int, float, bool,
+    None) are editable in the value column; edits change `document` in place and emit `value_edited`.
+    """
+
+    NAME_COLUMN = 0
+    VALUE_COLUMN = 1
+
+    value_edited = QtCore.Signal(tuple, object, object)
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self._document: Dict[str, Any] = {}
+        self._root = _Node(None, 0, None, self._document)
+
+    @property
+    def document(self) -> Dict[str, Any]:
+        return self._document
+
+    def set_document(self, document: Dict[str, Any]) -> None:
+        self.beginResetModel()
+        self._document = document
+        self._root = _Node(None, 0, None, document)
+        self.endResetModel()
+
+    def value(self, path: Tuple[Any, ...]) -> Any:
+        value: Any = self._document
+        for key in path:
+            value = value[key]
+        return value
+
+    def set_value(self, path: Tuple[Any, ...], value: Any) -> None:
+        """Replace a leaf without emitting `value_edited`, e.g. to revert a rejected edit."""
+        self.value(path[:-1])[path[-1]] = value
+        index = self.index_of(path, self.VALUE_COLUMN)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
+
+    def index_of(self, path: Tuple[Any, ...], column: int = 0) -> QtCore.QModelIndex:
+        index = QtCore.QModelIndex()
+        container: Any = self._document
+        for key in path:
+            row = list(container).index(key) if isinstance(container, dict) else key
+            index = self.index(row, 0, index)
+            container = container[key]
+        return index.siblingAtColumn(column) if index.isValid() else index
+
+    def path_of(self, index: QtCore.QModelIndex) -> Tuple[Any, ...]:
+        node = index.internalPointer()
+        return (*node.path, node.key_at(index.row()))
+
+    def _value_at(self, index: QtCore.QModelIndex) -> Any:
+        node = index.internalPointer()
+        return node.value[node.key_at(index.row())]
+
+    def index(self, row: int, column: int, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> QtCore.QModelIndex:
+        node = parent.internalPointer().child(parent.row()) if parent.isValid() else self._root
+        if not 0 <= row < _size(node.value) or not 0 <= column < 2:
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, node)
+
+    def parent(self, index: QtCore.QModelIndex) -> QtCore.QModelIndex:  # type: ignore[override]
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        node = index.internalPointer()
+        if node.parent is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(node.row, 0, node.parent)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if not parent.isValid():
+            return _size(self._document)
+        if parent.column() > 0:
+            return 0
+        return _size(self._value_at(parent))
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 2
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return ("Name", "Value")[section]
+        return None
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        if index.column() == self.NAME_COLUMN:
+            return str(index.internalPointer().key_at(index.row())) if role == QtCore.Qt.DisplayRole else None
+
+        value = self._value_at(index)
+        if isinstance(value, bool):
+            if role == QtCore.Qt.CheckStateRole:
+                return QtCore.Qt.Checked if value else QtCore.Qt.Unchecked
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            if isinstance(value, dict):
+                return f"{{{len(value)} fields}}"
+            if isinstance(value, list):
+                return f"[{len(value)} items]"
+            return "" if value is None else str(value)
+        if role == QtCore.Qt.EditRole:
+            return value
+        return None
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlags:
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        value = self._value_at(index)
+        if isinstance(value, (dict, list)):
+            return _CONTAINER_FLAGS
+        if index.column() == self.NAME_COLUMN:
+            return _LEAF_FLAGS
+        return _CHECKABLE_FLAGS if isinstance(value, bool) else _EDITABLE_FLAGS
+
+    def setData(self, index: QtCore.QModelIndex, value: Any, role: int = QtCore.Qt.EditRole) -> bool:
+        if not index.isValid() or index.column() != self.VALUE_COLUMN:
+            return False
+        node = index.internalPointer()
+        key = node.key_at(index.row())
+        old = node.value[key]
+        if role == QtCore.Qt.CheckStateRole and isinstance(old, bool):
+            new = QtCore.Qt.CheckState(value) == QtCore.Qt.Checked
+        elif role == QtCore.Qt.EditRole:
+            new = _coerce(old, value)
+        else:
+            return False
+        if new == old and type(new) is type(old):
+            return False
+
+        node.value[key] = new
+        self.dataChanged.emit(index, index)
+        self.value_edited.emit((*node.path, key), old, new)
+        return True
+
+
+def _coerce(old: Any, value: Any) -> Any:
+    # Keep the type of the edited leaf, leaves without a type (None) take JSON or text
+    if old is None and isinstance(value, str):
+        try:
+            return json.loads(value) if value else None
+        except json.JSONDecodeError:
+            return value
+    if isinstance(old, (int, float, str)) and not isinstance(old, bool):
+        try:
+            return type(old)(value)
+        except (TypeError, ValueError):
+            return value
+    return value
+
+
+class SettingsItemDelegate(QtWidgets.QStyledItemDelegate):
+    """Editors for the value column, only created for the row being edited."""
+
+    def createEditor(
+        self, parent: QtWidgets.QWidget, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex
+    ) -> QtWidgets.QWidget:
+        value = index.data(QtCore.Qt.EditRole)
+        if isinstance(value, int) and not isinstance(value, bool):
+            editor = QtWidgets.QSpinBox(parent)
+            editor.setRange(-(2**31), 2**31 - 1)
+            return editor
+        if isinstance(value, float):
+            editor = QtWidgets.QDoubleSpinBox(parent)
+            editor.setDecimals(6)
+            editor.setRange(-_DOUBLE_LIMIT, _DOUBLE_LIMIT)
+            return editor
+        return QtWidgets.QLineEdit(parent)
+
+    def setEditorData(self, editor: QtWidgets.QWidget, index: QtCore.QModelIndex) -> None:
+        value = index.data(QtCore.Qt.EditRole)
+        if isinstance(editor, QtWidgets.QLineEdit):
+            editor.setText("" if value is None else str(value))
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(
+        self, editor: QtWidgets.QWidget, model: QtCore.QAbstractItemModel, index: QtCore.QModelIndex
+    ) -> None:
+        if isinstance(editor, QtWidgets.QLineEdit):
+            model.setData(index, editor.text(), QtCore.Qt.EditRole)
+        else:
+            super().setModelData(editor, model, index)
+
+
+class QTreeSettingsWidget(QGenericSettingsWidget):
+    """Settings tab showing a whole model as a tree, for configurations too large for one input per field.
+
+    Either subclass it and declare `Model`, or pass the model class. The view creates rows lazily and editors only
+    for the row being edited. An edit re-validates only its top level field, an invalid edit is reverted.
+    """
+
+    def __init__(self, model: Type[BaseModel] | None = None) -> None:
+        super().__init__()
+        self.log = logging.getLogger(__name__)
+        if model is not None:
+            self.Model = model  # type: ignore
+
+        self.tree_model = SettingsTreeModel(self)
+        self.tree_model.value_edited.connect(self._on_value_edited)
+
+        self.view = QtWidgets.QTreeView()
+        self.view.setUniformRowHeights(True)
+        self.view.setItemDelegate(SettingsItemDelegate(self.view))
+        self.view.setModel(self.tree_model)
+        self.view.header().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.Interactive)
+        self.view.setColumnWidth(0, 250)
+
+        self._layout = QtWidgets.QVBoxLayout()
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._layout.addWidget(self.view)
+        self.setLayout(self._layout)
+
+        try:
+            self.from_default()
+        except ValidationError:
+            pass  # Fields without defaults stay empty until data is set
+
+    def _read_model(self) -> BaseModel:
+        return self.Model.model_validate(self.tree_model.document)
+
+    def _write_model(self, value: BaseModel) -> None:
+        self.tree_model.set_document(value.model_dump(mode="json"))
+
+    def _on_value_edited(self, path: Tuple[Any, ...], old: Any, new: Any) -> None:
+        field = path[0]
+        try:
+            self._on_field_changed(field, self.tree_model.document[field])
+        except ValidationError as e:
+            self.log.warning(f"Rejected {'/'.join(map(str, path))} = {new!r}: {e.errors()[0]['msg']}")
+            self.tree_model.set_value(path, old)
@@ -0,0 +1,157 @@
+import logging
+import threading
+from typing import Callable, Dict, Hashable, Set
+
+from qt_utils import messaging
+from qtpy import QtCore
+
+
+class ValidationTask(QtCore.QObject):
+    """A validation job running on the shared pool.
+
+    `finished` is emitted exactly once, in the GUI thread: with the `messaging.Result` of the job, with an error
+    result when the deadline passed, or with None when the task was cancelled or superseded. A result that
+    arrives after that is discarded.
+
+    A job that already started cannot be interrupted: it keeps its thread until it returns, `working` tells.
+    """
+
+    finished = QtCore.Signal(object)
+    _worker_done = QtCore.Signal(object)
+
+    def __init__(self, key: Hashable, fn: Callable[[], messaging.Result], deadline: float | None) -> None:
+        super().__init__()
+        self.key = key
+        self._fn = fn
+        self._lock = threading.Lock()
+        self._settled = False
+        self._working = False
+        self._worker_done.connect(self._settle)
+
+        if deadline is not None:
+            self._deadline_timer = QtCore.QTimer(self)
+            self._deadline_timer.setSingleShot(True)
+            self._deadline_timer.timeout.connect(
+                lambda: self._settle(messaging.Error(trace="", error=f"Timed out after {deadline:g}s").to_result())
+            )
+            self._deadline_timer.start(int(deadline * 1000))
+
+    @property
+    def done(self) -> bool:
+        return self._settled
+
+    @property
+    def working(self) -> bool:
+        """Whether the job is running on a worker thread, even after the task settled."""
+        return self._working
+
+    def cancel(self) -> None:
+        self._settle(None)
+
+    def _run(self) -> None:
+        # Worker thread: skip the job entirely if it was cancelled while queued
+        with self._lock:
+            if self._settled:
+                return
+            self._working = True
+        try:
+            result = self._fn()
+        except Exception as e:
+            result = messaging.Error.from_exception(e).to_result()
+        self._working = False
+        self._worker_done.emit(result)
+
+    def _settle(self, result: messaging.Result | None) -> None:
+        with self._lock:
+            if self._settled:
+                return
+            self._settled = True
+        self.finished.emit(result)
+
+
+class _ValidationRunnable(QtCore.QRunnable):
+    def __init__(self, task: ValidationTask) -> None:
+        super().__init__()
+        self._task = task
+
+    def run(self) -> None:
+        self._task._run()
+
+
+class ValidationRunner(QtCore.QObject):
+    """Bounded worker pool for settings validation that talks to remote systems.
+
+    At most one task per key is pending: submitting a new task for a key supersedes the previous one, whose
+    result is then discarded. Jobs cannot be interrupted, a superseded, cancelled or timed out job keeps running
+    until it returns, so jobs should bound their own run time (e.g. a client timeout no longer than the
+    deadline). Threads held by such abandoned jobs do not count against `max_threads`, up to `max_abandoned` of
+    them, so they cannot starve new tasks.
+    """
+
+    def __init__(self, max_threads: int = 2, max_abandoned: int = 8, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.log = logging.getLogger(__name__)
+        self.max_threads = max_threads
+        self.max_abandoned = max_abandoned
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._tasks: Dict[Hashable, ValidationTask] = {}
+        # Settled tasks whose job still holds a thread
+        self._abandoned: Set[ValidationTask] = set()
+
+    def submit(
+        self, key: Hashable, fn: Callable[[], messaging.Result], deadline: float | None = None
+    ) -> ValidationTask:
+        """Run `fn` on the pool, `deadline` in seconds is independent of any timeout inside `fn`."""
+        self.cancel(key)
+
+        task = ValidationTask(key, fn, deadline)
+        task.finished.connect(lambda _: self._forget(task))
+        task._worker_done.connect(lambda _: self._release(task))
+        self._tasks[key] = task
+        self._pool.start(_ValidationRunnable(task))
+        return task
+
+    def cancel(self, key: Hashable) -> None:
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def running(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    @property
+    def abandoned(self) -> int:
+        """Number of threads held by jobs whose task was already settled."""
+        return len(self._abandoned)
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        return self._pool.waitForDone(timeout_ms)
+
+    def _forget(self, task: ValidationTask) -> None:
+        if self._tasks.get(task.key) is task:
+            del self._tasks[task.key]
+        if task.working:
+            self._abandoned.add(task)
+            self._resize()
+
+    def _release(self, task: ValidationTask) -> None:
+        if task in self._abandoned:
+            self._abandoned.discard(task)
+            self._resize()
+
+    def _resize(self) -> None:
+        if len(self._abandoned) > self.max_abandoned:
+            self.log.warning(f"{len(self._abandoned)} abandoned validation jobs are still running")
+        self._pool.setMaxThreadCount(self.max_threads + min(len(self._abandoned), self.max_abandoned))
+
+
+_runner: ValidationRunner | None = None
+
+
+def validation_runner() -> ValidationRunner:
+    """The runner shared by all settings widgets, created on first use in the GUI thread."""
+    global _runner
+    if _runner is None:
+        _runner = ValidationRunner(parent=QtCore.QCoreApplication.instance())
+    return _runner
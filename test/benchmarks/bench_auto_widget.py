@@ -0,0 +1,53 @@
+"""Construction cost of generated settings forms, and the cost of a keystroke in a large one.
+
+Run with: QT_QPA_PLATFORM=offscreen python test/benchmarks/bench_auto_widget.py
+"""
+
+import time
+
+from pydantic import BaseModel, Field, create_model
+from qtpy.QtCore import QEvent
+from qtpy.QtWidgets import QApplication
+
+from qt_settings import QAutoSettingsWidget
+
+
+def large_model(fields: int) -> type[BaseModel]:
+    definitions = {}
+    for i in range(fields):
+        kind = i % 4
+        if kind == 0:
+            definitions[f"name{i}"] = (str, Field("", max_length=64))
+        elif kind == 1:
+            definitions[f"enabled{i}"] = (bool, True)
+        elif kind == 2:
+            definitions[f"count{i}"] = (int, Field(0, ge=0, le=1000))
+        else:
+            definitions[f"gain{i}"] = (float, Field(1.0, gt=0))
+    return create_model(f"Large{fields}", **definitions)  # type: ignore
+
+
+def construct_ms(model: type[BaseModel], number: int = 5) -> float:
+    total = 0.0
+    for _ in range(number):
+        start = time.perf_counter()
+        widget = QAutoSettingsWidget(model)
+        total += time.perf_counter() - start
+        widget.deleteLater()
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    return total / number * 1000
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+
+    for fields in (10, 100, 500):
+        print(f"{fields:4d} fields   construction {construct_ms(large_model(fields)):8.2f} ms")
+
+    widget = QAutoSettingsWidget(large_model(500))
+    line_edit = widget.input("name0")
+    counter = iter(range(10**9))
+    start = time.perf_counter()
+    for _ in range(2_000):
+        line_edit.setText(str(next(counter)))
+    print(f"keystroke -> model, 500 fields: {(time.perf_counter() - start) / 2_000 * 1e6:.1f} us")
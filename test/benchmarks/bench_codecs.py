@@ -0,0 +1,65 @@
+"""Round-trip time and size of a large multi-tab export, per codec.
+
+Run with: python test/benchmarks/bench_codecs.py
+"""
+
+import json
+import timeit
+
+from pydantic import BaseModel
+
+from qt_settings.codecs import Codec, JsonCodec, MsgpackCodec
+
+
+class Channel(BaseModel):
+    name: str = "channel"
+    enabled: bool = True
+    gain: float = 1.0
+    offset: float = 0.0
+    unit: str = "V"
+
+
+class Device(BaseModel):
+    host: str = "192.168.0.10"
+    port: int = 502
+    timeout: float = 1.5
+    tags: list[str] = ["lab", "rack-3"]
+    channels: list[Channel] = [Channel(name=f"ch{i}", gain=1 + i / 100) for i in range(32)]
+
+
+class StdlibJson(Codec):
+    """What the dialog did before: model_dump, json.dumps, json.loads and model_validate per section."""
+
+    name = "stdlib json"
+
+    def encode(self, snapshot, versions=None):
+        return json.dumps({name: model.model_dump() for name, model in snapshot.items()}).encode()
+
+    def decode(self, data, sections):
+        document = json.loads(data)
+        return {name: model.model_validate(document[name]) for name, model in sections.items() if name in document}
+
+
+def round_trip(codec: Codec, snapshot: dict, sections: dict, number: int) -> tuple[float, float, int]:
+    data = codec.encode(snapshot)
+    assert codec.decode(data, sections) == snapshot
+    # Best of several runs, the spread between runs is large on a busy machine
+    encode = min(timeit.repeat(lambda: codec.encode(snapshot), number=number, repeat=5)) / number
+    decode = min(timeit.repeat(lambda: codec.decode(data, sections), number=number, repeat=5)) / number
+    return encode, decode, len(data)
+
+
+if __name__ == "__main__":
+    tabs = 100
+    snapshot = {f"device{i}": Device(port=502 + i) for i in range(tabs)}
+    sections = {name: Device for name in snapshot}
+
+    codecs: list[Codec] = [StdlibJson(), JsonCodec(), MsgpackCodec()]
+    print(f"{tabs} tabs, {sum(5 + 5 * len(model.channels) for model in snapshot.values())} fields")
+    print(f"{'codec':>12} {'encode':>10} {'decode':>10} {'bytes':>10}")
+    for codec in codecs:
+        if not codec.available:
+            print(f"{codec.name:>12} not installed")
+            continue
+        encode, decode, size = round_trip(codec, snapshot, sections, 20)
+        print(f"{codec.name:>12} {encode * 1e3:>7.2f} ms {decode * 1e3:>7.2f} ms {size:>10}")
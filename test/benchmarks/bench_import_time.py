@@ -0,0 +1,69 @@
+"""Import time of qt_settings, measured in a fresh interpreter per statement.
+
+Run with: python test/benchmarks/bench_import_time.py
+Prints the wall time and the slowest imports reported by `python -X importtime`, and exits non-zero when
+importing the package or the dialog loads one of the optional heavy modules, or the headless store loads QtWidgets.
+"""
+
+import json
+import subprocess
+import sys
+
+# Modules that only specific widgets need, importing the package or the dialog must not load them
+DEFERRED_MODULES = ("influxdb_client", "urllib3")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+print(json.dumps({{"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(statement: str) -> tuple[float, set[str]]:
+    """Wall time of `statement` and the modules loaded afterwards."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement)], capture_output=True, text=True, check=True
+    )
+    data = json.loads(result.stdout.splitlines()[-1])
+    return data["seconds"], set(data["modules"])
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module, as reported by `-X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = (part.strip() for part in line.split("|"))
+        times[module] = int(cumulative)
+    return times
+
+
+def report(statement: str) -> set[str]:
+    seconds, modules = measure(statement)
+    print(f"{statement}: {seconds * 1000:.1f} ms, {len(modules)} modules loaded")
+    for module, us in sorted(import_times(statement).items(), key=lambda item: -item[1])[:5]:
+        print(f"  {us / 1000:>8.1f} ms  {module}")
+    return modules
+
+
+if __name__ == "__main__":
+    failed = False
+    for statement in ("import qt_settings", "from qt_settings import ConfigDialog, QPathSelector"):
+        modules = report(statement)
+        loaded = [module for module in DEFERRED_MODULES if module in modules]
+        if loaded:
+            print(f"  REGRESSION: {', '.join(loaded)} imported eagerly")
+            failed = True
+
+    modules = report("from qt_settings import SettingsStore")
+    if any(module.endswith("QtWidgets") for module in modules):
+        print("  REGRESSION: QtWidgets imported by the headless store")
+        failed = True
+
+    report("from qt_settings import QInfluxConfigWidget")
+    sys.exit(1 if failed else 0)
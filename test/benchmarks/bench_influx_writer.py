@@ -0,0 +1,89 @@
+"""Throughput of InfluxWriter against a local HTTP server standing in for InfluxDB.
+
+Run with: python test/benchmarks/bench_influx_writer.py
+"""
+
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from qt_settings import InfluxWriter, QInfluxConfigWidget
+
+
+class MockInflux(ThreadingHTTPServer):
+    """Accepts /api/v2/write requests, counts the received lines and answers after `latency` seconds."""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", 0), MockInfluxHandler)
+        self.latency = latency
+        self.lines = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class MockInfluxHandler(BaseHTTPRequestHandler):
+    server: MockInflux
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.lines += body.count(b"\n") + 1
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def config(url: str, flush_delay: float = 0.05) -> QInfluxConfigWidget.Model:
+    return QInfluxConfigWidget.Model(
+        url=url,
+        token="token",
+        org="org",
+        bucket="bucket",
+        measurement="bench",
+        force_ssl=False,
+        debug=False,
+        flush_delay=flush_delay,
+        timeout=5000,
+    )
+
+
+def bench(points: int, batch_size: int, latency: float = 0.0, overflow=InfluxWriter.Overflow.BLOCK) -> None:
+    server = MockInflux(latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    writer = InfluxWriter(config(server.url), max_queue=10_000, batch_size=batch_size, overflow=overflow)
+    with writer:
+        start = time.perf_counter()
+        for i in range(points):
+            writer.write(f"bench,sensor=s{i % 16} value={i}i {i}")
+        enqueued = time.perf_counter() - start
+        writer.flush()
+        total = time.perf_counter() - start
+    server.shutdown()
+
+    print(
+        f"batch {batch_size:>5}  latency {latency * 1000:>4.0f} ms  {overflow.name:<11}  "
+        f"enqueue {points / enqueued:>10.0f} pt/s  end-to-end {writer.written / total:>9.0f} pt/s  "
+        f"requests {server.requests:>4}  dropped {writer.dropped}"
+    )
+
+
+if __name__ == "__main__":
+    for batch_size in (100, 1_000, 5_000):
+        bench(50_000, batch_size)
+    # A slow server: blocking producers keep every point, dropping keeps producers fast
+    bench(50_000, 1_000, latency=0.05, overflow=InfluxWriter.Overflow.BLOCK)
+    bench(50_000, 1_000, latency=0.05, overflow=InfluxWriter.Overflow.DROP_OLDEST)
@@ -0,0 +1,66 @@
+"""Cost of the instrumentation hooks on the keystroke -> persisted value path, disabled and enabled.
+
+Run with: QT_QPA_PLATFORM=offscreen python test/benchmarks/bench_instrumentation.py
+"""
+
+import os
+import tempfile
+import time
+import timeit
+
+from pydantic import BaseModel
+from qtpy import QtCore
+from qtpy.QtWidgets import QApplication
+
+from qt_settings import ConfigDialog, QAutoSettingsWidget, instruments
+from qt_settings.instrumentation import Stage
+
+EDITS = 2_000
+
+
+class Device(BaseModel):
+    host: str = "192.168.0.10"
+    port: int = 502
+    timeout: float = 1.5
+    enabled: bool = True
+    name: str = "device"
+
+
+def edit_us(dialog: ConfigDialog, widget: QAutoSettingsWidget) -> float:
+    line_edit = widget.input("name")
+    start = time.perf_counter()
+    for i in range(EDITS):
+        line_edit.setText(f"device {i}")
+        dialog.flush_writes()
+    return (time.perf_counter() - start) / EDITS * 1e6
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+    path = os.path.join(tempfile.mkdtemp(), "settings.ini")
+    dialog = ConfigDialog(
+        None,  # type: ignore
+        QtCore.QSettings(path, QtCore.QSettings.Format.IniFormat),
+        save_delay_ms=0,
+        storage_layout=ConfigDialog.StorageLayout.SECTIONS,
+    )
+    widget = QAutoSettingsWidget(Device)
+    dialog.add_widget("device", widget)
+    dialog.load_from_settings()
+
+    calls = 1_000_000
+    instruments.enable(False)
+    empty_ns = timeit.timeit(lambda: None, number=calls) / calls * 1e9
+    disabled_ns = timeit.timeit(lambda: instruments.measure("device", Stage.SIGNALS), number=calls) / calls * 1e9
+    disabled_ns -= empty_ns
+    print(f"measure() disabled: {disabled_ns:.0f} ns per call")
+
+    edit_us(dialog, widget)  # Warm up
+    for enabled in (False, True, False, True):
+        instruments.enable(enabled)
+        print(
+            f"keystroke -> QSettings, instrumentation {'on ' if enabled else 'off'}: {edit_us(dialog, widget):7.1f} us"
+        )
+
+    print()
+    print(instruments.report())
@@ -0,0 +1,101 @@
+"""Bulk import of settings files written by an older schema, against files already in the current schema.
+
+Run with: QT_QPA_PLATFORM=offscreen python test/benchmarks/bench_migrations.py
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from pydantic import BaseModel
+from qtpy import QtCore
+
+from qt_settings import SettingsStore
+from qt_settings.codecs import SCHEMA_KEY
+from qt_settings.migrations import Migrations
+
+FILES = 2000
+
+
+class Device(BaseModel):
+    host: str = "192.168.0.10"
+    port: int = 502
+    timeout_s: float = 1.5
+    enabled: bool = True
+    tags: list[str] = []
+
+
+def register(migrations: Migrations) -> None:
+    @migrations.step(Device, 0)
+    def rename_timeout(data):
+        data["timeout_ms"] = data.pop("timeout", 1500)
+        return data
+
+    @migrations.step(Device, 1)
+    def timeout_in_seconds(data):
+        data["timeout_s"] = data.pop("timeout_ms") / 1000
+        return data
+
+    @migrations.step(Device, 2)
+    def tags_from_label(data):
+        label = data.pop("label", "")
+        data["tags"] = [label] if label else []
+        return data
+
+
+def write_files(directory: str, upgraded: bool) -> list[str]:
+    paths = []
+    for i in range(FILES):
+        if upgraded:
+            document = {
+                "device": Device(port=i, timeout_s=i / 1000, tags=["lab"]).model_dump(),
+                SCHEMA_KEY: {"device": 3},
+            }
+        else:
+            document = {"device": {"host": "192.168.0.10", "port": i, "timeout": i, "label": "lab"}}
+        path = os.path.join(directory, f"{'current' if upgraded else 'legacy'}{i}.json")
+        with open(path, "w") as file:
+            json.dump(document, file)
+        paths.append(path)
+    return paths
+
+
+def upgrade_ms(migrations: Migrations, paths: list[str]) -> float:
+    # The upgrades alone, without reading, validating and applying the files
+    documents = []
+    for path in paths:
+        with open(path) as file:
+            documents.append(json.load(file)["device"])
+    start = time.perf_counter()
+    for data in documents:
+        migrations.migrate(Device, data, 0)
+    return (time.perf_counter() - start) * 1000
+
+
+def load_ms(migrations: Migrations, paths: list[str], settings: QtCore.QSettings) -> float:
+    store = SettingsStore(settings, migrations=migrations)
+    store.add_section("device", Device)
+    start = time.perf_counter()
+    for path in paths:
+        report = store.load_file(path)
+        assert report.ok, report.summary()
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    directory = tempfile.mkdtemp()
+    settings = QtCore.QSettings(os.path.join(directory, "settings.ini"), QtCore.QSettings.Format.IniFormat)
+    legacy = write_files(directory, upgraded=False)
+    current = write_files(directory, upgraded=True)
+
+    migrations = Migrations()
+    register(migrations)
+    load_ms(migrations, current[:100], settings)  # Warm up
+    upgrade = load_ms(migrations, legacy, settings)
+    plain = load_ms(migrations, current, settings)
+    upgrades = upgrade_ms(migrations, legacy)
+    print(
+        f"load {FILES} legacy files {upgrade:7.1f} ms, current files {plain:7.1f} ms   "
+        f"upgrades only {upgrades:6.2f} ms   upgraded {migrations.upgraded:5d}"
+    )
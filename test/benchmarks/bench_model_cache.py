@@ -0,0 +1,122 @@
+"""Cost of `data` access and of one edit through cached, field-patched models versus rebuilding them.
+
+Run with: QT_QPA_PLATFORM=offscreen python test/benchmarks/bench_model_cache.py
+"""
+
+import timeit
+from functools import lru_cache
+
+from pydantic import BaseModel, create_model
+from qtpy import QtWidgets
+from qtpy.QtWidgets import QApplication
+
+from qt_settings import QGenericSettingsWidget, QInfluxConfigWidget
+
+
+class Rebuild:
+    """Mixin restoring the old behaviour: every access and every edit rebuilds the model from the inputs."""
+
+    @property
+    def data(self):
+        return self._read_model()  # type: ignore
+
+    @data.setter
+    def data(self, value):
+        self._write_model(value)  # type: ignore
+
+    def _on_field_changed(self, field, value, validate=True):
+        self.changed.emit(self._read_model())  # type: ignore
+
+
+class RebuildInflux(Rebuild, QInfluxConfigWidget):
+    pass
+
+
+class Leaf(QGenericSettingsWidget):
+    class Model(BaseModel):
+        a: str = ""
+        b: str = ""
+        c: str = ""
+        d: str = ""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.inputs = {name: QtWidgets.QLineEdit() for name in self.Model.model_fields}
+        for name, line_edit in self.inputs.items():
+            self.bind_field(name, line_edit.textChanged, line_edit.text)
+
+    def _read_model(self) -> Model:
+        return self.Model(**{name: line_edit.text() for name, line_edit in self.inputs.items()})
+
+
+@lru_cache(maxsize=None)
+def node_model(depth: int) -> type[BaseModel]:
+    fields = {f"leaf{i}": (Leaf.Model, ...) for i in range(3)}
+    if depth > 0:
+        fields["child"] = (node_model(depth - 1), ...)
+    return create_model(f"Node{depth}", **fields)  # type: ignore
+
+
+class Node(QGenericSettingsWidget):
+    """Three leaves and, above depth 0, a nested node: the TestConfig pattern repeated."""
+
+    def __init__(self, depth: int, rebuild: bool) -> None:
+        super().__init__()
+        self.Model = node_model(depth)  # type: ignore
+        self.children = {f"leaf{i}": (RebuildLeaf() if rebuild else Leaf()) for i in range(3)}
+        if depth > 0:
+            self.children["child"] = (RebuildNode if rebuild else Node)(depth - 1, rebuild)
+        for name, child in self.children.items():
+            self.bind_child(name, child)
+
+    def _read_model(self):
+        return self.Model(**{name: child.data for name, child in self.children.items()})
+
+    def deepest_input(self) -> QtWidgets.QLineEdit:
+        child = self.children.get("child")
+        return child.deepest_input() if child is not None else self.children["leaf0"].inputs["a"]
+
+
+class RebuildLeaf(Rebuild, Leaf):
+    pass
+
+
+class RebuildNode(Rebuild, Node):
+    pass
+
+
+def per_call_us(fn, number: int) -> float:
+    return timeit.timeit(fn, number=number) / number * 1e6
+
+
+def measure(widget: QGenericSettingsWidget, line_edit: QtWidgets.QLineEdit, number: int) -> tuple[float, float]:
+    widget.data  # noqa: B018, fill the cache
+    counter = iter(range(10**9))
+    access = per_call_us(lambda: widget.data, number)
+    edit = per_call_us(lambda: line_edit.setText(str(next(counter))), number)
+    return access, edit
+
+
+def report(title: str, cached: tuple[float, float], rebuilt: tuple[float, float]) -> None:
+    print(title)
+    print(f"  data access   cached  {cached[0]:8.2f} us   rebuilt {rebuilt[0]:8.2f} us")
+    print(f"  one edit      patched {cached[1]:8.2f} us   rebuilt {rebuilt[1]:8.2f} us")
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+
+    cached_widget, rebuilt_widget = QInfluxConfigWidget(), RebuildInflux()
+    report(
+        "flat: QInfluxConfigWidget, 9 fields",
+        measure(cached_widget, cached_widget.url_input, 20_000),
+        measure(rebuilt_widget, rebuilt_widget.url_input, 20_000),
+    )
+
+    for depth in (0, 4, 16):
+        cached_root, rebuilt_root = Node(depth, rebuild=False), RebuildNode(depth, rebuild=True)
+        report(
+            f"nested: depth {depth}, {(depth + 1) * 12} leaf fields, edit in the deepest leaf",
+            measure(cached_root, cached_root.deepest_input(), 2_000),
+            measure(rebuilt_root, rebuilt_root.deepest_input(), 2_000),
+        )
@@ -0,0 +1,69 @@
+"""Latency of the keystroke -> QSettings path with an encrypted Secret field, against the same field in plain text.
+
+Run with: QT_QPA_PLATFORM=offscreen python test/benchmarks/bench_secrets.py
+"""
+
+import os
+import tempfile
+import time
+
+from pydantic import BaseModel, SecretStr
+from qtpy import QtCore
+from qtpy.QtWidgets import QApplication
+
+from qt_settings import ConfigDialog, QAutoSettingsWidget, Secret, encryption
+
+EDITS = 2_000
+
+
+class Plain(BaseModel):
+    url: str = "http://localhost:8086"
+    org: str = "lab"
+    token: str = "x" * 88
+
+
+class Encrypted(BaseModel):
+    url: str = "http://localhost:8086"
+    org: str = "lab"
+    token: Secret = SecretStr("x" * 88)
+
+
+def edit_us(model: type[BaseModel], field: str, layout: ConfigDialog.StorageLayout) -> float:
+    path = os.path.join(tempfile.mkdtemp(), "settings.ini")
+    settings = QtCore.QSettings(path, QtCore.QSettings.Format.IniFormat)
+    dialog = ConfigDialog(None, settings, save_delay_ms=0, storage_layout=layout)  # type: ignore
+    widget = QAutoSettingsWidget(model)
+    dialog.add_widget("influx", widget)
+    dialog.load_from_settings()
+
+    line_edit = widget.input(field)
+    start = time.perf_counter()
+    for i in range(EDITS):
+        line_edit.setText(f"{field} {i}")
+    elapsed = (time.perf_counter() - start) / EDITS * 1e6
+    dialog.deleteLater()
+    return elapsed
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+    encryption.configure("benchmark passphrase")
+
+    start = time.perf_counter()
+    encryption.session_cipher()
+    print(f"key derivation, once per session: {(time.perf_counter() - start) * 1000:.1f} ms")
+    start = time.perf_counter()
+    encryption.session_cipher()
+    print(f"later saves reuse the key:        {(time.perf_counter() - start) * 1e6:.1f} us")
+
+    for layout in (ConfigDialog.StorageLayout.BLOB, ConfigDialog.StorageLayout.SECTIONS):
+        for field in ("url", "token"):
+            plain = edit_us(Plain, field, layout)
+            encrypted = edit_us(Encrypted, field, layout)
+            print(
+                f"{layout.name:8s} edit {field:5s}   plain text {plain:7.1f} us   encrypted {encrypted:7.1f} us   "
+                f"({encrypted - plain:+.1f} us)"
+            )
+
+    cipher = encryption.session_cipher()
+    print(f"encryptions {cipher.encrypted}, memoized {cipher.memo_hits}")
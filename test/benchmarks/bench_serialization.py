@@ -0,0 +1,68 @@
+"""Write cost of ConfigDialog.save_to_settings after a single edit, for 1, 10 and 100 tabs.
+
+Run with: QT_QPA_PLATFORM=offscreen python test/benchmarks/bench_serialization.py
+"""
+
+import json
+import tempfile
+import timeit
+
+from pydantic import BaseModel
+from qtpy import QtCore, QtWidgets
+from qtpy.QtWidgets import QApplication
+
+from qt_settings import ConfigDialog, QGenericSettingsWidget
+
+
+class BenchConfig(QGenericSettingsWidget):
+    class Model(BaseModel):
+        name: str = "sensor"
+        enabled: bool = True
+        gain: float = 1.0
+        offset: float = 0.0
+        channels: list[int] = list(range(32))
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.name_input = QtWidgets.QLineEdit()
+        self.name_input.textChanged.connect(self._on_value_changed)
+        self._model = self.Model()
+
+    @property
+    def data(self) -> Model:
+        return self._model.model_copy(update={"name": self.name_input.text()})
+
+    @data.setter
+    def data(self, value: Model) -> None:
+        self._model = value
+        self.name_input.setText(value.name)
+
+
+def bench(tab_count: int, number: int = 200) -> tuple[float, float]:
+    settings = QtCore.QSettings(tempfile.mktemp(suffix=".ini"), QtCore.QSettings.Format.IniFormat)
+    dialog = ConfigDialog(None, settings, save_delay_ms=0)  # type: ignore
+    widgets = [BenchConfig() for _ in range(tab_count)]
+    for i, widget in enumerate(widgets):
+        dialog.add_widget(f"tab{i}", widget)
+    dialog.save_to_settings()
+
+    counter = iter(range(10**9))
+
+    def edit_one():
+        # Each edit triggers a synchronous save through the persistence scheduler
+        widgets[0].name_input.setText(f"sensor{next(counter)}")
+
+    def full_dump():
+        settings.setValue("config", json.dumps({name: w.data.model_dump() for name, w in dialog.configs.items()}))
+
+    incremental = timeit.timeit(edit_one, number=number) / number
+    full = timeit.timeit(full_dump, number=number) / number
+    return incremental, full
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+    print(f"{'tabs':>6} {'incremental':>14} {'full dump':>14}")
+    for tab_count in (1, 10, 100):
+        incremental, full = bench(tab_count)
+        print(f"{tab_count:>6} {incremental * 1e6:>11.1f} us {full * 1e6:>11.1f} us")
@@ -0,0 +1,56 @@
+"""Time for a headless worker to load its settings with SettingsStore, against building the ConfigDialog.
+
+Run with: QT_QPA_PLATFORM=offscreen python test/benchmarks/bench_store.py
+"""
+
+import os
+import tempfile
+import time
+
+from pydantic import BaseModel
+from qtpy import QtCore
+from qtpy.QtWidgets import QApplication
+
+from qt_settings import ConfigDialog, QAutoSettingsWidget, SettingsStore
+
+
+class Device(BaseModel):
+    host: str = "192.168.0.10"
+    port: int = 502
+    timeout: float = 1.5
+    enabled: bool = True
+    unit_id: int = 1
+    name: str = "device"
+
+
+def store_ms(path: str, tabs: int) -> float:
+    start = time.perf_counter()
+    store = SettingsStore(QtCore.QSettings(path, QtCore.QSettings.Format.IniFormat))
+    for i in range(tabs):
+        store.add_section(f"device{i}", Device)
+    store.load_from_settings()
+    return (time.perf_counter() - start) * 1000
+
+
+def dialog_ms(path: str, tabs: int) -> float:
+    start = time.perf_counter()
+    dialog = ConfigDialog(None, QtCore.QSettings(path, QtCore.QSettings.Format.IniFormat))  # type: ignore
+    for i in range(tabs):
+        dialog.add_widget(f"device{i}", QAutoSettingsWidget(Device))
+    dialog.load_from_settings()
+    elapsed = (time.perf_counter() - start) * 1000
+    dialog.deleteLater()
+    return elapsed
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+    directory = tempfile.mkdtemp()
+
+    for tabs in (1, 10, 100):
+        path = os.path.join(directory, f"settings{tabs}.ini")
+        # The first load writes the defaults, measure loading existing settings
+        store_ms(path, tabs)
+        store = min(store_ms(path, tabs) for _ in range(5))
+        dialog = min(dialog_ms(path, tabs) for _ in range(5))
+        print(f"{tabs:4d} tabs   store {store:7.2f} ms   dialog {dialog:8.2f} ms")
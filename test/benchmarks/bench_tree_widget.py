@@ -0,0 +1,56 @@
+"""Time to open very large configurations in QTreeSettingsWidget, and the number of widgets it needs.
+
+Run with: QT_QPA_PLATFORM=offscreen python test/benchmarks/bench_tree_widget.py
+"""
+
+import time
+
+from pydantic import BaseModel, create_model
+from qtpy.QtCore import QEvent
+from qtpy.QtWidgets import QApplication
+
+from qt_settings import QTreeSettingsWidget
+
+
+class Channel(BaseModel):
+    name: str = ""
+    enabled: bool = True
+    gain: float = 1.0
+    offset: float = 0.0
+    unit: str = "V"
+    sensor_id: int = 0
+    sample_rate: int = 1000
+    filter: str | None = None
+    min_value: float = -10.0
+    max_value: float = 10.0
+
+
+def channel_map(fields: int) -> BaseModel:
+    model = create_model(f"ChannelMap{fields}", channels=(list[Channel], ...))
+    return model(channels=[Channel(name=f"ch{i}", sensor_id=i) for i in range(fields // 10)])
+
+
+def open_ms(data: BaseModel) -> tuple[float, int]:
+    start = time.perf_counter()
+    widget = QTreeSettingsWidget(type(data))
+    widget.data = data
+    widget.resize(800, 600)
+    widget.show()
+    widget.view.expandToDepth(0)
+    QApplication.processEvents()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    widgets = len(QApplication.allWidgets())
+    widget.close()
+    widget.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    return elapsed, widgets
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+
+    for fields in (1_000, 10_000, 50_000, 200_000):
+        data = channel_map(fields)
+        elapsed, widgets = open_ms(data)
+        print(f"{fields:7d} fields   open {elapsed:8.1f} ms   {widgets} widgets alive")
@@ -0,0 +1,120 @@
+"""Benchmark fixtures: every benchmark is timed and reported, and optionally compared to its stored baseline.
+
+Run with: python -m pytest test/benchmarks
+    --bench-compare         fail benchmarks that got slower than their baseline, only meaningful on the machine
+                            that recorded the baselines
+    --bench-save            store the measured times as the new baselines (after an intended change, or on a new
+                            reference machine)
+    --bench-threshold=1.5   with --bench-compare, fail a benchmark that takes more than this factor of its baseline
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+
+BASELINES = Path(__file__).with_name("baselines.json")
+# Every benchmark that ran, for the summary and for saving baselines
+_RESULTS = pytest.StashKey[List["Benchmark"]]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-compare", action="store_true", help="Fail benchmarks slower than their baselines")
+    group.addoption("--bench-save", action="store_true", help="Store the measured times as the new baselines")
+    group.addoption(
+        "--bench-threshold", type=float, default=1.5, help="Fail benchmarks slower than baseline times this factor"
+    )
+
+
+class Benchmark:
+    """Times one function: the best of `rounds` runs of `number` calls each, the least disturbed by other load."""
+
+    def __init__(self, name: str, baseline: float | None, threshold: float, compare: bool) -> None:
+        self.name = name
+        self.baseline = baseline
+        self.threshold = threshold
+        self.compare = compare
+        self.seconds: float | None = None
+
+    def __call__(
+        self, function: Callable[[], Any], number: int = 1, rounds: int = 5, setup: Callable[[], Any] | None = None
+    ) -> float:
+        """Seconds per call of `function`, `setup` runs untimed before every round."""
+        function()  # Warm up caches and lazy imports
+        best = float("inf")
+        for _ in range(rounds):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            best = min(best, (time.perf_counter() - start) / number)
+        self.record(best)
+        return best
+
+    def record(self, seconds: float) -> None:
+        """Record a time measured by the test itself, failing the test when it regressed."""
+        self.seconds = seconds
+        if self.compare and self.regressed:
+            pytest.fail(
+                f"{self.name} took {seconds * 1000:.3f} ms, {self.ratio:.2f}x its baseline of "
+                f"{self.baseline * 1000:.3f} ms (threshold {self.threshold:.2f}x)",
+                pytrace=False,
+            )
+
+    @property
+    def ratio(self) -> float | None:
+        if self.seconds is None or not self.baseline:
+            return None
+        return self.seconds / self.baseline
+
+    @property
+    def regressed(self) -> bool:
+        return self.ratio is not None and self.ratio > self.threshold
+
+
+def _load_baselines() -> Dict[str, float]:
+    try:
+        return json.loads(BASELINES.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+@pytest.fixture(scope="session")
+def _baselines() -> Dict[str, float]:
+    return _load_baselines()
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest, _baselines: Dict[str, float]):
+    name = request.node.nodeid.split("::", 1)[-1]
+    compare = request.config.getoption("--bench-compare") and not request.config.getoption("--bench-save")
+    bench = Benchmark(name, _baselines.get(name), request.config.getoption("--bench-threshold"), compare)
+    request.config.stash.setdefault(_RESULTS, []).append(bench)
+    return bench
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    results: List[Tuple[str, Benchmark]] = [
+        (bench.name, bench) for bench in config.stash.get(_RESULTS, []) if bench.seconds is not None
+    ]
+    if not results:
+        return
+
+    terminalreporter.section("benchmarks")
+    width = max(len(name) for name, _ in results)
+    terminalreporter.write_line(f"{'benchmark':{width}s} {'baseline ms':>12s} {'measured ms':>12s} {'ratio':>7s}")
+    for name, bench in results:
+        baseline = f"{bench.baseline * 1000:12.3f}" if bench.baseline else f"{'new':>12s}"
+        ratio = f"{bench.ratio:6.2f}x" if bench.ratio is not None else ""
+        marker = "  SLOWER" if bench.regressed else ""
+        terminalreporter.write_line(f"{name:{width}s} {baseline} {bench.seconds * 1000:12.3f} {ratio:>7s}{marker}")
+
+    if config.getoption("--bench-save"):
+        baselines = _load_baselines()
+        baselines.update({name: bench.seconds for name, bench in results})
+        BASELINES.write_text(json.dumps(dict(sorted(baselines.items())), indent=2) + "\n")
+        terminalreporter.write_line(f"Saved {len(results)} baselines to {BASELINES}")
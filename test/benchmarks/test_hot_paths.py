@@ -0,0 +1,160 @@
+"""Timings of the qt_settings hot paths, compared against baselines.json with --bench-compare (see conftest.py)."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from pydantic import BaseModel, SecretStr
+from qtpy import QtCore
+from qtpy.QtCore import QEvent
+from qtpy.QtWidgets import QApplication
+
+from qt_settings import ConfigDialog, QAutoSettingsWidget, QInfluxConfigWidget, Secret, SettingsStore, encryption
+
+
+class Device(BaseModel):
+    host: str = "192.168.0.10"
+    port: int = 502
+    timeout: float = 1.5
+    enabled: bool = True
+    unit_id: int = 1
+    name: str = "device"
+
+
+class Channel(BaseModel):
+    name: str = ""
+    enabled: bool = True
+    gain: float = 1.0
+    offset: float = 0.0
+    unit: str = "V"
+    tags: list[str] = ["raw"]
+
+
+class Rack(BaseModel):
+    name: str = "rack"
+    devices: list[Device] = [Device(name=f"device{i}", port=502 + i) for i in range(20)]
+    channels: list[Channel] = [Channel(name=f"ch{i}", gain=1 + i / 100) for i in range(200)]
+
+
+class Credentials(BaseModel):
+    user: str = "admin"
+    token: Secret = SecretStr("x" * 88)
+
+
+def settings(tmp_path, name: str = "settings.ini") -> QtCore.QSettings:
+    return QtCore.QSettings(str(tmp_path / name), QtCore.QSettings.Format.IniFormat)
+
+
+def delete_later(widget) -> None:
+    widget.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
+def rack_store(tmp_path, sections: int = 20) -> SettingsStore:
+    store = SettingsStore(settings(tmp_path), save_delay_ms=0)
+    for i in range(sections):
+        store.add_section(f"rack{i}", Rack)
+    return store
+
+
+@pytest.mark.parametrize("tabs", [1, 10, 100])
+def test_dialog_construction(benchmark, qapp, tmp_path, tabs):
+    def build():
+        dialog = ConfigDialog(None, settings(tmp_path))  # type: ignore
+        for i in range(tabs):
+            dialog.add_widget(f"device{i}", QAutoSettingsWidget(Device))
+        delete_later(dialog)
+
+    benchmark(build, rounds=3)
+
+
+def test_json_round_trip(benchmark, tmp_path):
+    store = rack_store(tmp_path)
+
+    def round_trip():
+        store.invalidate()  # Serialize every section, not the cached fragments
+        report = store.from_json(store.to_json())
+        assert report.ok
+
+    benchmark(round_trip)
+
+
+def test_influx_keystroke(benchmark, qapp, tmp_path):
+    dialog = ConfigDialog(None, settings(tmp_path), save_delay_ms=0)  # type: ignore
+    widget = QInfluxConfigWidget()
+    dialog.add_widget("influx", widget)
+    counter = iter(range(10**9))
+
+    def keystroke():
+        # One edit, through the model patch, the store and the settings write
+        widget.url_input.setText(f"http://localhost:{next(counter)}")
+
+    benchmark(keystroke, number=200)
+    delete_later(dialog)
+
+
+@pytest.fixture
+def passphrase():
+    encryption.configure("benchmark passphrase")
+    yield
+    encryption.configure()
+
+
+@pytest.mark.parametrize("field", ["user", "token"])
+def test_secret_keystroke(benchmark, qapp, passphrase, tmp_path, field):
+    # Editing another field reuses the memoized token, editing the secret encrypts it once per keystroke
+    dialog = ConfigDialog(None, settings(tmp_path), save_delay_ms=0)  # type: ignore
+    widget = QAutoSettingsWidget(Credentials)
+    dialog.add_widget("credentials", widget)
+    line_edit = widget.input(field)
+    counter = iter(range(10**9))
+
+    benchmark(lambda: line_edit.setText(f"{field} {next(counter)}"), number=200)
+    delete_later(dialog)
+
+
+@pytest.mark.parametrize("layout", list(SettingsStore.StorageLayout), ids=lambda layout: layout.name)
+def test_load_from_settings_cold(benchmark, tmp_path, layout):
+    def load():
+        store = SettingsStore(settings(tmp_path), storage_layout=layout)
+        for i in range(100):
+            store.add_section(f"device{i}", Device)
+        store.load_from_settings()
+
+    load()  # The first load writes the defaults, measure loading existing settings
+    benchmark(load)
+
+
+@pytest.mark.parametrize("statement", ["import qt_settings", "from qt_settings import ConfigDialog"])
+def test_import_time(benchmark, statement):
+    probe = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    seconds = []
+
+    def run():
+        result = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, check=True, env=os.environ
+        )
+        seconds.append(float(result.stdout.splitlines()[-1]))
+
+    for _ in range(3):
+        run()
+    # The interpreter start-up is not the import
+    benchmark.record(min(seconds))
+
+
+@pytest.mark.parametrize("extension", [".json", ".msgpack"])
+def test_file_export_import(benchmark, tmp_path, extension):
+    if extension == ".msgpack":
+        pytest.importorskip("msgpack")
+    store = rack_store(tmp_path)
+    path = str(tmp_path / f"export{extension}")
+
+    def export_import():
+        store.invalidate()
+        store.save_file(path)
+        assert store.load_file(path).ok
+
+    benchmark(export_import)
+    size = os.path.getsize(path)
+    print(f"{size / benchmark.seconds / 1e6:.1f} MB/s for {size} bytes")
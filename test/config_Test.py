@@ -1,10 +1,10 @@
 from pydantic import BaseModel
-from qt_settings import PathQuery, QInfluxConfigWidget, QPathSelector
+from qt_settings import PathQuery, QGenericSettingsWidget, QInfluxConfigWidget, QPathSelector
 from qtpy import QtCore, QtGui, QtWidgets
 from qtpy.QtWidgets import QApplication, QWidget
 
 
-class StringConfig(QWidget):
+class StringConfig(QGenericSettingsWidget):
     class Model(BaseModel):
         value: int = 0
         default: str = "test"
@@ -12,20 +12,18 @@ class StringConfig(QWidget):
         class Config:
             arbitrary_types_allowed = True
 
-    changed = QtCore.Signal(Model)
-
     def __init__(self):
         super().__init__()
 
-        self._data = self.Model(default="Hello ")
+        self._model = self.Model(default="Hello ")
 
         self.value_spin = QtWidgets.QSpinBox()
-        self.value_spin.setValue(self._data.value)
-        self.value_spin.valueChanged.connect(self._on_value_changed)
+        self.value_spin.setValue(self._model.value)
+        self.bind_field("value", self.value_spin.valueChanged, self.value_spin.value)
 
         self.default = QtWidgets.QLineEdit()
-        self.default.setText(self._data.default)
-        self.default.textChanged.connect(self._on_value_changed)
+        self.default.setText(self._model.default)
+        self.bind_field("default", self.default.textChanged, self.default.text)
         self.default.setValidator(QtGui.QRegularExpressionValidator(QtCore.QRegularExpression(r"[^\s]+")))
 
         self._layout = QtWidgets.QFormLayout()
@@ -34,15 +32,10 @@ class StringConfig(QWidget):
 
         self.setLayout(self._layout)
 
-    def _on_value_changed(self, value):
-        self.changed.emit(self.data)
-
-    @property
-    def data(self) -> Model:
+    def _read_model(self) -> Model:
         return StringConfig.Model(value=self.value_spin.value(), default=self.default.text())
 
-    @data.setter
-    def data(self, value: Model) -> None:
+    def _write_model(self, value: Model) -> None:
         self.value_spin.setValue(value.value)
         self.default.setText(value.default)
 
@@ -55,28 +48,27 @@ def encapsulate_groupbox(widget: QWidget, title: str) -> QWidget:
     return groupbox
 
 
-class TestConfig(QWidget):
+class TestConfig(QGenericSettingsWidget):
     class Model(BaseModel):
         path: QPathSelector.PathModel
         value1: StringConfig.Model
         value2: StringConfig.Model
         influx: QInfluxConfigWidget.Model
 
-    changed = QtCore.Signal(Model)
-
     def __init__(self):
         super().__init__()
 
         self.groupbox = QtWidgets.QGroupBox("Test")
+        # A child change only replaces its own field, the other children are not read again
         self.value1 = StringConfig()
         self.value2 = StringConfig()
-        self.value1.changed.connect(self._on_value_changed)
-        self.value2.changed.connect(self._on_value_changed)
+        self.bind_child("value1", self.value1)
+        self.bind_child("value2", self.value2)
         self.infux = QInfluxConfigWidget()
-        self.infux.changed.connect(self._on_value_changed)
+        self.bind_child("influx", self.infux)
 
         self.path = QPathSelector(supported_types="*.lock", type=PathQuery.LoadSaveEnum.EXISTING_DIRECTORY)
-        self.path.changed.connect(self._on_value_changed)
+        self.bind_child("path", self.path)
 
         self._layout = QtWidgets.QFormLayout()
         self._layout.addRow("Value1", self.value1)
@@ -89,19 +81,12 @@ class TestConfig(QWidget):
         self._layout.addWidget(self.groupbox)
         self.setLayout(self._layout)
 
-    def _on_value_changed(self, value):
-        self.changed.emit(self.data)
-
-        # schema = self._data.model()
-
-    @property
-    def data(self) -> Model:
+    def _read_model(self) -> Model:
         return TestConfig.Model(
             value1=self.value1.data, value2=self.value2.data, path=self.path.data, influx=self.infux.data
         )
 
-    @data.setter
-    def data(self, value: Model) -> None:
+    def _write_model(self, value: Model) -> None:
         self.value1.data = value.value1
         self.value2.data = value.value2
         self.path.data = value.path
@@ -129,5 +114,6 @@ if __name__ == "__main__":
 
     widget = TestConfig()
     widget.changed.connect(lambda x: print("change", x))
+    widget.patched.connect(lambda x: print("patch", x))
     widget.show()
     app.exec_()
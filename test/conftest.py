@@ -0,0 +1,37 @@
+import os
+import time
+
+import pytest
+
+# Before anything imports Qt
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from qtpy.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def settings(tmp_path):
+    from qtpy import QtCore
+
+    return QtCore.QSettings(str(tmp_path / "settings.ini"), QtCore.QSettings.Format.IniFormat)
+
+
+@pytest.fixture
+def wait_until(qapp):
+    """`wait_until(condition, timeout_s=5.0)`: process Qt events until `condition()` holds or `timeout_s` passed,
+    returns whether it holds. A fixture, as the benchmarks' conftest would shadow a plain `from conftest import`."""
+    return _wait_until
+
+
+def _wait_until(condition, timeout_s: float = 5.0) -> bool:
+    from qtpy import QtCore
+
+    deadline = time.monotonic() + timeout_s
+    while not condition() and time.monotonic() < deadline:
+        QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 10)
+    return condition()
@@ -0,0 +1,102 @@
+import enum
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from qt_settings import QAutoSettingsWidget
+
+
+class Mode(enum.Enum):
+    FAST = "fast"
+    SAFE = "safe"
+
+
+class Channel(BaseModel):
+    name: str = ""
+    gain: float = 1.0
+    mode: Mode = Mode.SAFE
+
+
+class Device(BaseModel):
+    host: str = "localhost"
+    port: int = Field(502, ge=1, le=65535)
+    retries: Optional[int] = None
+    timeout: float | None = 1.5
+    channels: list[Channel] = [Channel(name="ch0")]
+
+
+def test_inputs_show_the_model(qapp):
+    widget = QAutoSettingsWidget(Device)
+
+    assert widget.input("host").text() == "localhost"
+    assert widget.input("port").value() == 502
+    assert widget.input("retries").text() == "None"
+    assert widget.input("channels").text() == '[{"name":"ch0","gain":1.0,"mode":"safe"}]'
+    assert widget.data == Device()
+
+
+def test_optional_numbers_keep_none(qapp):
+    widget = QAutoSettingsWidget(Device)
+    widget.data = Device(retries=3, timeout=None)
+    assert widget.data == Device(retries=3, timeout=None)
+
+    widget.input("retries").setValue(widget.input("retries").minimum())
+    assert widget.data.retries is None
+    widget.input("retries").setValue(0)
+    assert widget.data.retries == 0
+
+
+def test_json_field_round_trip(qapp):
+    widget = QAutoSettingsWidget(Device)
+    changes = []
+    widget.changed.connect(changes.append)
+    widget.input("channels").setText('[{"name": "ch1", "gain": 2, "mode": "fast"}]')
+
+    assert widget.data.channels == [Channel(name="ch1", gain=2.0, mode=Mode.FAST)]
+    assert changes[-1] == widget.data
+
+
+def test_invalid_json_keeps_last_valid_value(qapp):
+    widget = QAutoSettingsWidget(Device)
+    changes = []
+    widget.changed.connect(changes.append)
+    widget.input("channels").setText('[{"name": "ch1"')
+    widget.input("channels").setText('[{"name": 1}]')
+
+    assert changes == []
+    assert widget.data == Device()
+
+
+class Gateway(BaseModel):
+    name: Optional[str] = None
+    proxy: Channel | None = None
+
+
+def test_optional_text_keeps_none(qapp):
+    widget = QAutoSettingsWidget(Gateway)
+    assert widget.data == Gateway()
+
+    widget.input("name").setText("gw")
+    assert widget.data.name == "gw"
+    widget.input("name").setText("")
+    assert widget.data.name is None
+
+
+def test_optional_nested_model_is_a_checkable_group(qapp):
+    widget = QAutoSettingsWidget(Gateway)
+    box = widget.input("proxy")
+    assert not box.isChecked()
+    assert widget.data.proxy is None
+
+    changes = []
+    widget.changed.connect(changes.append)
+    box.setChecked(True)
+    assert changes[-1].proxy == Channel()
+    box.settings_widget.input("name").setText("px")
+    assert widget.data.proxy == Channel(name="px")
+
+    box.setChecked(False)
+    assert widget.data.proxy is None
+    widget.data = Gateway(proxy=Channel(gain=2.0))
+    assert box.isChecked()
+    assert widget.data == Gateway(proxy=Channel(gain=2.0))
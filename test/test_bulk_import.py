@@ -0,0 +1,78 @@
+from pydantic import BaseModel, field_validator
+
+from qt_settings.bulk_import import SectionReport, validate_section, validate_sections
+
+
+class Device(BaseModel):
+    host: str = "localhost"
+    port: int = 502
+    tags: list[str] = []
+
+
+class Range(BaseModel):
+    low: int = 0
+    high: int = 10
+
+    @field_validator("high")
+    @classmethod
+    def above_low(cls, high, info):
+        if high < info.data.get("low", 0):
+            raise ValueError("high is below low")
+        return high
+
+
+def test_valid_section_is_applied():
+    model, report = validate_section("device", Device, Device(), {"host": "plc", "port": 503})
+
+    assert model == Device(host="plc", port=503)
+    assert report.status == SectionReport.Status.APPLIED
+    assert report.rejected == []
+
+
+def test_invalid_field_keeps_current_value():
+    current = Device(host="plc", port=503)
+    model, report = validate_section("device", Device, current, {"host": "other", "port": "not a port"})
+
+    assert model == Device(host="other", port=503)
+    assert report.status == SectionReport.Status.SALVAGED
+    assert [path for path, _ in report.rejected] == ["/port"]
+
+
+def test_invalid_list_item_keeps_current_item():
+    current = Device(tags=["a", "b"])
+    model, report = validate_section("device", Device, current, {"tags": ["x", 2]})
+
+    assert model.tags == ["x", "b"]
+    assert report.status == SectionReport.Status.SALVAGED
+
+
+def test_unknown_field_is_dropped():
+    class Strict(Device, extra="forbid"):
+        pass
+
+    model, report = validate_section("device", Strict, Strict(), {"port": 1, "unknown": True})
+
+    assert model == Strict(port=1)
+    assert report.status == SectionReport.Status.SALVAGED
+
+
+def test_non_object_is_rejected():
+    model, report = validate_section("device", Device, Device(), ["not", "a", "section"])
+
+    assert model is None
+    assert report.status == SectionReport.Status.REJECTED
+
+
+def test_validate_sections_reports_every_section():
+    models = {"device": Device, "range": Range}
+    current = {"device": Device(), "range": Range()}
+    document = {"device": {"port": "x"}, "range": {"low": 1, "high": 5}, "removed": {}}
+
+    for workers in (0, 2):
+        accepted, report = validate_sections(models, current, document, workers)
+
+        assert accepted == {"device": Device(), "range": Range(low=1, high=5)}
+        assert report.names(SectionReport.Status.SALVAGED) == ["device"]
+        assert report.names(SectionReport.Status.APPLIED) == ["range"]
+        assert report.unknown == ["removed"]
+        assert not report.ok
@@ -0,0 +1,60 @@
+import threading
+
+from qt_settings.widgets.influx.client_pool import InfluxClientPool
+
+
+class FakeClient:
+    def __init__(self, name: str):
+        self.name = name
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_evicting_a_leased_client_closes_it_after_release():
+    pool = InfluxClientPool(max_size=1)
+    a = FakeClient("a")
+
+    with pool.lease("a", lambda: a) as client:
+        assert client is a
+        b = pool.get("b", lambda: FakeClient("b"))
+        assert pool.evictions == 1
+        assert not a.closed
+        assert not b.closed
+
+    assert a.closed
+    assert pool.leased == 0
+
+
+def test_client_closes_after_last_of_several_leases():
+    pool = InfluxClientPool(max_size=1)
+    a = FakeClient("a")
+    in_use = threading.Event()
+    release = threading.Event()
+
+    def send():
+        with pool.lease("a", lambda: a):
+            in_use.set()
+            release.wait(5.0)
+
+    thread = threading.Thread(target=send)
+    thread.start()
+    assert in_use.wait(5.0)
+    with pool.lease("a", lambda: FakeClient("unused")) as client:
+        assert client is a
+        pool.discard("a")
+    assert not a.closed
+
+    release.set()
+    thread.join(5.0)
+    assert a.closed
+
+
+def test_unleased_clients_close_on_eviction():
+    pool = InfluxClientPool(max_size=1)
+    a = pool.get("a", lambda: FakeClient("a"))
+    pool.get("b", lambda: FakeClient("b"))
+    assert a.closed
+    pool.close_all()
+    assert len(pool) == 0
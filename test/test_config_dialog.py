@@ -0,0 +1,43 @@
+from pydantic import BaseModel
+
+from qt_settings import ConfigDialog, QAutoSettingsWidget
+
+
+class Device(BaseModel):
+    host: str = "localhost"
+    port: int = 502
+
+
+class SiteDevice(QAutoSettingsWidget):
+    Model = Device
+
+    def from_default(self):
+        self.data = Device(host="plc.site", port=503)
+
+
+def test_load_default_uses_widget_from_default(qapp, settings):
+    dialog = ConfigDialog(None, settings, save_delay_ms=0)  # type: ignore
+    widget = SiteDevice()
+    dialog.add_widget("device", widget)
+    widget.input("host").setText("edited")
+    assert dialog.store.model("device").host == "edited"
+
+    dialog.load_default()
+
+    assert dialog.store.model("device") == Device(host="plc.site", port=503)
+    assert widget.data == Device(host="plc.site", port=503)
+
+
+def test_lazy_tab_default_does_not_depend_on_building_the_tab(qapp, settings):
+    dialog = ConfigDialog(None, settings, save_delay_ms=0)  # type: ignore
+    dialog.add_widget_factory("device", Device, SiteDevice, Device(host="plc.default"))
+    dialog.load_default()
+    assert dialog.store.model("device") == Device(host="plc.default")
+
+    # The registered default stays authoritative, not the built widget's from_default
+    dialog.show()
+    widget = dialog.configs["device"]
+    widget.input("host").setText("edited")
+    dialog.load_default()
+    assert dialog.store.model("device") == Device(host="plc.default")
+    assert widget.data == Device(host="plc.default")
@@ -0,0 +1,141 @@
+import base64
+
+import pytest
+from pydantic import BaseModel, SecretStr
+
+from qt_settings import QAutoSettingsWidget, QInfluxConfigWidget, Secret, SettingsStore, encryption
+from qt_settings.codecs import SCHEMA_KEY
+from qt_settings.encryption import ENCRYPTED_KEY, UndecryptableSecret
+
+
+class Credentials(BaseModel):
+    user: str = "admin"
+    token: Secret = SecretStr("")
+
+
+@pytest.fixture
+def key():
+    def configure(passphrase: str) -> None:
+        encryption.configure(passphrase, iterations=1000)
+
+    configure("first key")
+    yield configure
+    encryption.configure()
+
+
+def encrypted_token(secret: str) -> str:
+    return Credentials(token=SecretStr(secret)).model_dump(mode="json")["token"][ENCRYPTED_KEY]
+
+
+def store(settings, layout=SettingsStore.StorageLayout.SECTIONS) -> SettingsStore:
+    store = SettingsStore(settings, save_delay_ms=0, storage_layout=layout)
+    store.add_section("credentials", Credentials)
+    return store
+
+
+def test_round_trip(key):
+    data = Credentials(token=SecretStr("s3cret")).model_dump_json()
+
+    assert "s3cret" not in data
+    assert Credentials.model_validate_json(data).token.get_secret_value() == "s3cret"
+    # Within a session, the same secret is the same token
+    assert Credentials(token=SecretStr("s3cret")).model_dump_json() == data
+
+
+def test_plain_text_is_read():
+    assert Credentials.model_validate({"token": "s3cret"}).token.get_secret_value() == "s3cret"
+
+
+def test_plain_text_that_looks_encrypted_stays_plain_text(key):
+    token = encryption.PREFIX + "s3cret"
+    data = Credentials(token=SecretStr(token)).model_dump_json()
+
+    secret = Credentials.model_validate_json(data).token
+    assert not isinstance(secret, UndecryptableSecret)
+    assert secret.get_secret_value() == token
+    assert Credentials.model_validate({"token": token}).token.get_secret_value() == token
+
+
+def test_empty_secret_is_not_encrypted():
+    assert Credentials().model_dump(mode="json")["token"] == ""
+
+
+def test_tampered_token(key):
+    token = encrypted_token("s3cret")
+    data = bytearray(base64.urlsafe_b64decode(token[len(encryption.PREFIX) :]))
+    data[-1] ^= 1
+    tampered = encryption.PREFIX + base64.urlsafe_b64encode(bytes(data)).decode()
+
+    secret = Credentials.model_validate({"token": {ENCRYPTED_KEY: tampered}}).token
+    assert isinstance(secret, UndecryptableSecret)
+    assert "modified" in secret.error
+    assert secret.get_secret_value() == ""
+    # Written back exactly as it was read
+    assert Credentials(token=secret).model_dump(mode="json")["token"] == {ENCRYPTED_KEY: tampered}
+
+
+def test_corrupt_token(key):
+    secret = Credentials.model_validate({"token": {ENCRYPTED_KEY: encryption.PREFIX + "not base64!"}}).token
+
+    assert isinstance(secret, UndecryptableSecret)
+
+
+def test_wrong_key(key):
+    token = encrypted_token("s3cret")
+    key("second key")
+
+    secret = Credentials.model_validate({"token": {ENCRYPTED_KEY: token}}).token
+    assert isinstance(secret, UndecryptableSecret)
+    assert secret.token == token
+
+
+@pytest.mark.parametrize("layout", list(SettingsStore.StorageLayout), ids=lambda layout: layout.name)
+def test_loading_with_wrong_key_keeps_the_stored_secret(settings, key, layout):
+    first = store(settings, layout)
+    first.load_from_settings()
+    first.update("credentials", Credentials(token=SecretStr("s3cret")))
+
+    key("second key")
+    second = store(settings, layout)
+    second.load_from_settings()
+    assert isinstance(second.model("credentials").token, UndecryptableSecret)
+    # Editing another field of the section keeps the token too
+    second.update("credentials", second.model("credentials").model_copy(update={"user": "operator"}))
+
+    key("first key")
+    third = store(settings, layout)
+    third.load_from_settings()
+    assert third.model("credentials") == Credentials(user="operator", token=SecretStr("s3cret"))
+
+
+def test_plain_text_is_encrypted_on_load(settings, key):
+    settings.setValue("config_sections/credentials", '{"user": "admin", "token": "s3cret"}')
+    loaded = store(settings)
+    loaded.load_from_settings()
+    settings.sync()
+
+    payload = settings.value("config_sections/credentials")
+    assert "s3cret" not in payload
+    assert loaded.model("credentials").token.get_secret_value() == "s3cret"
+
+
+def test_form_keeps_undecryptable_secret(qapp, key):
+    token = encrypted_token("s3cret")
+    key("second key")
+    widget = QAutoSettingsWidget(Credentials)
+    widget.data = Credentials.model_validate({"user": "admin", "token": {ENCRYPTED_KEY: token}})
+
+    widget.input("user").setText("operator")
+    assert widget.data.token == UndecryptableSecret(token, "")
+
+    widget.input("token").textEdited.emit("new")
+    widget.input("token").setText("new")
+    assert widget.data.token.get_secret_value() == "new"
+
+
+def test_influx_export_has_no_schema_versions(qapp, settings, key):
+    influx = SettingsStore(settings, save_delay_ms=0)
+    influx.add_section("influx", QInfluxConfigWidget.Model, data=QInfluxConfigWidget().data)
+
+    assert influx.schema_versions() == {}
+    assert SCHEMA_KEY not in influx.to_json()
@@ -0,0 +1,82 @@
+from pydantic import BaseModel
+from qtpy import QtWidgets
+
+from qt_settings import QGenericSettingsWidget
+
+
+class OverridesData(QGenericSettingsWidget):
+    """The original way to write a settings widget: override `data`, keep the model in `_model`."""
+
+    class Model(BaseModel):
+        name: str = ""
+        port: int = 502
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.name_input = QtWidgets.QLineEdit()
+        self.name_input.textChanged.connect(self._on_value_changed)
+        self._model = self.Model()
+
+    @property
+    def data(self) -> Model:
+        return self._model.model_copy(update={"name": self.name_input.text()})
+
+    @data.setter
+    def data(self, value: Model) -> None:
+        self._model = value
+        self.name_input.setText(value.name)
+
+
+class CachesModel(QGenericSettingsWidget):
+    class Model(BaseModel):
+        name: str = ""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.name_input = QtWidgets.QLineEdit()
+        self.bind_field("name", self.name_input.textChanged, self.name_input.text)
+        self.reads = 0
+
+    def _read_model(self) -> Model:
+        self.reads += 1
+        return self.Model(name=self.name_input.text())
+
+    def _write_model(self, value: Model) -> None:
+        self.name_input.setText(value.name)
+
+
+def test_data_override_keeps_its_own_model(qapp):
+    widget = OverridesData()
+    widget.data = OverridesData.Model(port=503)
+    changes = []
+    widget.changed.connect(changes.append)
+    widget.name_input.setText("plc")
+
+    assert changes == [OverridesData.Model(name="plc", port=503)]
+    assert widget.data == OverridesData.Model(name="plc", port=503)
+
+
+def test_bound_field_patches_cached_model(qapp):
+    widget = CachesModel()
+    assert widget.data == CachesModel.Model()
+    patches = []
+    widget.patched.connect(patches.extend)
+    widget.name_input.setText("plc")
+
+    assert widget.data == CachesModel.Model(name="plc")
+    assert widget.reads == 1
+    assert [(change.path, change.old, change.new) for change in patches] == [("/name", "", "plc")]
+
+
+def test_held_changes_are_one_change(qapp):
+    widget = CachesModel()
+    widget.data
+    changes = []
+    widget.changed.connect(changes.append)
+    widget.hold_changes()
+    widget.name_input.setText("a")
+    widget.name_input.setText("ab")
+    assert changes == []
+    widget.release_changes()
+
+    assert changes == [CachesModel.Model(name="ab")]
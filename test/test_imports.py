@@ -0,0 +1,59 @@
+"""Importing the package must stay light: optional heavy modules are only loaded by the widgets that need them."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Only the Influx widgets, secrets and the MessagePack codec need these, when actually used
+DEFERRED_MODULES = ("influxdb_client", "urllib3", "cryptography", "msgpack")
+
+PROBE = "import json, sys; {statement}; print(json.dumps(sorted(sys.modules)))"
+
+
+def loaded_modules(statement: str) -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement)], capture_output=True, text=True, check=True
+    )
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+@pytest.mark.parametrize("statement", ["import qt_settings", "from qt_settings import ConfigDialog, QPathSelector"])
+def test_deferred_modules_not_imported(statement):
+    modules = loaded_modules(statement)
+    assert [module for module in DEFERRED_MODULES if module in modules] == []
+
+
+def test_dialog_import_is_lazy():
+    modules = loaded_modules("from qt_settings import ConfigDialog")
+
+    assert "influxdb_client" not in modules
+    assert "urllib3" not in modules
+    assert "cryptography" not in modules
+    assert "msgpack" not in modules
+
+
+def test_store_is_headless():
+    modules = loaded_modules("from qt_settings import SettingsStore")
+    assert [module for module in modules if module.endswith("QtWidgets")] == []
+
+
+def test_influx_models_are_headless():
+    modules = loaded_modules("from qt_settings import InfluxModel, PathModel, InfluxWriter")
+    assert [module for module in modules if module.endswith("QtWidgets")] == []
+
+
+def test_widget_models_are_the_headless_models():
+    from qt_settings import InfluxModel, PathModel, QInfluxConfigWidget, QPathSelector
+
+    assert QInfluxConfigWidget.Model is InfluxModel
+    assert QPathSelector.PathModel is PathModel
+
+
+def test_public_widgets_are_exported():
+    import qt_settings
+    from qt_settings.widgets.instrumentation_view import QInstrumentationView
+
+    assert qt_settings.QInstrumentationView is QInstrumentationView
+    assert "QInstrumentationView" in dir(qt_settings)
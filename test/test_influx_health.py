@@ -0,0 +1,98 @@
+import threading
+
+from qt_settings import QInfluxConfigWidget
+from qt_settings.widgets.influx.client_pool import default_pool
+from qt_settings.widgets.influx.health import InfluxHealthMonitor
+from qt_settings.widgets.validation import validation_runner
+
+release = threading.Event()
+pings = []
+clients = []
+
+
+class FakeClient:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class HungServer(QInfluxConfigWidget.Model):
+    def create_client(self):
+        clients.append(FakeClient())
+        return clients[-1]
+
+    def test_connection(self, client=None):
+        pings.append((self.url, self.timeout, client))
+        release.wait(10)
+
+
+def make_config(url: str = "http://influx", timeout: int = 600_000) -> HungServer:
+    return HungServer(
+        url=url,
+        token="",
+        org="",
+        bucket="",
+        measurement="",
+        force_ssl=False,
+        debug=False,
+        flush_delay=1.0,
+        timeout=timeout,
+    )
+
+
+def test_hung_ping_is_not_piled_up(qapp, wait_until):
+    pings.clear()
+    release.clear()
+    monitor = InfluxHealthMonitor(make_config(), interval=0.05)
+    monitor.ping_timeout = 1.0
+    pool_size = len(default_pool())
+    monitor.start()
+    try:
+        # The first ping times out at its deadline, later ones wait for its worker
+        assert wait_until(lambda: monitor.stats().failures == 1)
+        wait_until(lambda: False, timeout_s=0.5)
+        assert [timeout for _, timeout, _ in pings] == [1000]
+        # Its own client, not one from the shared pool
+        assert pings[0][2] is clients[-1]
+        assert len(default_pool()) == pool_size
+    finally:
+        monitor.stop()
+        release.set()
+        validation_runner().wait()
+    assert clients[-1].closed
+
+
+def test_ping_timeout_does_not_follow_the_backoff(qapp, wait_until):
+    pings.clear()
+    release.set()
+    monitor = InfluxHealthMonitor(make_config(timeout=0), interval=0.01)
+    monitor.ping_timeout = 2.0
+    monitor.start()
+    try:
+        assert wait_until(lambda: len(pings) >= 3)
+    finally:
+        monitor.stop()
+        validation_runner().wait()
+    assert {timeout for _, timeout, _ in pings} == {2000}
+
+
+def test_reconfigure_is_debounced(qapp, wait_until):
+    pings.clear()
+    release.set()
+    monitor = InfluxHealthMonitor(make_config(), interval=60.0)
+    monitor.reconfigure_delay = 0.2
+    monitor.start()
+    try:
+        assert wait_until(lambda: len(pings) == 1)
+        # Typing a new url changes the settings once per keystroke
+        for url in ("http://o", "http://ot", "http://oth", "http://other"):
+            monitor.reconfigure(make_config(url))
+        wait_until(lambda: False, timeout_s=0.1)
+        assert len(pings) == 1
+        assert wait_until(lambda: len(pings) == 2)
+        wait_until(lambda: False, timeout_s=0.3)
+        assert [url for url, _, _ in pings] == ["http://influx", "http://other"]
+    finally:
+        monitor.stop()
+        validation_runner().wait()
@@ -0,0 +1,49 @@
+import time
+from types import SimpleNamespace
+
+from qt_settings.widgets.influx.writer import InfluxWriter
+
+
+class RecordingWriter(InfluxWriter):
+    """Writes batches to a list instead of a server."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(SimpleNamespace(flush_delay=10.0), **kwargs)  # type: ignore
+        self.sent: list = []
+
+    def _send(self, config, batch: list) -> None:
+        self.sent.extend(batch)
+        self.written += len(batch)
+
+
+def test_flush_without_thread_returns_immediately():
+    writer = RecordingWriter()
+    assert writer.flush()
+
+    writer.write("m value=1")
+    start = time.monotonic()
+    assert not writer.flush()
+    assert time.monotonic() - start < 1
+    assert len(writer) == 1
+
+
+def test_flush_sends_buffered_points():
+    with RecordingWriter() as writer:
+        writer.write("m value=1")
+        writer.write("m value=2")
+        assert writer.flush(timeout=5)
+        assert writer.sent == ["m value=1", "m value=2"]
+
+    writer.write("m value=3")
+    assert not writer.flush()
+
+
+def test_overflow_drops_oldest():
+    writer = RecordingWriter(max_queue=2)
+    for value in range(3):
+        writer.write(f"m value={value}")
+
+    assert writer.dropped == 1
+    with writer:
+        assert writer.flush(timeout=5)
+    assert writer.sent == ["m value=1", "m value=2"]
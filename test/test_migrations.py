@@ -0,0 +1,122 @@
+import pytest
+from pydantic import BaseModel
+
+from qt_settings import SettingsStore
+from qt_settings.bulk_import import SectionReport
+from qt_settings.migrations import MigrationError, Migrations
+
+
+class Influx(BaseModel):
+    url: str = "http://localhost:8086"
+    timeout_s: float = 1.0
+
+
+def influx_migrations() -> Migrations:
+    migrations = Migrations()
+
+    @migrations.step(Influx, 0)
+    def timeout_in_seconds(data):
+        data["timeout_s"] = data.pop("timeout", 1000) / 1000
+        return data
+
+    @migrations.step(Influx, 1)
+    def https(data):
+        data["url"] = data["url"].replace("http://", "https://")
+        return data
+
+    return migrations
+
+
+def test_steps_are_composed():
+    migrations = influx_migrations()
+
+    assert migrations.version(Influx) == 2
+    assert migrations.migrate(Influx, {"url": "http://db", "timeout": 500}, 0) == {
+        "url": "https://db",
+        "timeout_s": 0.5,
+    }
+    assert migrations.migrate(Influx, {"url": "http://db"}, 1) == {"url": "https://db"}
+    # Current data is returned as is
+    data = {"url": "http://db"}
+    assert migrations.migrate(Influx, data, 2) is data
+
+
+def test_upgrades_are_counted():
+    migrations = influx_migrations()
+    migrations.migrate(Influx, {"url": ""}, 0)
+    migrations.migrate(Influx, {"url": ""}, 0)
+    migrations.migrate(Influx, {"url": ""}, 2)
+
+    assert migrations.upgraded == 2
+
+
+def test_steps_do_not_modify_the_input():
+    data = {"url": "http://db", "timeout": 500}
+    influx_migrations().migrate(Influx, data, 0)
+
+    assert data == {"url": "http://db", "timeout": 500}
+
+
+def test_invalid_versions():
+    migrations = influx_migrations()
+
+    with pytest.raises(MigrationError):
+        migrations.add(Influx, 1, lambda data: data)
+    with pytest.raises(MigrationError):
+        migrations.migrate(Influx, {}, 3)
+    with pytest.raises(MigrationError):
+        migrations.migrate(Influx, "not a dict", 0)
+    with pytest.raises(MigrationError):
+        migrations.upgrade(Influx, 5, 6)
+
+
+def test_import_migrates_by_schema_versions(settings):
+    store = SettingsStore(settings, save_delay_ms=0, migrations=influx_migrations())
+    store.add_section("influx", Influx)
+    report = store.from_json('{"influx": {"url": "http://db", "timeout": 2000}, "$schema_versions": {"influx": 0}}')
+
+    assert report.ok
+    assert report.migrated == {"influx": (0, 2)}
+    assert store.model("influx") == Influx(url="https://db", timeout_s=2.0)
+
+
+def test_import_without_schema_versions_is_version_0(settings):
+    store = SettingsStore(settings, save_delay_ms=0, migrations=influx_migrations())
+    store.add_section("influx", Influx)
+
+    assert store.from_json('{"influx": {"url": "http://db", "timeout": 2000}}').migrated == {"influx": (0, 2)}
+
+
+def test_newer_schema_is_rejected(settings):
+    store = SettingsStore(settings, save_delay_ms=0, migrations=influx_migrations())
+    store.add_section("influx", Influx)
+    report = store.from_json('{"influx": {"url": "http://db"}, "$schema_versions": {"influx": 7}}')
+
+    assert report.sections["influx"].status == SectionReport.Status.REJECTED
+    assert store.model("influx") == Influx()
+
+
+@pytest.mark.parametrize("layout", list(SettingsStore.StorageLayout), ids=lambda layout: layout.name)
+def test_stored_sections_are_upgraded_once(settings, layout):
+    if layout == SettingsStore.StorageLayout.BLOB:
+        settings.setValue("config", '{"influx": {"url": "http://db", "timeout": 2000}}')
+    elif layout == SettingsStore.StorageLayout.SECTIONS:
+        settings.setValue("config_sections/influx", '{"url": "http://db", "timeout": 2000}')
+    else:
+        settings.setValue("config_sections/influx/url", '"http://db"')
+        settings.setValue("config_sections/influx/timeout", "2000")
+
+    migrations = influx_migrations()
+    store = SettingsStore(settings, save_delay_ms=0, storage_layout=layout, migrations=migrations)
+    store.add_section("influx", Influx)
+    store.load_from_settings()
+    assert store.model("influx") == Influx(url="https://db", timeout_s=2.0)
+
+    # Written back in the current schema, the next load has nothing to migrate
+    reloaded = SettingsStore(settings, save_delay_ms=0, storage_layout=layout, migrations=migrations)
+    reloaded.add_section("influx", Influx)
+    reloaded.load_from_settings()
+    assert reloaded.model("influx") == Influx(url="https://db", timeout_s=2.0)
+    assert migrations.upgraded == 1
+    if layout == SettingsStore.StorageLayout.FIELDS:
+        assert settings.value("config_sections/influx/timeout") is None
@@ -0,0 +1,58 @@
+import time
+
+from qtpy import QtCore
+
+from qt_settings.settings_store import PersistenceScheduler
+
+
+def test_burst_is_one_write(qapp, wait_until):
+    writes = []
+    scheduler = PersistenceScheduler(lambda: writes.append(time.monotonic()), quiet_ms=20, max_latency_ms=1000)
+    for _ in range(10):
+        scheduler.schedule()
+
+    assert writes == []
+    assert wait_until(lambda: writes)
+    assert len(writes) == 1
+    assert scheduler.requests == 10
+    assert scheduler.coalesced == 9
+    assert not scheduler.pending
+
+
+def test_write_never_later_than_max_latency(qapp):
+    writes = []
+    scheduler = PersistenceScheduler(lambda: writes.append(None), quiet_ms=50, max_latency_ms=100)
+    start = time.monotonic()
+    # Requests keep arriving faster than the quiet period
+    while not writes and time.monotonic() - start < 2:
+        scheduler.schedule()
+        QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 10)
+        time.sleep(0.01)
+
+    assert writes
+    assert time.monotonic() - start < 1
+
+
+def test_zero_delay_writes_synchronously(qapp):
+    writes = []
+    scheduler = PersistenceScheduler(lambda: writes.append(None), quiet_ms=0)
+    scheduler.schedule()
+    scheduler.schedule()
+
+    assert len(writes) == 2
+
+
+def test_flush_and_cancel(qapp):
+    writes = []
+    scheduler = PersistenceScheduler(lambda: writes.append(None), quiet_ms=10_000)
+    scheduler.flush()
+    assert writes == []
+
+    scheduler.schedule()
+    scheduler.flush()
+    assert len(writes) == 1
+
+    scheduler.schedule()
+    scheduler.cancel()
+    scheduler.flush()
+    assert len(writes) == 1
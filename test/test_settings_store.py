@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+from pydantic import BaseModel
+
+from qt_settings import SettingsStore
+from qt_settings.migrations import Migrations
+
+Layout = SettingsStore.StorageLayout
+
+
+class Device(BaseModel):
+    host: str = "localhost"
+    port: int = 502
+
+
+def store(settings, layout: Layout) -> SettingsStore:
+    store = SettingsStore(settings, save_delay_ms=0, storage_layout=layout)
+    store.add_section("device", Device)
+    store.add_section("other", Device)
+    return store
+
+
+def stored_keys(settings) -> set[str]:
+    settings.sync()
+    return set(settings.allKeys())
+
+
+@pytest.mark.parametrize("old", list(Layout), ids=lambda layout: layout.name)
+@pytest.mark.parametrize("new", list(Layout), ids=lambda layout: layout.name)
+def test_switching_layouts_keeps_the_settings(settings, old, new, caplog):
+    before = store(settings, old)
+    before.load_from_settings()
+    before.update("device", Device(host="plc", port=503))
+    before.update("other", Device(host="other"))
+    caplog.clear()
+
+    after = store(settings, new)
+    after.load_from_settings()
+
+    assert after.model("device") == Device(host="plc", port=503)
+    assert after.model("other") == Device(host="other")
+    assert "Failed to load config from settings" not in caplog.text
+
+    # Only the new layout's keys are left, and loading them again changes nothing
+    expected = store(settings.__class__(settings.fileName() + ".fresh", settings.format()), new)
+    expected.update("device", Device(host="plc", port=503))
+    expected.update("other", Device(host="other"))
+    assert stored_keys(settings) == stored_keys(expected.settings)
+
+    reloaded = store(settings, new)
+    reloaded.load_from_settings()
+    assert reloaded.model("device") == Device(host="plc", port=503)
+
+
+def test_unchanged_load_writes_nothing(settings):
+    first = store(settings, Layout.FIELDS)
+    first.load_from_settings()
+    first.update("device", Device(host="plc"))
+
+    second = store(settings, Layout.FIELDS)
+    writes = []
+    settings.setValue = lambda *args: writes.append(args)
+    second.load_from_settings()
+
+    assert second.model("device") == Device(host="plc")
+    assert writes == []
+
+
+def test_superseded_background_save_keeps_its_stamps(settings):
+    store = SettingsStore(
+        settings,
+        save_delay_ms=0,
+        storage_layout=Layout.SECTIONS,
+        background_writes=True,
+        conflict_policy=SettingsStore.ConflictPolicy.VERSION_STAMP,
+    )
+    store.add_section("device", Device)
+    store.add_section("other", Device)
+    store.load_from_settings()
+    store.writer.wait()
+    settings.sync()
+    before = {name: int(settings.value(f"config_versions/{name}", 0)) for name in ("device", "other")}
+
+    # Hold the writer thread, so the second save supersedes the first before it is written
+    release = threading.Event()
+    store.writer.submit("blocker", {}, lambda *_: release.wait(5))
+    store.update("device", Device(host="plc"))
+    store.update("other", Device(host="other"))
+    assert store.writer.superseded == 1
+    release.set()
+    store.writer.wait()
+
+    settings.sync()
+    for name in ("device", "other"):
+        assert int(settings.value(f"config_versions/{name}")) == before[name] + 1
+
+
+def test_background_field_save_removes_obsolete_fields(settings):
+    settings.setValue("config_sections/device/host", '"plc"')
+    settings.setValue("config_sections/device/address", '"plc:502"')
+    migrations = Migrations()
+    migrations.add(Device, 0, lambda data: {"host": data.pop("address").split(":")[0], **data})
+
+    store = SettingsStore(
+        settings, save_delay_ms=0, storage_layout=Layout.FIELDS, background_writes=True, migrations=migrations
+    )
+    store.add_section("device", Device)
+    store.load_from_settings()
+    store.update("device", Device(host="plc", port=503))
+    store.writer.wait()
+
+    assert store.model("device") == Device(host="plc", port=503)
+    settings.sync()
+    assert "config_sections/device/address" not in settings.allKeys()
+    assert settings.value("config_sections/device/port") == "503"
@@ -0,0 +1,93 @@
+import os
+import time
+
+from pydantic import BaseModel
+from qtpy import QtCore
+
+from qt_settings import SettingsStore
+from qt_settings.settings_watcher import SettingsWatcher
+
+
+class Device(BaseModel):
+    host: str = "localhost"
+    port: int = 502
+
+
+def touch(path: str, content: str) -> None:
+    # Make sure the modification time moves on coarse file systems
+    with open(path, "w") as file:
+        file.write(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_check_notices_modification(qapp, tmp_path):
+    path = str(tmp_path / "settings.ini")
+    touch(path, "a")
+    watcher = SettingsWatcher(path)
+    changes = []
+    watcher.changed.connect(lambda: changes.append(None))
+    watcher.start()
+
+    assert watcher.active
+    assert not watcher.check()
+    touch(path, "ab")
+    assert watcher.check()
+    assert not watcher.check()
+    assert len(changes) == 1
+
+    watcher.stop()
+    assert not watcher.active
+
+
+def test_removed_file_is_not_a_change(qapp, tmp_path):
+    path = str(tmp_path / "settings.ini")
+    touch(path, "a")
+    watcher = SettingsWatcher(path)
+    changes = []
+    watcher.changed.connect(lambda: changes.append(None))
+    watcher.start()
+    os.remove(path)
+
+    assert watcher.check()
+    assert changes == []
+
+
+def test_polling(qapp, tmp_path):
+    path = str(tmp_path / "settings.ini")
+    watcher = SettingsWatcher(path, poll_ms=10)
+    changes = []
+    watcher.changed.connect(lambda: changes.append(None))
+    watcher.start()
+    assert watcher.polling
+
+    touch(path, "a")
+    deadline = time.monotonic() + 2
+    while not changes and time.monotonic() < deadline:
+        QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 10)
+    assert changes
+    watcher.stop()
+
+
+def test_store_applies_external_changes(qapp, tmp_path):
+    path = str(tmp_path / "settings.ini")
+    layout = SettingsStore.StorageLayout.SECTIONS
+    ours = SettingsStore(QtCore.QSettings(path, QtCore.QSettings.Format.IniFormat), 0, storage_layout=layout)
+    ours.add_section("device", Device)
+    ours.add_section("other", Device)
+    ours.load_from_settings()
+    changed = []
+    ours.sections_changed.connect(changed.extend)
+
+    theirs = SettingsStore(QtCore.QSettings(path, QtCore.QSettings.Format.IniFormat), 0, storage_layout=layout)
+    theirs.add_section("device", Device)
+    theirs.add_section("other", Device)
+    theirs.load_from_settings()
+    theirs.update("device", Device(host="plc"))
+    theirs.settings.sync()
+
+    assert ours.reload_external() == ["device"]
+    assert ours.model("device") == Device(host="plc")
+    assert changed == ["device"]
+    # Nothing changed since
+    assert ours.reload_external() == []
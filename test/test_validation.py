@@ -0,0 +1,54 @@
+import threading
+
+from qt_utils import messaging
+
+from qt_settings.widgets.validation import ValidationRunner
+
+
+def test_superseded_task_settles_with_none(qapp, wait_until):
+    runner = ValidationRunner()
+    release = threading.Event()
+    results = []
+    first = runner.submit("key", lambda: release.wait(5) and messaging.Success().to_result())
+    first.finished.connect(results.append)
+    assert wait_until(lambda: first.working)
+
+    second = runner.submit("key", lambda: messaging.Success().to_result())
+    assert results == [None]
+    assert wait_until(lambda: second.done)
+    release.set()
+    assert wait_until(lambda: not first.working)
+    runner.wait()
+    assert results == [None]
+
+
+def test_hung_jobs_do_not_starve_new_tasks(qapp, wait_until):
+    runner = ValidationRunner(max_threads=2)
+    release = threading.Event()
+    hung = [runner.submit(key, lambda: release.wait(10), deadline=0.05) for key in ("a", "b")]
+    assert wait_until(lambda: all(task.done for task in hung))
+    assert all(task.working for task in hung)
+    assert runner.abandoned == 2
+
+    ran = []
+    task = runner.submit("c", lambda: ran.append(True) or messaging.Success().to_result(), deadline=2)
+    assert wait_until(lambda: task.done)
+    assert ran == [True]
+
+    release.set()
+    assert wait_until(lambda: runner.abandoned == 0)
+    runner.wait()
+
+
+def test_cancelled_queued_task_never_runs(qapp):
+    runner = ValidationRunner(max_threads=1)
+    release = threading.Event()
+    runner.submit("a", lambda: release.wait(5))
+    ran = []
+    queued = runner.submit("b", lambda: ran.append(True))
+    runner.cancel("b")
+    release.set()
+    runner.wait()
+
+    assert queued.done
+    assert ran == []